@@ -0,0 +1,52 @@
+"""
+Compares cached `Mention` views (`words`, `tags`, `start_offset`, `text`, etc.) with recomputing them on each access.
+
+    python profiling/mention_views.py [--mentions N] [--accesses N]
+"""
+from lum.clu.odin.mention import TextBoundMention
+from lum.clu.processors.document import Document
+from lum.clu.processors.interval import Interval
+import argparse
+import random
+import timeit
+
+
+def make_document(num_sentences: int, size: int) -> Document:
+  words = [f"w{i}" for i in range(size)]
+  starts = [3 * i for i in range(size)]
+  sentence = {"words": words, "tags": ["NN"] * size, "lemmas": words, "startOffsets": starts, "endOffsets": [s + 2 for s in starts], "graphs": {}}
+  text = " ".join(words)
+  return Document(id="doc", text=text, sentences=[dict(sentence) for _ in range(num_sentences)])
+
+def uncached(m: TextBoundMention) -> tuple:
+  # what each access cost before caching
+  s = m.document.sentences[m.sentence_index]
+  words = s.words[m.start:m.end]
+  tags = s.tags[m.start:m.end] if s.tags else None
+  lemmas = s.lemmas[m.start:m.end] if s.lemmas else None
+  start_offset = m.document.sentences[m.sentence_index].start_offsets[m.start]
+  end_offset = m.document.sentences[m.sentence_index].end_offsets[m.end - 1]
+  text = m.document.text[m.document.sentences[m.sentence_index].start_offsets[m.start]:m.document.sentences[m.sentence_index].end_offsets[m.end - 1]]
+  return words, tags, lemmas, start_offset, end_offset, text
+
+def cached(m: TextBoundMention) -> tuple:
+  return m.words, m.tags, m.lemmas, m.start_offset, m.end_offset, m.text
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument("--mentions", type=int, default=1000)
+  parser.add_argument("--accesses", type=int, default=100, help="Number of times each mention's views are read")
+  args = parser.parse_args()
+  rng = random.Random(0)
+  doc = make_document(num_sentences=50, size=40)
+  mentions = []
+  for _ in range(args.mentions):
+    start = rng.randrange(35)
+    mentions.append(TextBoundMention(labels=["X"], token_interval=Interval(start, start + rng.randrange(1, 6)), sentence_index=rng.randrange(50), document=doc))
+  assert all(cached(m) == uncached(m) for m in mentions)
+  for name, fn in [("uncached", uncached), ("cached", cached)]:
+    seconds = timeit.timeit(lambda: [fn(m) for m in mentions], number=args.accesses)
+    print(f"{name:>8}: {seconds:.3f}s for {args.mentions * args.accesses:,} accesses of 6 views")
+
+if __name__ == "__main__":
+  main()
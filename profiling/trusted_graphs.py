@@ -0,0 +1,26 @@
+"""
+Compares loading dependency graphs with `DirectedGraph.from_trusted_json` (which keeps the JSON edges until they're needed) and with validation.
+
+    python profiling/trusted_graphs.py [--graphs N] [--edges N]
+"""
+from lum.clu.processors.directed_graph import DirectedGraph
+import argparse
+import timeit
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument("--graphs", type=int, default=10000)
+  parser.add_argument("--edges", type=int, default=40, help="Number of edges per graph")
+  args = parser.parse_args()
+  data = {"roots": [0], "edges": [{"source": i, "destination": i + 1, "relation": "nsubj"} for i in range(args.edges)]}
+  assert DirectedGraph.from_trusted_json(data) == DirectedGraph.model_validate(data)
+  for name, load in [("validated", DirectedGraph.model_validate), ("trusted", DirectedGraph.from_trusted_json)]:
+    seconds = timeit.timeit(lambda: [load(data) for _ in range(args.graphs)], number=1)
+    # most queries only need the compact graph
+    with_queries = timeit.timeit(lambda: [load(data).compact.outgoing(0) for _ in range(args.graphs)], number=1)
+    print(f"{name:>9}: {seconds:.3f}s to load {args.graphs:,} graphs ({with_queries:.3f}s with a query each)")
+
+
+if __name__ == "__main__":
+  main()
@@ -1,54 +1,217 @@
-from termcolor import colored
+from __future__ import annotations
+from lum.clu.odin.mention import Mention, TextBoundMention
+import html
+import itertools
+import typing
 
 __all__ = ["OdinHighlighter"]
 
+# style name -> termcolor arguments
+_STYLES: dict[str, dict[str, typing.Any]] = {
+    "LABEL": dict(color="red", attrs=["bold"]),
+    "ARG": dict(on_color="on_green", attrs=["bold"]),
+    "TRIGGER": dict(on_color="on_blue", attrs=["bold"]),
+    "CONCEAL": dict(on_color="on_grey", attrs=["concealed"]),
+    "MENTION": dict(on_color="on_yellow")
+}
+
+
+def _colored(token: str, **kwargs: typing.Any) -> str:
+    # termcolor is an optional dependency (see the `highlight` extra), so it's only imported when something is colored
+    try:
+        from termcolor import colored
+    except ImportError as e:
+        raise ImportError("OdinHighlighter requires termcolor (pip install 'clu-processors[highlight]')") from e
+    return colored(token, **kwargs)
+
+
+class _SentenceRenderer:
+    """
+    Renders mentions of a single sentence.
+
+    Each token is styled according to the layers it belongs to (a bit mask of `MENTION`, `ARG`, and `TRIGGER`).
+    A token is only rendered once per combination of layers, no matter how many mentions include it.
+    """
+
+    MENTION: typing.ClassVar[int] = 1
+    ARG: typing.ClassVar[int] = 2
+    TRIGGER: typing.ClassVar[int] = 4
+
+    def __init__(self, words: typing.Sequence[str], fmt: str):
+        self.words = words
+        self.fmt = fmt
+        # layers -> rendered tokens
+        self._rendered: list[typing.Optional[list[typing.Optional[str]]]] = [None] * 8
+        self._styles: list[typing.Optional[typing.Tuple[str, str]]] = [None] * 8
+
+    def _style(self, layers: int) -> typing.Tuple[str, str]:
+        """The (prefix, suffix) wrapped around each token with these layers"""
+        style = self._styles[layers]
+        if style is None:
+            if layers == 0:
+                style = ("", "")
+            elif self.fmt == OdinHighlighter.HTML:
+                names = [name for bit, name in ((_SentenceRenderer.MENTION, "mention"), (_SentenceRenderer.ARG, "arg"), (_SentenceRenderer.TRIGGER, "trigger")) if layers & bit]
+                style = (f'<span class="{" ".join(names)}">', "</span>")
+            else:
+                # later layers take precedence (ex. the background of a trigger within a mention)
+                prefix = "".join(
+                    OdinHighlighter._ansi_codes(name)[0]
+                    for bit, name in ((_SentenceRenderer.MENTION, "MENTION"), (_SentenceRenderer.ARG, "ARG"), (_SentenceRenderer.TRIGGER, "TRIGGER"))
+                    if layers & bit
+                )
+                # every style ends with the same reset code
+                style = (prefix, OdinHighlighter._ansi_codes("MENTION")[1])
+            self._styles[layers] = style
+        return style
+
+    def _token(self, i: int, layers: int) -> str:
+        rendered = self._rendered[layers]
+        if rendered is None:
+            rendered = [None] * len(self.words)
+            self._rendered[layers] = rendered
+        token = rendered[i]
+        if token is None:
+            prefix, suffix = self._style(layers)
+            word = html.escape(self.words[i]) if self.fmt == OdinHighlighter.HTML else self.words[i]
+            token = f"{prefix}{word}{suffix}"
+            rendered[i] = token
+        return token
+
+    def render(self, mention: Mention) -> str:
+        """The sentence with the mention, its arguments, and its trigger highlighted"""
+        layers = bytearray(len(self.words))
+        def mark(m: Mention, bit: int) -> None:
+            if m.sentence_index == mention.sentence_index:
+                for i in range(m.start, m.end):
+                    layers[i] |= bit
+        mark(mention, _SentenceRenderer.MENTION)
+        # a TextBoundMention is formatted like an argument
+        if isinstance(mention, TextBoundMention):
+            mark(mention, _SentenceRenderer.ARG)
+        for args in (mention.arguments or dict()).values():
+            for arg in args:
+                mark(arg, _SentenceRenderer.ARG)
+        trigger = getattr(mention, "trigger", None)
+        if trigger is not None:
+            mark(trigger, _SentenceRenderer.TRIGGER)
+        # spaces within the mention are highlighted like the mention
+        inner_space = self._style(_SentenceRenderer.MENTION)
+        inner_space = f"{inner_space[0]} {inner_space[1]}"
+        parts: list[str] = []
+        for i in range(len(self.words)):
+            if i > 0:
+                parts.append(inner_space if layers[i - 1] & layers[i] & _SentenceRenderer.MENTION else " ")
+            parts.append(self._token(i, layers[i]))
+        return "".join(parts)
+
+
 class OdinHighlighter:
 
+    ANSI: typing.ClassVar[str] = "ansi"
+    HTML: typing.ClassVar[str] = "html"
+
+    HTML_HEADER: typing.ClassVar[str] = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<style>
+.label { color: red; font-weight: bold; }
+.mention { background-color: yellow; }
+.arg { background-color: lightgreen; font-weight: bold; }
+.trigger { background-color: lightblue; font-weight: bold; }
+</style>
+</head>
+<body>
+"""
+
+    HTML_FOOTER: typing.ClassVar[str] = "</body>\n</html>\n"
+
+    # style name -> (prefix, suffix) ANSI codes
+    _ANSI_CODES: typing.ClassVar[dict[str, typing.Tuple[str, str]]] = dict()
+
     @staticmethod
     def LABEL(token):
-        return colored(token, color="red", attrs=["bold"])
+        return _colored(token, **_STYLES["LABEL"])
 
     @staticmethod
     def ARG(token):
-        return colored(token, on_color="on_green", attrs=["bold"])
+        return _colored(token, **_STYLES["ARG"])
 
     @staticmethod
     def TRIGGER(token):
-        return colored(token, on_color="on_blue", attrs=["bold"])
+        return _colored(token, **_STYLES["TRIGGER"])
 
     @staticmethod
     def CONCEAL(token):
-        return colored(token, on_color="on_grey", attrs=["concealed"])
+        return _colored(token, **_STYLES["CONCEAL"])
 
     @staticmethod
     def MENTION(token):
-        return colored(token, on_color="on_yellow")
-
-    # @staticmethod
-    # def highlight_mention(mention):
-    #     """
-    #     Formats text of mention
-    #     """
-    #     text_span = mention.sentenceObj.words[:]
-    #     # format TBM span like an arg
-    #     if mention.type == "TextBoundMention":
-    #         for i in range(mention.start, mention.end):
-    #             text_span[i] = OdinHighlighter.ARG(text_span[i])
-    #     if mention.arguments:
-    #         for (role, args) in mention.arguments.items():
-    #             for arg in args:
-    #                 for i in range(arg.start, arg.end):
-    #                     text_span[i] = OdinHighlighter.ARG(text_span[i])
-    #     # format trigger distinctly from args
-    #     if mention.trigger:
-    #         trigger = mention.trigger
-    #         for i in range(trigger.start, trigger.end):
-    #             text_span[i] = OdinHighlighter.TRIGGER(text_span[i])
-
-    #     # highlight tokens contained in mention span
-    #     for i in range(mention.start, mention.end):
-    #         text_span[i] = OdinHighlighter.MENTION(text_span[i])
-    #     mention_span = OdinHighlighter.MENTION(" ").join(text_span[mention.start:mention.end])
-    #     # highlight spaces in mention span
-    #     formatted_text = " ".join(text_span[:mention.start]) + " " + mention_span + " " + " ".join(text_span[mention.end:])
-    #     return formatted_text.strip()
\ No newline at end of file
+        return _colored(token, **_STYLES["MENTION"])
+
+    @staticmethod
+    def _ansi_codes(style: str) -> typing.Tuple[str, str]:
+        """The (prefix, suffix) ANSI codes that a style (ex. `ARG`) wraps around a token"""
+        codes = OdinHighlighter._ANSI_CODES.get(style, None)
+        if codes is None:
+            # codes are emitted even when not writing to a terminal (ex. a report file)
+            prefix, suffix = _colored("\0", force_color=True, **_STYLES[style]).split("\0")
+            codes = (prefix, suffix)
+            OdinHighlighter._ANSI_CODES[style] = codes
+        return codes
+
+    @staticmethod
+    def _check_format(fmt: str) -> None:
+        if fmt not in (OdinHighlighter.ANSI, OdinHighlighter.HTML):
+            raise ValueError(f"Unrecognized format '{fmt}'. Expected one of {OdinHighlighter.ANSI}, {OdinHighlighter.HTML}")
+
+    @staticmethod
+    def _label(mention: Mention, fmt: str) -> str:
+        if fmt == OdinHighlighter.HTML:
+            return f'<span class="label">{html.escape(mention.label)}</span>'
+        prefix, suffix = OdinHighlighter._ansi_codes("LABEL")
+        return f"{prefix}{mention.label}{suffix}"
+
+    @staticmethod
+    def highlight_mention(mention: Mention, fmt: str = "ansi") -> str:
+        """
+        Formats the sentence of `mention`, highlighting the mention, its arguments, and its trigger.
+        To format many mentions, use `OdinHighlighter.highlight_mentions` (which shares work across mentions of the same sentence).
+        """
+        OdinHighlighter._check_format(fmt)
+        return _SentenceRenderer(mention.sentence_obj.words, fmt).render(mention)
+
+    @staticmethod
+    def highlight_mentions(mentions: typing.Iterable[Mention], fmt: str = "ansi") -> typing.Iterator[str]:
+        """
+        Yields "label: highlighted sentence" (see `OdinHighlighter.highlight_mention`) for each mention (in order).
+        Consecutive mentions of the same sentence are rendered together, so each of its tokens is only styled once per combination of layers.
+        Group mentions by sentence for the most reuse.
+        """
+        OdinHighlighter._check_format(fmt)
+        for _, group in itertools.groupby(mentions, key=lambda m: (id(m.document), m.sentence_index)):
+            renderer: typing.Optional[_SentenceRenderer] = None
+            for m in group:
+                if renderer is None:
+                    renderer = _SentenceRenderer(m.sentence_obj.words, fmt)
+                line = f"{OdinHighlighter._label(m, fmt)}: {renderer.render(m)}"
+                yield f"<p>{line}</p>" if fmt == OdinHighlighter.HTML else line
+
+    @staticmethod
+    def write(mentions: typing.Iterable[Mention], fp: typing.TextIO, fmt: str = "ansi") -> int:
+        """
+        Streams the highlighted mentions (one per line) to `fp` (see `OdinHighlighter.highlight_mentions`).
+        HTML output is a complete document. Returns the number of mentions written.
+        """
+        OdinHighlighter._check_format(fmt)
+        if fmt == OdinHighlighter.HTML:
+            fp.write(OdinHighlighter.HTML_HEADER)
+        count = 0
+        for line in OdinHighlighter.highlight_mentions(mentions, fmt=fmt):
+            fp.write(line)
+            fp.write("\n")
+            count += 1
+        if fmt == OdinHighlighter.HTML:
+            fp.write(OdinHighlighter.HTML_FOOTER)
+        return count
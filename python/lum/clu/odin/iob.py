@@ -0,0 +1,31 @@
+from __future__ import annotations
+from lum.clu.odin.mention import TextBoundMention
+from lum.clu.processors.document import Document
+from lum.clu.processors.interval import Interval
+import typing
+
+__all__ = ["iob_mentions"]
+
+
+def iob_mentions(
+  document: Document,
+  field: typing.Literal["entities", "chunks"] = "entities",
+  found_by: str = "iob"
+) -> list[TextBoundMention]:
+  """
+  Converts every IOB span (see `Sentence.entity_spans` and `Sentence.chunk_spans`) in `document` to a `TextBoundMention` labeled with the span's label.
+  Mentions are constructed without validation, as the spans come straight from the document.
+  """
+  mentions: list[TextBoundMention] = []
+  append = mentions.append
+  for i, sentence in enumerate(document.sentences):
+    spans = sentence.entity_spans if field == "entities" else sentence.chunk_spans
+    for start, end, label in spans:
+      append(TextBoundMention.from_trusted(
+        labels=[label],
+        token_interval=Interval(start, end),
+        sentence_index=i,
+        document=document,
+        found_by=found_by
+      ))
+  return mentions
@@ -1,23 +1,37 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationInfo, field_serializer, field_validator
 from lum.clu.processors.document import Document
-from lum.clu.processors.sentence import Sentence
+from lum.clu.processors.sentence import SentenceView
+from lum.clu.processors.head_finder import HeadFinder
 from lum.clu.processors.interval import Interval
+from lum.clu.processors.utils import CachedPropertiesMixin, Trusted, construct
 from lum.clu.odin.synpath import SynPath
+import functools
 import re
 import typing
 
 
-__all__ = ["Mention", "TextBoundMention", "RelationMention", "EventMention", "CrossSentenceMention"]
+__all__ = ["Mention", "TextBoundMention", "RelationMention", "EventMention", "CrossSentenceMention", "dedupe"]
 
 # MentionTypes = typing.Union[TextBoundMention, EventMention, RelationMention, CrossSentenceMention]
 
-class Mention(BaseModel):
+class Mention(CachedPropertiesMixin, BaseModel):
+  """
+  NOTE: the sentence, token slices (`words`, `tags`, etc.), character offsets, `text`, and `structural_hash` of a mention are computed once and cached.
+  The cache is cleared whenever a field is reassigned (and is never carried over by `copy()`),
+  but it is not aware of in-place changes to the document, its sentences, or the mentions this one is built from. Treat the returned lists as read-only.
+
+  Once a mention has been hashed (ex. as a key of `Mention.paths`, or as a component of a hashed mention), the fields its hash depends on are frozen:
+  reassigning them raises an `AttributeError` (use `copy()` instead).
+  """
 
   Paths: typing.ClassVar[typing.TypeAlias] = dict[str, dict["Mention", SynPath]]
 
   Arguments: typing.ClassVar[typing.TypeAlias] = dict[str, list["Mention"]]
+
+  # fields that `structural_hash` depends on (see `Mention._identity` and `Mention._components`)
+  _HASHED_FIELDS: typing.ClassVar[typing.FrozenSet[str]] = frozenset({"labels", "token_interval", "sentence_index", "document", "arguments", "trigger", "anchor", "neighbor"})
   # FIXME: add validation that this is non-empty?
   labels: list[str] = Field(description="A sequence of labels for this mention. The first label in the sequence is considered the default.")
   # alias="tokenInterval", 
@@ -36,6 +50,138 @@ class Mention(BaseModel):
   # alias="foundBy"
   found_by: str = Field(default="unknown", description="The name of the rule that produced this mention")
 
+  @classmethod
+  def from_trusted(cls, **fields: typing.Any) -> Mention:
+    """
+    Constructs a mention of this type without validation (see `lum.clu.processors.utils.Trusted`).
+    Unrecognized fields are ignored.
+    """
+    m = construct(cls, **fields)
+    if Trusted.sample():
+      Trusted.check(m, lambda: cls(**fields))
+    return m
+
+  def __hash__(self) -> int:
+    # mentions are used as keys in `Mention.paths`.
+    # equal mentions (i.e., same type and same fields) are always equivalent, so they share a structural hash.
+    return self.structural_hash
+
+  def __setattr__(self, name: str, value: typing.Any) -> None:
+    # a hashed mention might be a dict key (or part of another mention's hash), so its hash can't change
+    if name in Mention._HASHED_FIELDS and "structural_hash" in self.__dict__:
+      raise AttributeError(f"Cannot reassign '{name}' of a mention that has been hashed (ex. a key of `Mention.paths`). Use `copy()` instead")
+    super().__setattr__(name, value)
+    if name in type(self).model_fields:
+      hashed = self.__dict__.get("structural_hash", None)
+      self._clear_cached_properties()
+      # the hash (and so the freeze) is unaffected by the other fields
+      if hashed is not None:
+        self.__dict__["structural_hash"] = hashed
+
+  @staticmethod
+  def _path_keys(arguments: typing.Optional[Mention.Arguments]) -> list[Mention]:
+    """
+    Every mention a path can lead to: the arguments and (recursively) the mentions they're built from, each once, in a fixed order.
+    In `model_dump()` output, each path is keyed by the position of its mention in this list (see `Mention._serialize_paths`).
+    """
+    found: list[Mention] = []
+    seen: typing.Set[int] = set()
+    stack: list[Mention] = [arg for role in reversed(sorted(arguments or dict())) for arg in reversed(arguments[role])]
+    while len(stack) > 0:
+      m = stack.pop()
+      if id(m) in seen:
+        continue
+      seen.add(id(m))
+      found.append(m)
+      stack.extend(c for _, cs in reversed(m._components()) for c in reversed(cs))
+    return found
+
+  @field_serializer("paths")
+  def _serialize_paths(self, paths: typing.Optional[Mention.Paths]) -> typing.Optional[dict[str, dict[str, typing.Any]]]:
+    # mentions can't be JSON keys (and the arguments are already dumped), so each path is keyed by the position of its mention.
+    # like the compact JSON (see OdinJsonSerializer), paths can only refer to mentions that are part of the dump.
+    if paths is None:
+      return None
+    positions = {id(m): str(i) for i, m in enumerate(Mention._path_keys(self.arguments))}
+    return {
+      role: {positions[id(key)]: path.to_json() for key, path in role_paths.items() if id(key) in positions}
+      for role, role_paths in paths.items()
+    }
+
+  @field_validator("paths", mode="before")
+  @classmethod
+  def _validate_paths(cls, paths: typing.Any, info: ValidationInfo) -> typing.Any:
+    # the inverse of Mention._serialize_paths (the arguments, document, and sentence are validated first)
+    if not isinstance(paths, dict) or not any(isinstance(key, str) for role_paths in paths.values() for key in role_paths):
+      return paths
+    keys = Mention._path_keys(info.data.get("arguments", None))
+    document, sentence_index = info.data.get("document", None), info.data.get("sentence_index", -1)
+    return {
+      role: {
+        (keys[int(key)] if isinstance(key, str) else key): (SynPath.from_json(path, document, sentence_index) if isinstance(path, list) else path)
+        for key, path in role_paths.items()
+      }
+      for role, role_paths in paths.items()
+    }
+
+  def _identity(self) -> typing.Tuple[typing.Any, ...]:
+    """The Odin identity of this mention, excluding the mentions it's built from (see `Mention._components`)"""
+    return (type(self).__name__, tuple(self.labels), self.token_interval.start, self.token_interval.end, self.sentence_index, self.document.id)
+
+  def _components(self) -> list[typing.Tuple[str, list[Mention]]]:
+    """The mentions this mention is built from (role -> mentions), in a fixed order"""
+    arguments = self.arguments or dict()
+    return [(role, arguments[role]) for role in sorted(arguments)]
+
+  def dependencies(self) -> typing.Iterator[Mention]:
+    """Yields each mention this mention is directly built from: its arguments (in order), then its trigger (or anchor and neighbor)"""
+    for args in (self.arguments or dict()).values():
+      yield from args
+
+  @functools.cached_property
+  def structural_hash(self) -> int:
+    """
+    Hash of the Odin identity of this mention: its type, labels, token interval, sentence, document, and (recursively) its trigger and arguments.
+    Computed bottom-up (each component's hash is cached), so shared and deeply nested components are only hashed once.
+    `found_by`, `keep`, and `paths` are not included (see `Mention.is_equivalent`).
+    """
+    # explicit stack (post-order), so deeply nested mentions won't hit the recursion limit
+    stack: list[Mention] = [self]
+    while len(stack) > 0:
+      m = stack[-1]
+      if "structural_hash" in m.__dict__:
+        stack.pop()
+        continue
+      components = m._components()
+      pending = [c for _, cs in components for c in cs if "structural_hash" not in c.__dict__]
+      if len(pending) > 0:
+        stack.extend(pending)
+        continue
+      m.__dict__["structural_hash"] = hash((m._identity(), tuple((role, tuple(c.structural_hash for c in cs)) for role, cs in components)))
+      stack.pop()
+    return self.__dict__["structural_hash"]
+
+  def is_equivalent(self, other: typing.Any) -> bool:
+    """
+    Whether `other` has the same Odin identity as this mention (see `Mention.structural_hash`).
+    Documents are the same if they're the same object or have the same ID and content (see `Document.equivalence_digest`).
+    """
+    pairs: list[typing.Tuple[Mention, typing.Any]] = [(self, other)]
+    while len(pairs) > 0:
+      a, b = pairs.pop()
+      if a is b:
+        continue
+      if not isinstance(b, Mention) or a.structural_hash != b.structural_hash or a._identity() != b._identity():
+        return False
+      if a.document is not b.document and a.document.equivalence_digest != b.document.equivalence_digest:
+        return False
+      a_components, b_components = a._components(), b._components()
+      if [(role, len(cs)) for role, cs in a_components] != [(role, len(cs)) for role, cs in b_components]:
+        return False
+      for (_, a_cs), (_, b_cs) in zip(a_components, b_components):
+        pairs.extend(zip(a_cs, b_cs))
+    return True
+
   def copy(
     self,
     maybe_labels: typing.Optional[list[str]] = None,
@@ -48,14 +194,14 @@ class Mention(BaseModel):
     maybe_found_by: typing.Optional[str] = None,
   ) -> Mention:
     return Mention(
-      labels = maybe_labels or self.labels,
-      token_interval = maybe_token_interval or self.token_interval,
-      sentence_index = maybe_sentence_index or self.sentence_index,
-      document = maybe_document or self.document,
-      keep = maybe_keep or self.keep,
-      arguments = maybe_arguments or self.arguments,
-      paths = maybe_paths or self.paths,
-      found_by = maybe_found_by or self.found_by
+      labels = maybe_labels if maybe_labels is not None else self.labels,
+      token_interval = maybe_token_interval if maybe_token_interval is not None else self.token_interval,
+      sentence_index = maybe_sentence_index if maybe_sentence_index is not None else self.sentence_index,
+      document = maybe_document if maybe_document is not None else self.document,
+      keep = maybe_keep if maybe_keep is not None else self.keep,
+      arguments = maybe_arguments if maybe_arguments is not None else self.arguments,
+      paths = maybe_paths if maybe_paths is not None else self.paths,
+      found_by = maybe_found_by if maybe_found_by is not None else self.found_by
     )
 
   @property
@@ -73,15 +219,19 @@ class Mention(BaseModel):
     """one after the last token in the mention"""
     return self.token_interval.end
   
-  @property
-  def sentence_obj(self) -> Sentence:
+  @functools.cached_property
+  def sentence_obj(self) -> SentenceView:
     return self.document.sentences[self.sentence_index]
 
   @property
-  def sentenceObj(self) -> Sentence:
-    self.sentence_obj
+  def sentenceObj(self) -> SentenceView:
+    return self.sentence_obj
 
-  @property
+  def semantic_head(self, graph_name: typing.Optional[str] = None, valid_tags: typing.Optional[typing.Iterable[str]] = HeadFinder.DEFAULT_VALID_TAGS) -> typing.Optional[int]:
+    """index of the semantic head of the mention (see `lum.clu.processors.head_finder.HeadFinder`)"""
+    return self.sentence_obj.semantic_head(self.token_interval, graph_name=graph_name, valid_tags=valid_tags)
+
+  @functools.cached_property
   def start_offset(self) -> int:
     """character offset of the mention beginning"""
     return self.sentence_obj.start_offsets[self.start]
@@ -96,7 +246,7 @@ class Mention(BaseModel):
     """character offset of the mention beginning"""
     return self.start_offset 
   
-  @property
+  @functools.cached_property
   def end_offset(self) -> int:
     """character offset of the mention end"""
     return self.sentence_obj.end_offsets[self.end - 1]
@@ -130,52 +280,52 @@ class Mention(BaseModel):
       return True if any(re.match(patt, lbl) != None for lbl in self.labels) else False
     return False
 
-  @property
+  @functools.cached_property
   def raw(self) -> list[str]:
     """returns all raw (original, no processing applied) tokens in mention"""
     return self.sentence_obj.raw[self.start:self.end]
 
-  @property
+  @functools.cached_property
   def words(self) -> list[str]:
     """returns all tokens in mention"""
     return self.sentence_obj.words[self.start:self.end]
 
-  @property
+  @functools.cached_property
   def tags(self) -> typing.Optional[list[str]]:
     """returns all tags in mention"""
     if self.sentence_obj.tags:
       return self.sentence_obj.tags[self.start:self.end]
     return None
   
-  @property
+  @functools.cached_property
   def lemmas(self) -> typing.Optional[list[str]]:
     """returns all lemmas in mention"""
     if self.sentence_obj.lemmas:
       return self.sentence_obj.lemmas[self.start:self.end]
     return None
   
-  @property
+  @functools.cached_property
   def entities(self) -> typing.Optional[list[str]]:
     """returns all entities in mention"""
     if self.sentence_obj.entities:
       return self.sentence_obj.entities[self.start:self.end]
     return None
   
-  @property
+  @functools.cached_property
   def norms(self) -> typing.Optional[list[str]]:
     """returns all norms in mention"""
     if self.sentence_obj.norms:
       return self.sentence_obj.norms[self.start:self.end]
     return None
   
-  @property
+  @functools.cached_property
   def chunks(self) -> typing.Optional[list[str]]:
     """returns all chunks in mention"""
     if self.sentence_obj.chunks:
       return self.sentence_obj.chunks[self.start:self.end]
     return None
 
-  @property
+  @functools.cached_property
   def text(self) -> str:
     """returns a string that contains the mention"""
     _text = self.document.text
@@ -183,7 +333,7 @@ class Mention(BaseModel):
       return _text[self.start_offset:self.end_offset]
     # FIXME: this can be improved
     else:
-      return " ".join(self.raw[self.start:self.end])
+      return " ".join(self.raw)
 
   # /** returns a string that contains the mention */
   # def text: String = document.text match {
@@ -548,17 +698,24 @@ class EventMention(Mention):
     maybe_found_by: typing.Optional[str] = None,
   ) -> EventMention:
     return EventMention(
-      trigger = maybe_trigger or self.trigger,
-      labels = maybe_labels or self.labels,
-      token_interval = maybe_token_interval or self.token_interval,
-      sentence_index = maybe_sentence_index or self.sentence_index,
-      document = maybe_document or self.document,
-      keep = maybe_keep or self.keep,
-      arguments = maybe_arguments or self.arguments,
-      paths = maybe_paths or self.paths,
-      found_by = maybe_found_by or self.found_by
+      trigger = maybe_trigger if maybe_trigger is not None else self.trigger,
+      labels = maybe_labels if maybe_labels is not None else self.labels,
+      token_interval = maybe_token_interval if maybe_token_interval is not None else self.token_interval,
+      sentence_index = maybe_sentence_index if maybe_sentence_index is not None else self.sentence_index,
+      document = maybe_document if maybe_document is not None else self.document,
+      keep = maybe_keep if maybe_keep is not None else self.keep,
+      arguments = maybe_arguments if maybe_arguments is not None else self.arguments,
+      paths = maybe_paths if maybe_paths is not None else self.paths,
+      found_by = maybe_found_by if maybe_found_by is not None else self.found_by
     )
 
+  def _components(self) -> list[typing.Tuple[str, list[Mention]]]:
+    return [("trigger", [self.trigger])] + super()._components()
+
+  def dependencies(self) -> typing.Iterator[Mention]:
+    yield from super().dependencies()
+    yield self.trigger
+
   # TODO: implement me
   # see https://github.com/clulab/processors/blob/9f89ea7bf6ac551f77dbfdbb8eec9bf216711df4/main/src/main/scala/org/clulab/odin/Mention.scala#L323-L330
   @property
@@ -599,7 +756,30 @@ class CrossSentenceMention(Mention):
   anchor: Mention = Field(description="The mention serving as the anchor for this cross-sentence mention")
   neighbor: Mention = Field(description="The second mention for this cross-sentence mention")
 
+  def _components(self) -> list[typing.Tuple[str, list[Mention]]]:
+    return [("anchor", [self.anchor]), ("neighbor", [self.neighbor])] + super()._components()
+
+  def dependencies(self) -> typing.Iterator[Mention]:
+    yield from super().dependencies()
+    yield self.anchor
+    yield self.neighbor
+
   # FIXME: add check on arguments  
   #require(arguments.size == 2, "CrossSentenceMention must have exactly two arguments")
   # assert anchor.document == neighbor.document
-  # assert anchor.sentence_obj != neighbor.sentence_obj
\ No newline at end of file
+  # assert anchor.sentence_obj != neighbor.sentence_obj
+
+
+def dedupe(mentions: typing.Iterable[Mention]) -> list[Mention]:
+  """
+  Drops each mention that is equivalent to an earlier one (see `Mention.is_equivalent`), preserving order.
+  Mentions are bucketed by `Mention.structural_hash`, so this takes linear (expected) time.
+  """
+  seen: dict[int, list[Mention]] = dict()
+  unique: list[Mention] = []
+  for m in mentions:
+    bucket = seen.setdefault(m.structural_hash, [])
+    if not any(m.is_equivalent(other) for other in bucket):
+      bucket.append(m)
+      unique.append(m)
+  return unique
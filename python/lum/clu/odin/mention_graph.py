@@ -0,0 +1,128 @@
+from __future__ import annotations
+from lum.clu.odin.mention import Mention
+from lum.clu.processors.compact_graph import CompactGraph
+from lum.clu.processors.utils import Vocabulary
+from array import array
+import typing
+
+__all__ = ["MentionGraph"]
+
+Role = typing.Union[None, str, typing.Iterable[str]]
+
+
+class MentionGraph:
+  """
+  The DAG formed by a collection of mentions and everything they're built from (triggers, arguments, anchors, and neighbors).
+
+  Each distinct mention (by identity) is assigned a dense ID (in discovery order, starting with the provided mentions).
+  Edges point from a mention to each of its components and are labeled with the component's role (ex. `trigger` or an argument name).
+  They're stored as a `lum.clu.processors.compact_graph.CompactGraph`, so every query below is an iterative traversal of flat arrays.
+  """
+
+  __slots__ = ("mentions", "graph", "_ids")
+
+  def __init__(self, mentions: typing.Iterable[Mention]):
+    self.mentions: list[Mention] = []
+    # id(mention) -> dense ID
+    self._ids: dict[int, int] = dict()
+    roles = Vocabulary()
+    sources, destinations, relations = array("i"), array("i"), array("i")
+    for m in mentions:
+      self._add(m)
+    # mentions are appended as they're discovered, so this also visits each component
+    i = 0
+    while i < len(self.mentions):
+      for role, components in self.mentions[i]._components():
+        role_id = roles.index(role)
+        for c in components:
+          sources.append(i)
+          destinations.append(self._add(c))
+          relations.append(role_id)
+      i += 1
+    self.graph = CompactGraph(sources, destinations, relations, roles, num_nodes=len(self.mentions))
+
+  def _add(self, m: Mention) -> int:
+    i = self._ids.get(id(m), None)
+    if i is None:
+      i = len(self.mentions)
+      self._ids[id(m)] = i
+      self.mentions.append(m)
+    return i
+
+  def __len__(self) -> int:
+    return len(self.mentions)
+
+  def __contains__(self, m: Mention) -> bool:
+    return id(m) in self._ids
+
+  def __repr__(self) -> str:
+    return f"MentionGraph(num_mentions={len(self.mentions)}, num_edges={self.graph.num_edges})"
+
+  def id_of(self, m: Mention) -> int:
+    """The dense ID of `m`"""
+    i = self._ids.get(id(m), None)
+    if i is None:
+      raise KeyError(f"{m!r} is not part of this MentionGraph")
+    return i
+
+  def children(self, m: Mention, role: Role = None) -> list[typing.Tuple[str, Mention]]:
+    """(role, mention) for each component of `m` (optionally restricted to one or more roles)"""
+    mentions = self.mentions
+    return [(r, mentions[c]) for c, r in self.graph.outgoing(self.id_of(m), role)]
+
+  def referencing(self, m: Mention, role: Role = None) -> list[typing.Tuple[str, Mention]]:
+    """(role, mention) for each mention that uses `m` directly (optionally only in one or more roles)"""
+    mentions = self.mentions
+    return [(r, mentions[p]) for p, r in self.graph.incoming(self.id_of(m), role)]
+
+  def _reachable(self, start: int, edges_of: typing.Callable[[int], array], ends: array) -> list[int]:
+    seen = bytearray(len(self.mentions))
+    seen[start] = 1
+    found: list[int] = []
+    frontier = [start]
+    while len(frontier) > 0:
+      i = frontier.pop()
+      for ei in edges_of(i):
+        j = ends[ei]
+        if not seen[j]:
+          seen[j] = 1
+          found.append(j)
+          frontier.append(j)
+    return sorted(found)
+
+  def descendants(self, m: Mention) -> list[Mention]:
+    """Every mention `m` is (directly or indirectly) built from (ordered by ID)"""
+    mentions = self.mentions
+    return [mentions[i] for i in self._reachable(self.id_of(m), self.graph.outgoing_edges, self.graph.destinations)]
+
+  def ancestors(self, m: Mention) -> list[Mention]:
+    """Every mention (directly or indirectly) built from `m` (ordered by ID)"""
+    mentions = self.mentions
+    return [mentions[i] for i in self._reachable(self.id_of(m), self.graph.incoming_edges, self.graph.sources)]
+
+  def topological_order(self) -> array:
+    """
+    IDs of every mention such that each mention precedes the mentions it's built from (reverse it to visit components first).
+    """
+    outgoing_edges = self.graph.outgoing_edges
+    destinations = self.graph.destinations
+    remaining = self.graph.in_degrees
+    order = array("i", (i for i, degree in enumerate(remaining) if degree == 0))
+    i = 0
+    while i < len(order):
+      node = order[i]
+      for ei in outgoing_edges(node):
+        child = destinations[ei]
+        remaining[child] -= 1
+        if remaining[child] == 0:
+          order.append(child)
+      i += 1
+    if len(order) != len(self.mentions):
+      raise ValueError("Mention arguments contain a cycle")
+    return order
+
+  @property
+  def roots(self) -> list[Mention]:
+    """Mentions that aren't used by any other mention in the graph"""
+    mentions = self.mentions
+    return [mentions[i] for i, degree in enumerate(self.graph.in_degrees) if degree == 0]
@@ -0,0 +1,174 @@
+from __future__ import annotations
+from lum.clu.odin.mention import Mention
+from lum.clu.processors.document import Document
+from lum.clu.processors.utils import Vocabulary
+from array import array
+from bisect import bisect_left
+import heapq
+import re
+import typing
+
+__all__ = ["MentionIndex"]
+
+Pattern = typing.Union[str, re.Pattern]
+
+
+class MentionIndex:
+  """
+  Postings (sorted arrays of mention IDs) for label, label pattern, document, and sentence lookups.
+
+  A mention's `labels` are its hypernym chain (ex. `["Transport", "Event"]`), so a mention is posted under every one of its labels:
+  querying `"Event"` finds every mention that is an `Event`, including its hyponyms.
+  `primary=True` restricts a query to each mention's first (most specific) label.
+
+  Label patterns are resolved against the label vocabulary (not each mention) and cached until new labels are added.
+  Filters are combined by intersecting postings, starting from the smallest.
+  Mentions can be added at any time (ex. as rules fire). Results are in insertion order.
+  """
+
+  def __init__(self, mentions: typing.Iterable[Mention] = ()):
+    self.mentions: list[Mention] = []
+    self.labels = Vocabulary()
+    # label ID -> mention IDs
+    self._any_label: list[array] = []
+    self._primary_label: list[array] = []
+    # label ID -> IDs of labels that have it as a hypernym
+    self._hyponyms: list[typing.Set[int]] = []
+    # id(document) -> mention IDs
+    self._documents: dict[int, array] = dict()
+    # sentence index -> mention IDs (across documents)
+    self._sentences: dict[int, array] = dict()
+    # (id(document), sentence index) -> mention IDs
+    self._document_sentences: dict[typing.Tuple[int, int], array] = dict()
+    # pattern -> (vocabulary size when resolved, label IDs)
+    self._patterns: dict[Pattern, typing.Tuple[int, list[int]]] = dict()
+    self.extend(mentions)
+
+  def _label_id(self, label: str) -> int:
+    label_id = self.labels.index(label)
+    if label_id == len(self._any_label):
+      self._any_label.append(array("i"))
+      self._primary_label.append(array("i"))
+      self._hyponyms.append(set())
+    return label_id
+
+  def add(self, m: Mention) -> int:
+    """Indexes `m` and returns its ID"""
+    i = len(self.mentions)
+    self.mentions.append(m)
+    label_ids = [self._label_id(label) for label in m.labels]
+    for k, label_id in enumerate(label_ids):
+      postings = self._any_label[label_id]
+      # a label might be repeated in the chain
+      if len(postings) == 0 or postings[-1] != i:
+        postings.append(i)
+      self._hyponyms[label_id].update(label_ids[:k])
+    if len(label_ids) > 0:
+      self._primary_label[label_ids[0]].append(i)
+    doc_key = id(m.document)
+    for postings, key in ((self._documents, doc_key), (self._sentences, m.sentence_index), (self._document_sentences, (doc_key, m.sentence_index))):
+      if key not in postings:
+        postings[key] = array("i")
+      postings[key].append(i)
+    return i
+
+  def extend(self, mentions: typing.Iterable[Mention]) -> None:
+    for m in mentions:
+      self.add(m)
+
+  def __len__(self) -> int:
+    return len(self.mentions)
+
+  def hyponyms(self, label: str) -> list[str]:
+    """Labels that `label` is a hypernym of (i.e., that precede it in some mention's labels)"""
+    if label not in self.labels:
+      return []
+    return sorted(self.labels[h] for h in self._hyponyms[self.labels.index(label)])
+
+  def matching_labels(self, pattern: Pattern) -> list[str]:
+    """Labels matched (`re.match`) by `pattern` (see `Mention.matches`)"""
+    return [self.labels[label_id] for label_id in self._pattern_ids(pattern)]
+
+  def _pattern_ids(self, pattern: Pattern) -> list[int]:
+    size = len(self.labels)
+    cached = self._patterns.get(pattern, None)
+    if cached is not None and cached[0] == size:
+      return cached[1]
+    compiled = re.compile(pattern)
+    label_ids = [label_id for label_id, label in enumerate(self.labels) if compiled.match(label)]
+    self._patterns[pattern] = (size, label_ids)
+    return label_ids
+
+  @staticmethod
+  def _union(postings: list[array]) -> array:
+    if len(postings) == 1:
+      return postings[0]
+    merged = array("i")
+    for i in heapq.merge(*postings):
+      if len(merged) == 0 or merged[-1] != i:
+        merged.append(i)
+    return merged
+
+  @staticmethod
+  def _intersect(postings: list[array]) -> array:
+    postings = sorted(postings, key=len)
+    result = postings[0]
+    for other in postings[1:]:
+      # binary search for each of the (fewer) remaining IDs
+      found = array("i")
+      lo = 0
+      for i in result:
+        lo = bisect_left(other, i, lo)
+        if lo == len(other):
+          break
+        if other[lo] == i:
+          found.append(i)
+      result = found
+    return result
+
+  def ids(
+    self,
+    label: typing.Optional[str] = None,
+    pattern: typing.Optional[Pattern] = None,
+    document: typing.Optional[Document] = None,
+    sentence_index: typing.Optional[int] = None,
+    primary: bool = False
+  ) -> array:
+    """
+    IDs (positions in `MentionIndex.mentions`) of the mentions satisfying every given filter (see `MentionIndex.find`).
+    NOTE: without `document`, `sentence_index` matches that sentence of *every* indexed document.
+    """
+    by_label = self._primary_label if primary else self._any_label
+    filters: list[array] = []
+    if label is not None:
+      filters.append(by_label[self.labels.index(label)] if label in self.labels else array("i"))
+    if pattern is not None:
+      filters.append(MentionIndex._union([by_label[label_id] for label_id in self._pattern_ids(pattern)] or [array("i")]))
+    if document is not None and sentence_index is not None:
+      filters.append(self._document_sentences.get((id(document), sentence_index), array("i")))
+    elif document is not None:
+      filters.append(self._documents.get(id(document), array("i")))
+    elif sentence_index is not None:
+      filters.append(self._sentences.get(sentence_index, array("i")))
+    if len(filters) == 0:
+      return array("i", range(len(self.mentions)))
+    if len(filters) == 1:
+      # never expose the postings themselves
+      return array("i", filters[0])
+    return MentionIndex._intersect(filters)
+
+  def find(
+    self,
+    label: typing.Optional[str] = None,
+    pattern: typing.Optional[Pattern] = None,
+    document: typing.Optional[Document] = None,
+    sentence_index: typing.Optional[int] = None,
+    primary: bool = False
+  ) -> list[Mention]:
+    """
+    Mentions with `label` (or a label matching `pattern`) in the given document and/or sentence.
+    If `primary` is True, only each mention's first label is considered.
+    `sentence_index` is relative to a document, so without `document` it matches that sentence of every indexed document (ex. the first sentence of each).
+    """
+    mentions = self.mentions
+    return [mentions[i] for i in self.ids(label=label, pattern=pattern, document=document, sentence_index=sentence_index, primary=primary)]
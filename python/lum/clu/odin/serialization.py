@@ -1,8 +1,14 @@
 from lum.clu.odin.mention import (Mention, TextBoundMention, RelationMention, EventMention, CrossSentenceMention)
-from lum.clu.processors.document import Document
+from lum.clu.processors.document import Document, LazyDocument
+from lum.clu.processors.interning import Interner
 from lum.clu.processors.interval import Interval
+from lum.clu.odin.streaming import CompactMentionsIndex, open_seekable_binary
+from lum.clu.odin.synpath import SynPath
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import functools
+import json
+import os
 import typing
-import collections
 
 __all__ = ["OdinJsonSerializer"]
 
@@ -48,230 +54,338 @@ class OdinJsonSerializer:
   MENTION_E_TYPE = "EventMention"
   MENTION_C_TYPE = "CrossSentenceMention"
 
-  # @staticmethod
-  # def to_compact_mentions_json(jdata: dict[str, typing.Any]) -> list[Mention]:
-  #   pass
+  MENTION_SHORT_TYPES: typing.ClassVar[dict[str, str]] = {
+    MENTION_TB_TYPE: "T",
+    MENTION_R_TYPE: "R",
+    MENTION_E_TYPE: "E",
+    MENTION_C_TYPE: "CS"
+  }
+
+  @staticmethod
+  def to_compact_mentions_json(mentions: typing.Iterable[Mention]) -> dict[str, typing.Any]:
+    """
+    Converts mentions to compact JSON (see `OdinJsonSerializer.write_compact_mentions_json`).
+    """
+    writer = _CompactMentionsWriter(mentions)
+    return {
+      "documents": dict(writer.documents_json()),
+      "mentions": list(writer.mentions_json())
+    }
+
+  @staticmethod
+  def write_compact_mentions_json(mentions: typing.Iterable[Mention], fp: typing.TextIO) -> None:
+    """
+    Streams mentions to `fp` as compact JSON.
+
+    Each unique `Document` is written once (keyed by its equivalence hash).
+    Arguments, triggers, anchors, and neighbors are written by reference (`{"id": ...}`) when they are one of the provided mentions.
+    All other mentions are written in full at their first reference and by ID thereafter.
+    Paths are written for every key that is part of the export.
+    """
+    writer = _CompactMentionsWriter(mentions)
+    fp.write('{"documents": {')
+    for i, (doc_key, doc_json) in enumerate(writer.documents_json()):
+      if i > 0:
+        fp.write(", ")
+      fp.write(json.dumps(doc_key))
+      fp.write(": ")
+      fp.write(json.dumps(doc_json))
+    fp.write('}, "mentions": [')
+    for i, mjson in enumerate(writer.mentions_json()):
+      if i > 0:
+        fp.write(", ")
+      fp.write(json.dumps(mjson))
+    fp.write("]}")
 
   # don't blow the stack
   @staticmethod
-  def from_compact_mentions_json(compact_json: dict[str, typing.Any]) -> list[Mention]:
+  def from_compact_mentions_json(compact_json: dict[str, typing.Any], trusted: bool = False, lazy: bool = False, interner: typing.Optional[Interner] = None) -> list[Mention]:
+    """
+    Loads mentions from compact JSON.
+
+    If `trusted` is True, documents and mentions are constructed without validation (see `lum.clu.processors.utils.Trusted`).
+    Only use this for JSON produced by CLU (ex. the Scala processors).
+    If `lazy` is True, each document is loaded as a `lum.clu.processors.document.LazyDocument`, which only builds the sentences that are accessed.
+    If an `interner` is provided, annotations and labels are interned as they're loaded (see `lum.clu.processors.interning.Interner`).
+    """
+    docs_map = OdinJsonSerializer._load_documents(compact_json["documents"], trusted=trusted, lazy=lazy, interner=interner)
+    return OdinJsonSerializer._load_mentions(compact_json["mentions"], docs_map, trusted=trusted, interner=interner)
+
+  @staticmethod
+  def iter_compact_mentions_json(source: typing.Union[str, os.PathLike, typing.IO], chunk_size: int = 1 << 20, trusted: bool = False, lazy: bool = False, interner: typing.Optional[Interner] = None) -> typing.Iterator[typing.Tuple[Document, list[Mention]]]:
+    """
+    Incrementally reads compact mentions JSON from a file object (or path), yielding `(Document, list[Mention])` for each document.
+
+    Memory is bounded by the largest document (and its mentions) rather than by the whole file.
+    The file is scanned once to locate each document and mention; each document is then loaded (along with its mentions) only when it is yielded.
+    Non-seekable streams are first spooled to a temporary file.
+    See `OdinJsonSerializer.from_compact_mentions_json` for `trusted`, `lazy`, and `interner`.
+    """
+    with open_seekable_binary(source) as fp:
+      index = CompactMentionsIndex.build(fp, chunk_size=chunk_size)
+      for doc_id, doc_json, mentions_json in index.iter_json(fp):
+        docs_map = OdinJsonSerializer._load_documents({doc_id: doc_json}, trusted=trusted, lazy=lazy, interner=interner)
+        yield docs_map[doc_id], OdinJsonSerializer._load_mentions(mentions_json, docs_map, trusted=trusted, interner=interner)
+
+  @staticmethod
+  def load_compact_mentions_files(
+    paths: typing.Iterable[typing.Union[str, os.PathLike]],
+    workers: typing.Optional[int] = None,
+    ordered: bool = True,
+    trusted: bool = False,
+    lazy: bool = False,
+    interner: typing.Optional[Interner] = None
+  ) -> typing.Iterator[typing.Tuple[typing.Union[str, os.PathLike], list[Mention]]]:
+    """
+    Loads many compact mentions JSON files in parallel, yielding `(path, list[Mention])` for each file.
+
+    Files are parsed across `workers` processes (default: every core available to this process).
+    If `ordered` is True, results are yielded in the order of `paths`; otherwise, they are yielded as soon as each file is loaded.
+    Each file's mentions are sent back as a single list, so every `Document` (and shared argument) is pickled once per file rather than once per mention.
+    See `OdinJsonSerializer.from_compact_mentions_json` for `trusted`, `lazy`, and `interner`.
+    Interning happens in this process (after each file's mentions are received), so that every file shares the same vocabularies.
+    """
+    paths = list(paths)
+    workers = min(workers or _available_cpus(), max(len(paths), 1))
+    load = functools.partial(_load_compact_mentions_file, trusted=trusted, lazy=lazy)
+    intern = functools.partial(OdinJsonSerializer._intern_all, interner=interner) if interner is not None else (lambda mentions: mentions)
+    if workers <= 1:
+      for path in paths:
+        yield path, intern(load(path))
+      return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+      if ordered:
+        for path, mentions in zip(paths, executor.map(load, paths)):
+          yield path, intern(mentions)
+      else:
+        futures = {executor.submit(load, path): path for path in paths}
+        for future in as_completed(futures):
+          yield futures[future], intern(future.result())
+
+  @staticmethod
+  def _intern_all(mentions: list[Mention], interner: Interner) -> list[Mention]:
+    """Interns `mentions`, everything they depend on, and their documents"""
+    seen: typing.Set[int] = set()
+    stack = list(mentions)
+    while len(stack) > 0:
+      m = stack.pop()
+      if id(m) in seen:
+        continue
+      seen.add(id(m))
+      stack.extend(m.dependencies())
+      interner.intern_mention(m)
+      if id(m.document) not in seen:
+        seen.add(id(m.document))
+        interner.intern_document(m.document)
+    return mentions
 
+  @staticmethod
+  def _load_documents(documents_json: dict[str, dict[str, typing.Any]], trusted: bool = False, lazy: bool = False, interner: typing.Optional[Interner] = None) -> dict[str, Document]:
     # populate mapping of doc id -> Document
     docs_map = dict()
-    for doc_id, doc_json in compact_json["documents"].items():
+    for doc_id, doc_json in documents_json.items():
       # store ID if not set
       if "id" not in doc_json:
         doc_json.update({"id": doc_id})
-      docs_map[doc_id] = Document(**doc_json)
+      if lazy:
+        docs_map[doc_id] = LazyDocument.from_json(doc_json, trusted=trusted, interner=interner)
+      elif trusted:
+        docs_map[doc_id] = Document.from_trusted_json(doc_json, interner=interner)
+      else:
+        docs_map[doc_id] = Document(**doc_json)
+        if interner is not None:
+          interner.intern_document(docs_map[doc_id])
+    return docs_map
+
+  @staticmethod
+  def _load_mentions(mentions_json: list[dict[str, typing.Any]], docs_map: dict[str, Document], trusted: bool = False, interner: typing.Optional[Interner] = None) -> list[Mention]:
+    # index of mention id -> mention json.
+    # nested json (args, triggers, etc.) is added as we encounter it.
+    index: dict[str, dict[str, typing.Any]] = dict()
+    # preserve the order of the top-level mentions
+    mention_ids: list[str] = []
+    for mjson in mentions_json:
+      m_id = mjson["id"]
+      if m_id not in index:
+        index[m_id] = mjson
+        mention_ids.append(m_id)
 
     mentions_map: dict[str, Mention] = dict()
-    mention_ids: typing.Set[str] = {mn.get("id") for mn in compact_json["mentions"]}
-    # attack TBMs first
-    srt_fn = lambda mid: -1 if mid.startswith("T") else 1
-    # make a queue w/ TBMs first
-    missing: collections.deque = collections.deque(sorted(list(mention_ids), key=srt_fn))
-
-    while len(missing) > 0:
-      m_id = missing.popleft()
-      # pop a key and try to create the mention map
-      _, mns_map = OdinJsonSerializer._fetch_mention(
-        m_id=m_id, 
-        compact_json=compact_json, 
+    # identical triggers (under different IDs) are shared by their events.
+    # NOTE: a mention's hashed fields are frozen once it's hashed, so these keys can't change (see `Mention.__setattr__`)
+    triggers: dict[Mention, Mention] = dict()
+    for m_id in mention_ids:
+      OdinJsonSerializer._load_mention(
+        m_id=m_id,
+        mentions_json=index,
         docs_map=docs_map,
-        mentions_map=mentions_map
+        mentions_map=mentions_map,
+        trusted=trusted,
+        triggers=triggers
       )
-      # store new results
-      mentions_map.update(mns_map)
-      # filter out newly constructed mentions
-      missing = collections.deque([k for k in missing if k not in mentions_map])
-    #return list(mentions_map.values())
+    # paths may refer to any mention in the export, so they're resolved once everything else has been loaded
+    resolved = 0
+    while resolved < len(mentions_map):
+      for m_id in list(mentions_map.keys())[resolved:]:
+        resolved += 1
+        m = mentions_map[m_id]
+        paths_json = index[m_id].get("paths", None)
+        if not paths_json or isinstance(m, (TextBoundMention, CrossSentenceMention)):
+          continue
+        for role_paths in paths_json.values():
+          for key_id in role_paths.keys():
+            OdinJsonSerializer._load_mention(key_id, mentions_json=index, docs_map=docs_map, mentions_map=mentions_map, trusted=trusted, triggers=triggers)
+        m.paths = OdinJsonSerializer.construct_paths(paths_json, m.document, m.sentence_index, mentions_map)
+    if interner is not None:
+      for m in mentions_map.values():
+        interner.intern_mention(m)
     # avoids unraveling mentions to include triggers, etc.
-    return [m for mid, m in mentions_map.items() if mid in mention_ids]
+    return [mentions_map[m_id] for m_id in mention_ids]
 
   @staticmethod
-  def _fetch_mention(m_id: str, compact_json: dict[str, typing.Any], docs_map: dict[str, Document], mentions_map: dict[str, Mention]) -> typing.Tuple[Mention, dict[str, Mention]]:
+  def _dependencies(mjson: dict[str, typing.Any]) -> typing.Iterator[dict[str, typing.Any]]:
+    """Yields the json for each mention that must be constructed before the mention described by `mjson`"""
+    for mns_json in mjson.get("arguments", {}).values():
+      yield from mns_json
+    if mjson["type"] == OdinJsonSerializer.MENTION_E_TYPE:
+      yield mjson["trigger"]
+    elif mjson["type"] == OdinJsonSerializer.MENTION_C_TYPE:
+      yield mjson["anchor"]
+      yield mjson["neighbor"]
+
+  @staticmethod
+  def _load_mention(
+    m_id: str,
+    mentions_json: dict[str, dict[str, typing.Any]],
+    docs_map: dict[str, Document],
+    mentions_map: dict[str, Mention],
+    trusted: bool = False,
+    triggers: typing.Optional[dict[Mention, Mention]] = None
+  ) -> Mention:
+    """
+    Constructs the mention with ID `m_id` (and any mentions it depends on) exactly once.
+
+    Dependencies are resolved using an explicit stack (post-order), so deeply nested events won't hit the recursion limit.
+    """
     # base case
     if m_id in mentions_map:
-      return mentions_map[m_id], mentions_map
-     
-    mjson: dict[str, typing.Any] = [mn for mn in compact_json["mentions"] if mn.get("id", None)== m_id][0]
+      return mentions_map[m_id]
+    # mentions whose dependencies have already been scheduled
+    expanded: typing.Set[str] = set()
+    stack: list[str] = [m_id]
+    while len(stack) > 0:
+      current = stack[-1]
+      if current in mentions_map:
+        stack.pop()
+        continue
+      if current not in mentions_json:
+        raise KeyError(f"Mention {current} is referenced, but its JSON was not found")
+      mjson = mentions_json[current]
+      pending: list[str] = []
+      for dep_json in OdinJsonSerializer._dependencies(mjson):
+        dep_id = dep_json["id"]
+        if dep_id in mentions_map:
+          continue
+        # NOTE: in certain cases, the referenced mid might not be found in the compact_json.
+        # we'll add it to be safe.
+        # references w/o a type (i.e., {"id": ...}) are defined elsewhere (see OdinJsonSerializer.to_compact_mentions_json)
+        if dep_id not in mentions_json and "type" in dep_json:
+          # triggers were historically loaded with keep=False unless specified
+          if dep_json is mjson.get("trigger", None) and "keep" not in dep_json:
+            dep_json = {**dep_json, "keep": False}
+          mentions_json[dep_id] = dep_json
+        pending.append(dep_id)
+      if len(pending) > 0:
+        if current in expanded:
+          raise Exception(f"Cycle detected while loading mention {current}")
+        expanded.add(current)
+        # reversed so that dependencies are constructed in their original order
+        stack.extend(reversed(pending))
+        continue
+      # everything this mention needs is available
+      mentions_map[current] = OdinJsonSerializer._construct_mention(
+        mjson=mjson,
+        docs_map=docs_map,
+        mentions_map=mentions_map,
+        trusted=trusted,
+        triggers=triggers
+      )
+      stack.pop()
+    return mentions_map[m_id]
+
+  @staticmethod
+  def _construct_mention(
+    mjson: dict[str, typing.Any],
+    docs_map: dict[str, Document],
+    mentions_map: dict[str, Mention],
+    trusted: bool = False,
+    triggers: typing.Optional[dict[Mention, Mention]] = None
+  ) -> Mention:
+    """
+    Constructs a single mention. Assumes all of its dependencies are present in `mentions_map`.
+    If `triggers` is provided, an event's trigger is replaced with the first equal trigger that was seen (see `Mention.structural_hash`).
+    """
     mtype = mjson["type"]
     # gather general info
-    labels = mjson["labels"]
-    token_interval = Interval(**mjson["tokenInterval"])
-    document = docs_map[mjson["document"]]
-    start = mjson["characterStartOffset"]
-    end = mjson["characterEndOffset"]
-    sentence_index = mjson["sentence"]
-    found_by = mjson["foundBy"]
-    keep = mjson.get("keep", True)
+    fields: dict[str, typing.Any] = {
+      "labels": mjson["labels"],
+      # untrusted intervals are validated along with the rest of the mention
+      "token_interval": Interval(**mjson["tokenInterval"]) if trusted else mjson["tokenInterval"],
+      "sentence_index": mjson["sentence"],
+      "document": docs_map[mjson["document"]],
+      "found_by": mjson["foundBy"],
+      "keep": mjson.get("keep", True)
+    }
     # easy case. We have everything we need.
     if mtype == OdinJsonSerializer.MENTION_TB_TYPE:
-      m = TextBoundMention(
-        labels=labels,
-        token_interval=token_interval,
-        sentence_index=sentence_index,
-        start=start,
-        end=end,
-        document=document,
-        found_by=found_by,
-        keep=keep
-      )
-      mentions_map[m_id] = m
-      return (m, mentions_map)
-    # everything else *might* have paths
-    paths: typing.Optional[Mention.Paths] = OdinJsonSerializer.construct_paths(mjson.get("paths", None))
-    # retrieve all args recursively
-    arguments: Mention.Arguments = dict()
-    for role, mns_json in mjson.get("arguments", {}).items():
-        role_mns = arguments.get(role, [])
-        for mn_json in mns_json:
-          _mid = mn_json["id"]
-          if _mid in mentions_map:
-            _mn = mentions_map[_mid]
-          else:
-            # NOTE: in certain cases, the referenced mid might not be found in the compact_json.
-            # we'll add it to be safe.
-            if all(m["id"] != _mid for m in compact_json["mentions"]):
-               compact_json["mentions"] = compact_json["mentions"] + [mn_json]
-            _mn, _mns_map = OdinJsonSerializer._fetch_mention(
-              m_id=_mid, 
-              compact_json=compact_json, 
-              docs_map=docs_map, mentions_map=mentions_map
-            )
-            # update our progress
-            mentions_map.update(_mns_map)
-          # store this guy
-          role_mns.append(_mn)
-        # update our args
-        arguments[role] = role_mns
-          
-    if mtype == OdinJsonSerializer.MENTION_E_TYPE:
-        # get or load trigger
-        trigger_mjson = mjson["trigger"]
-        trigger_id = trigger_mjson["id"]
-        if trigger_id in mentions_map:
-          trigger = mentions_map[trigger_id]
-        # avoid a recursive call 
-        # for the sake of the stack...
-        else:
-          trigger = TextBoundMention(
-            labels=trigger_mjson["labels"],
-            token_interval=Interval(**trigger_mjson["tokenInterval"]),
-            sentence_index=trigger_mjson["sentence"],
-            start=trigger_mjson["characterStartOffset"],
-            end=trigger_mjson["characterEndOffset"],
-            document=docs_map[trigger_mjson["document"]],
-            found_by=trigger_mjson["foundBy"],
-            keep=trigger_mjson.get("keep", False)
-          )
-        # we have what we need
-        m = EventMention(
-          labels=labels,
-          token_interval=token_interval,
-          trigger=trigger,
-          sentence_index=sentence_index,
-          start=start,
-          end=end,
-          document=document,
-          arguments=arguments,
-          paths=paths,
-          found_by=found_by,
-          keep=keep
-        )
-        mentions_map[m_id] = m
-        return (m, mentions_map)
-    if mtype == OdinJsonSerializer.MENTION_R_TYPE:
-        # we have what we need
-        m = RelationMention(
-          labels=labels,
-          token_interval=token_interval,
-          sentence_index=sentence_index,
-          start=start,
-          end=end,
-          document=document,
-          arguments=arguments,
-          paths=paths,
-          found_by=found_by,
-          keep=keep
-        )
-        mentions_map[m_id] = m
-        return (m, mentions_map)
-    if mtype == OdinJsonSerializer.MENTION_C_TYPE:
-        # anchor
-        # this will be one of our args (see https://github.com/clulab/processors/blob/9f89ea7bf6ac551f77dbfdbb8eec9bf216711df4/main/src/main/scala/org/clulab/odin/Mention.scala#L535), so we'll be lazy
-        anchor: Mention = mentions_map[mjson["anchor"]["id"]]
-        # neighbor
-        # this will be one of our args (see https://github.com/clulab/processors/blob/9f89ea7bf6ac551f77dbfdbb8eec9bf216711df4/main/src/main/scala/org/clulab/odin/Mention.scala#L535), so we'll be lazy
-        neighbor: Mention = mentions_map[mjson["neighbor"]["id"]]
-        # we have what we need
-        m = CrossSentenceMention(
-          labels=labels,
-          token_interval=token_interval,
-          anchor=anchor,
-          neighbor=neighbor,
-          # corresponds to anchor.sentence_inde
-          sentence_index=sentence_index,
-          start=start,
-          end=end,
-          document=document,
-          arguments=arguments,
-          paths=None,
-          found_by=found_by,
-          keep=keep
-        )
-        mentions_map[m_id] = m
-        return (m, mentions_map)
+      mention_cls: typing.Type[Mention] = TextBoundMention
     else:
-       raise Exception(f"Unrecognized mention type {mtype}. Expected one of the following {OdinJsonSerializer.MENTION_TB_TYPE}, {OdinJsonSerializer.MENTION_E_TYPE}, {OdinJsonSerializer.MENTION_R_TYPE}, {OdinJsonSerializer.MENTION_C_TYPE}")
-    
-  @staticmethod
-  def construct_paths(maybe_path_data: typing.Optional[dict[str, typing.Any]]) -> typing.Optional[Mention.Paths]:
-     # FIXME: implement me
-     return None
-     
-  @staticmethod
-  def _load_mention_from_compact_JSON(mention_id: str, compact_json: dict[str, typing.Any], docs_dict: dict[str, Document], mentions_dict: dict[str, Mention]):
-      mjson = compact_json["mentions"][mention_id]
-      # recover document
-      document = docs_dict[mjson["document"]]
-      # TODO: load args
-
-      # collect components
-      mtype = mjson["type"]
-      labels = mjson["labels"]
-      token_interval = Interval(**mjson["tokenInterval"])
-      if mtype == OdinJsonSerializer.MENTION_TB_TYPE:
-         raise NotImplementedError
-      elif mtype == OdinJsonSerializer.MENTION_E_TYPE:
-         # get or load trigger
-         raise NotImplementedError
+      # retrieve all args
+      fields["arguments"] = {
+        role: [mentions_map[mn_json["id"]] for mn_json in mns_json]
+        for role, mns_json in mjson.get("arguments", {}).items()
+      }
+      # everything else *might* have paths (see OdinJsonSerializer._load_mentions)
+      fields["paths"] = None
+      if mtype == OdinJsonSerializer.MENTION_E_TYPE:
+        mention_cls = EventMention
+        trigger = mentions_map[mjson["trigger"]["id"]]
+        fields["trigger"] = triggers.setdefault(trigger, trigger) if triggers is not None else trigger
       elif mtype == OdinJsonSerializer.MENTION_R_TYPE:
-         raise NotImplementedError
+        mention_cls = RelationMention
       elif mtype == OdinJsonSerializer.MENTION_C_TYPE:
-         raise NotImplementedError
-         
-      kwargs = {
-          "label": mjson.get("label", labels[0]),
-          "labels": labels,
-          "token_interval": Interval.load_from_JSON(mjson["tokenInterval"]),
-          "sentence": mjson["sentence"],
-          "document": doc,
-          "doc_id": doc_id,
-          "trigger": mjson.get("trigger", None),
-          "arguments": mjson.get("arguments", None),
-          "paths": mjson.get("paths", None),
-          "keep": mjson.get("keep", True),
-          "foundBy": mjson["foundBy"]
+        mention_cls = CrossSentenceMention
+        # anchor & neighbor
+        # these will be among our args (see https://github.com/clulab/processors/blob/9f89ea7bf6ac551f77dbfdbb8eec9bf216711df4/main/src/main/scala/org/clulab/odin/Mention.scala#L535)
+        fields["anchor"] = mentions_map[mjson["anchor"]["id"]]
+        fields["neighbor"] = mentions_map[mjson["neighbor"]["id"]]
+        fields["paths"] = None
+      else:
+        raise Exception(f"Unrecognized mention type {mtype}. Expected one of the following {OdinJsonSerializer.MENTION_TB_TYPE}, {OdinJsonSerializer.MENTION_E_TYPE}, {OdinJsonSerializer.MENTION_R_TYPE}, {OdinJsonSerializer.MENTION_C_TYPE}")
+    # we have what we need
+    return mention_cls.from_trusted(**fields) if trusted else mention_cls(**fields)
+
+  @staticmethod
+  def construct_paths(
+    maybe_path_data: typing.Optional[dict[str, typing.Any]],
+    document: Document,
+    sentence_index: int,
+    mentions_map: dict[str, Mention]
+  ) -> typing.Optional[Mention.Paths]:
+    """
+    Converts `{role: {mention ID: [edge json, ...]}}` to `{role: {Mention: SynPath}}`.
+    Each `SynPath` is decoded on first access (see `SynPath.from_json`).
+    """
+    if maybe_path_data is None:
+      return None
+    return {
+      role: {
+        mentions_map[m_id]: SynPath.from_json(edges, document, sentence_index)
+        for m_id, edges in role_paths.items()
       }
-      m = Mention(**kwargs)
-      # set IDs
-      m.id = mjson["id"]
-      m._doc_id = doc_id
-      # set character offsets
-      m.character_start_offset = mjson["characterStartOffset"]
-      m.character_end_offset = mjson["characterEndOffset"]
-      return m
+      for role, role_paths in maybe_path_data.items()
+    }
+     
 
   # def to_JSON_dict(self):
   #     m = dict()
@@ -295,4 +409,144 @@ class OdinJsonSerializer:
   #         m["paths"] = self.paths
   #     m["keep"] = self.keep
   #     m["foundBy"] = self.foundBy
-  #     return m
\ No newline at end of file
+  #     return m
+
+
+def _available_cpus() -> int:
+  """Number of cores this process may run on"""
+  if hasattr(os, "sched_getaffinity"):
+    return len(os.sched_getaffinity(0))
+  return os.cpu_count() or 1
+
+def _load_compact_mentions_file(path: typing.Union[str, os.PathLike], trusted: bool = False, lazy: bool = False) -> list[Mention]:
+  # module-level so that it can be sent to worker processes
+  with open(path, "rb") as infile:
+    compact_json = json.load(infile)
+  return OdinJsonSerializer.from_compact_mentions_json(compact_json, trusted=trusted, lazy=lazy)
+
+class _CompactMentionsWriter:
+  """Assigns IDs to mentions and documents and produces the pieces of the compact mentions JSON"""
+
+  def __init__(self, mentions: typing.Iterable[Mention]):
+    self.mentions: list[Mention] = list(mentions)
+    # id(mention) -> mention ID
+    self._mention_ids: dict[int, str] = dict()
+    # id(document) -> document key
+    self._doc_keys: dict[int, str] = dict()
+    # document key -> equivalence digest
+    self._key_digests: dict[str, bytes] = dict()
+    for m in self.mentions:
+      self._mention_id(m)
+    # mentions that are written at the top level are always referenced by ID
+    self._written: typing.Set[int] = {id(m) for m in self.mentions}
+    # every mention that is written (see _CompactMentionsWriter._reachable)
+    self._exported: typing.Optional[typing.Set[int]] = None
+
+  @staticmethod
+  def _reachable(mentions: typing.Iterable[Mention]) -> typing.Set[int]:
+    """IDs (i.e., `id(...)`) of `mentions` and every mention they depend on (directly or indirectly)"""
+    reachable: typing.Set[int] = set()
+    stack = list(mentions)
+    while len(stack) > 0:
+      dep = stack.pop()
+      if id(dep) not in reachable:
+        reachable.add(id(dep))
+        stack.extend(dep.dependencies())
+    return reachable
+
+  @staticmethod
+  def _mention_type(m: Mention) -> str:
+    if isinstance(m, EventMention):
+      return OdinJsonSerializer.MENTION_E_TYPE
+    elif isinstance(m, CrossSentenceMention):
+      return OdinJsonSerializer.MENTION_C_TYPE
+    elif isinstance(m, RelationMention):
+      return OdinJsonSerializer.MENTION_R_TYPE
+    return OdinJsonSerializer.MENTION_TB_TYPE
+
+  @staticmethod
+  def document_hash(doc: Document) -> str:
+    """Content hash for a `Document` (used as the key for the document). See `Document.equivalence_hash`."""
+    return str(doc.equivalence_hash)
+
+  def _mention_id(self, m: Mention) -> str:
+    key = id(m)
+    m_id = self._mention_ids.get(key, None)
+    if m_id is None:
+      short_type = OdinJsonSerializer.MENTION_SHORT_TYPES[_CompactMentionsWriter._mention_type(m)]
+      m_id = f"{short_type}:{len(self._mention_ids)}"
+      self._mention_ids[key] = m_id
+    return m_id
+
+  def _doc_key(self, doc: Document) -> str:
+    key = id(doc)
+    doc_key = self._doc_keys.get(key, None)
+    if doc_key is None:
+      doc_key = _CompactMentionsWriter.document_hash(doc)
+      # 32-bit keys can collide, so distinct documents that share a key are keyed by their full digest instead
+      digest = self._key_digests.setdefault(doc_key, doc.equivalence_digest)
+      if digest != doc.equivalence_digest:
+        doc_key = doc.equivalence_digest.hex()
+      self._doc_keys[key] = doc_key
+    return doc_key
+
+  def documents_json(self) -> typing.Iterator[typing.Tuple[str, dict[str, typing.Any]]]:
+    """Yields (document key, document json) for each unique document"""
+    seen_docs: typing.Set[str] = set()
+    seen_mentions: typing.Set[int] = set()
+    stack: list[Mention] = list(reversed(self.mentions))
+    while len(stack) > 0:
+      m = stack.pop()
+      if id(m) in seen_mentions:
+        continue
+      seen_mentions.add(id(m))
+      stack.extend(m.dependencies())
+      doc_key = self._doc_key(m.document)
+      if doc_key not in seen_docs:
+        seen_docs.add(doc_key)
+        yield doc_key, m.document.model_dump(by_alias=True, exclude_none=True)
+
+  def mentions_json(self) -> typing.Iterator[dict[str, typing.Any]]:
+    """Yields the json for each mention"""
+    for m in self.mentions:
+      yield self._mention_json(m)
+
+  def _reference(self, m: Mention) -> dict[str, typing.Any]:
+    if id(m) in self._written:
+      return {"id": self._mention_id(m)}
+    self._written.add(id(m))
+    return self._mention_json(m)
+
+  def _mention_json(self, m: Mention) -> dict[str, typing.Any]:
+    mtype = _CompactMentionsWriter._mention_type(m)
+    mjson: dict[str, typing.Any] = {
+      "type": mtype,
+      "id": self._mention_id(m),
+      "text": m.text,
+      "labels": m.labels,
+      "tokenInterval": {"start": m.start, "end": m.end},
+      "characterStartOffset": m.start_offset,
+      "characterEndOffset": m.end_offset,
+      "sentence": m.sentence_index,
+      "document": self._doc_key(m.document),
+      "keep": m.keep,
+      "foundBy": m.found_by
+    }
+    # NOTE: the order here must match OdinJsonSerializer._dependencies,
+    # so that a mention's first occurrence (i.e., the one written in full) is loaded first.
+    if m.arguments:
+      mjson["arguments"] = {role: [self._reference(arg) for arg in args] for role, args in m.arguments.items()}
+    if isinstance(m, EventMention):
+      mjson["trigger"] = self._reference(m.trigger)
+    if isinstance(m, CrossSentenceMention):
+      mjson["anchor"] = self._reference(m.anchor)
+      mjson["neighbor"] = self._reference(m.neighbor)
+    elif m.paths:
+      # paths can only refer to mentions that are part of the export
+      if self._exported is None:
+        self._exported = _CompactMentionsWriter._reachable(self.mentions)
+      mjson["paths"] = {
+        role: {self._mention_id(key): path.to_json() for key, path in role_paths.items() if id(key) in self._exported}
+        for role, role_paths in m.paths.items()
+      }
+    return mjson
@@ -0,0 +1,142 @@
+from __future__ import annotations
+from lum.clu.odin.mention import Mention
+from lum.clu.processors.document import Document
+from lum.clu.processors.interval import Interval
+from bisect import bisect_left, insort
+import itertools
+import typing
+
+__all__ = ["MentionSpanIndex"]
+
+Span = typing.Union[Interval, typing.Tuple[int, int]]
+
+
+class _SentenceMentions:
+  """The mentions of a single sentence, sorted by (start, end) and by (end, start)"""
+
+  __slots__ = ("by_start", "by_end", "max_size")
+
+  def __init__(self):
+    # (start, end, seq., mention)
+    self.by_start: list[typing.Tuple[int, int, int, Mention]] = []
+    # (end, start, seq., mention)
+    self.by_end: list[typing.Tuple[int, int, int, Mention]] = []
+    self.max_size: int = 0
+
+  def add(self, start: int, end: int, seq: int, m: Mention) -> None:
+    # the seq. number breaks ties, so mentions are never compared
+    insort(self.by_start, (start, end, seq, m))
+    insort(self.by_end, (end, start, seq, m))
+    self.max_size = max(self.max_size, end - start)
+
+  def starting_in(self, lo: int, hi: int) -> typing.Iterator[typing.Tuple[int, int, int, Mention]]:
+    """Entries with lo <= start < hi (in start order)"""
+    by_start = self.by_start
+    return itertools.islice(by_start, bisect_left(by_start, (lo,)), bisect_left(by_start, (hi,)))
+
+
+class MentionSpanIndex:
+  """
+  Mentions bucketed by (document, sentence index) and sorted by token span,
+  for overlap, containment, enclosing, and nearest-neighbor queries.
+
+  Overlap, containment, and enclosing queries are a binary search followed by a scan of the mentions starting near the query span
+  (within the length of the sentence's longest mention), so they don't scan every mention of the sentence.
+  Nearest-neighbor queries walk outward from the span in start and end order.
+  Mentions can be added at any time (ex. as rules fire). Results are sorted by (start, end) and then by insertion order.
+  Overlap and containment follow `Interval.overlaps` and `Interval.contains`.
+  """
+
+  def __init__(self, mentions: typing.Iterable[Mention] = ()):
+    # (id(document), sentence index) -> mentions
+    self._sentences: dict[typing.Tuple[int, int], _SentenceMentions] = dict()
+    self._size: int = 0
+    self.extend(mentions)
+
+  @staticmethod
+  def _span(span: Span) -> typing.Tuple[int, int]:
+    return (span.start, span.end) if isinstance(span, Interval) else span
+
+  def _bucket(self, document: Document, sentence_index: int) -> typing.Optional[_SentenceMentions]:
+    return self._sentences.get((id(document), sentence_index), None)
+
+  def add(self, m: Mention) -> None:
+    key = (id(m.document), m.sentence_index)
+    bucket = self._sentences.get(key, None)
+    if bucket is None:
+      bucket = _SentenceMentions()
+      self._sentences[key] = bucket
+    bucket.add(m.start, m.end, self._size, m)
+    self._size += 1
+
+  def extend(self, mentions: typing.Iterable[Mention]) -> None:
+    for m in mentions:
+      self.add(m)
+
+  def __len__(self) -> int:
+    return self._size
+
+  def __iter__(self) -> typing.Iterator[Mention]:
+    """All mentions (grouped by sentence)"""
+    for bucket in self._sentences.values():
+      for _, _, _, m in bucket.by_start:
+        yield m
+
+  def mentions(self, document: Document, sentence_index: int) -> list[Mention]:
+    """The mentions of a sentence"""
+    bucket = self._bucket(document, sentence_index)
+    return [m for _, _, _, m in bucket.by_start] if bucket is not None else []
+
+  def overlapping(self, document: Document, sentence_index: int, span: Span) -> list[Mention]:
+    """Mentions in the sentence that overlap `span` (an `Interval` or `(start, end)`)"""
+    bucket = self._bucket(document, sentence_index)
+    if bucket is None:
+      return []
+    start, end = MentionSpanIndex._span(span)
+    # either the mention starts within the span, or the span starts within the mention (which is at most max_size tokens long)
+    return [
+      m for mstart, mend, _, m in bucket.starting_in(start - bucket.max_size, max(end, start + 1))
+      if (start <= mstart < end) or (mstart <= start < mend)
+    ]
+
+  def contained_in(self, document: Document, sentence_index: int, span: Span) -> list[Mention]:
+    """Mentions in the sentence that are contained by `span` (an `Interval` or `(start, end)`)"""
+    bucket = self._bucket(document, sentence_index)
+    if bucket is None:
+      return []
+    start, end = MentionSpanIndex._span(span)
+    return [m for _, mend, _, m in bucket.starting_in(start, end + 1) if mend <= end]
+
+  def enclosing(self, document: Document, sentence_index: int, span: Span) -> list[Mention]:
+    """Mentions in the sentence that contain `span` (an `Interval` or `(start, end)`)"""
+    bucket = self._bucket(document, sentence_index)
+    if bucket is None:
+      return []
+    start, end = MentionSpanIndex._span(span)
+    return [m for _, mend, _, m in bucket.starting_in(end - bucket.max_size, start + 1) if mend >= end]
+
+  def nearest(self, document: Document, sentence_index: int, span: Span, k: int = 1) -> list[typing.Tuple[int, Mention]]:
+    """
+    The (at most) `k` mentions in the sentence closest to (but not overlapping) `span` (an `Interval` or `(start, end)`),
+    as (distance in tokens, mention) pairs ordered by distance. Ties are broken in favor of preceding mentions.
+    """
+    bucket = self._bucket(document, sentence_index)
+    if bucket is None or k <= 0:
+      return []
+    start, end = MentionSpanIndex._span(span)
+    # preceding mentions (nearest first) ...
+    by_end = bucket.by_end
+    preceding = ((start - mend, m) for mend, _, _, m in itertools.islice(reversed(by_end), len(by_end) - bisect_left(by_end, (start + 1,)), None))
+    # ... and following mentions (nearest first)
+    by_start = bucket.by_start
+    following = ((mstart - end, m) for mstart, _, _, m in itertools.islice(by_start, bisect_left(by_start, (end,)), None))
+    nearest: list[typing.Tuple[int, Mention]] = []
+    left, right = next(preceding, None), next(following, None)
+    while len(nearest) < k and (left is not None or right is not None):
+      if right is None or (left is not None and left[0] <= right[0]):
+        nearest.append(left)
+        left = next(preceding, None)
+      else:
+        nearest.append(right)
+        right = next(following, None)
+    return nearest
@@ -0,0 +1,265 @@
+from __future__ import annotations
+from pydantic import BaseModel, Field
+import io
+import json
+import os
+import re
+import shutil
+import tempfile
+import typing
+
+__all__ = ["CompactMentionsIndex", "open_seekable_binary"]
+
+
+_WHITESPACE = re.compile(rb"[ \t\n\r]*")
+# the next string delimiter or bracket
+_STRUCTURE = re.compile(rb'["{}\[\]]')
+# a complete string (starting at its opening quote)
+_STRING_PATTERN = rb'"[^"\\]*+(?:\\.[^"\\]*+)*+"'
+_STRING = re.compile(_STRING_PATTERN, re.DOTALL)
+# a number, true, false, or null
+_SCALAR = re.compile(rb"[^,:\]}\s]*")
+# the "document" member of a mention (a mention's arguments, trigger, etc. always belong to the same document)
+_DOCUMENT = re.compile(rb'(?<!\\)"document"[ \t\n\r]*:[ \t\n\r]*(' + _STRING_PATTERN + rb")", re.DOTALL)
+
+
+def _container_pattern(max_depth: int) -> re.Pattern:
+  """Matches a complete array or object nested at most `max_depth` levels deep (brackets within strings are ignored)"""
+  inner = rb"(?:[^\"\[\]{}]++|" + _STRING_PATTERN + rb")*+"
+  for _ in range(max_depth - 1):
+    inner = rb"(?:[^\"\[\]{}]++|" + _STRING_PATTERN + rb"|[\[{]" + inner + rb"[\]}])*+"
+  return re.compile(rb"[\[{]" + inner + rb"[\]}]", re.DOTALL)
+
+
+_CONTAINER = _container_pattern(32)
+
+
+class _JsonStreamScanner:
+  """
+  Walks the structure of a JSON file in binary mode, tracking the byte offset of each value.
+
+  Values are located by scanning their bytes for brackets and string delimiters, so values that are skipped (see `_JsonStreamScanner.skip`)
+  are never decoded. Values that are needed (see `_JsonStreamScanner.value`) are decoded using the standard library's (C) decoder.
+  """
+
+  def __init__(self, fp: typing.BinaryIO, chunk_size: int = 1 << 20):
+    self.fp = fp
+    self.chunk_size = chunk_size
+    self._buf: bytes = b""
+    self._pos: int = 0
+    # byte offset of self._buf[0]
+    self._base: int = fp.tell()
+    self._eof: bool = False
+
+  @property
+  def byte_pos(self) -> int:
+    """The byte offset of the next unread byte"""
+    return self._base + self._pos
+
+  def _fill(self, size: typing.Optional[int] = None) -> int:
+    """
+    Reads more data into the buffer (discarding everything before the current position).
+    Returns the number of bytes discarded (i.e., how far positions in the buffer have shifted).
+    """
+    shift = self._pos
+    chunk = b"" if self._eof else self.fp.read(size or self.chunk_size)
+    if not chunk:
+      self._eof = True
+    self._buf = self._buf[shift:] + chunk
+    self._base += shift
+    self._pos = 0
+    return shift
+
+  def _skip_whitespace(self) -> None:
+    while True:
+      self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+      if self._pos < len(self._buf) or self._eof:
+        return
+      self._fill()
+
+  def peek(self) -> bytes:
+    """Returns the next non-whitespace byte (or an empty string at the end of the file)"""
+    self._skip_whitespace()
+    return self._buf[self._pos:self._pos + 1]
+
+  def expect(self, char: bytes) -> None:
+    found = self.peek()
+    if found != char:
+      raise ValueError(f"Expected {char!r} at byte {self.byte_pos}, but found {found!r}")
+    self._pos += 1
+
+  def next_member(self, closing: bytes) -> bool:
+    """
+    Consumes the separator before the next member of an array/object.
+    Returns False (and consumes `closing`) when there are no more members.
+    """
+    char = self.peek()
+    if char == closing:
+      self.expect(closing)
+      return False
+    if char == b",":
+      self.expect(b",")
+    return True
+
+  def _grow(self) -> int:
+    # grow the read size so that huge values are rescanned a bounded number of times
+    if self._eof:
+      raise ValueError(f"Unexpected end of JSON at byte {self._base + len(self._buf)}")
+    return self._fill(max(self.chunk_size, len(self._buf) - self._pos))
+
+  def skip(self) -> typing.Tuple[int, int]:
+    """Skips the next value without decoding it. Returns its starting byte offset and length (in bytes)."""
+    self._skip_whitespace()
+    # arrays and objects are matched in one go (reading more of the file as needed) ...
+    if self._buf[self._pos:self._pos + 1] in (b"{", b"["):
+      while True:
+        match = _CONTAINER.match(self._buf, self._pos)
+        if match is not None:
+          start = self.byte_pos
+          nbytes = match.end() - self._pos
+          self._pos = match.end()
+          return start, nbytes
+        if self._eof:
+          break
+        self._grow()
+    # ... unless they're too deeply nested, in which case they're scanned one string or bracket at a time
+    pos = self._pos
+    depth = 0
+    while True:
+      buf = self._buf
+      if depth == 0 and buf[pos:pos + 1] not in (b'"', b"{", b"["):
+        end = _SCALAR.match(buf, pos).end()
+        if end < len(buf) or self._eof:
+          break
+      else:
+        match = _STRUCTURE.search(buf, pos) if depth > 0 else _STRUCTURE.match(buf, pos)
+        if match is not None:
+          char = match.group()
+          if char == b'"':
+            string = _STRING.match(buf, match.start())
+            if string is not None:
+              pos = string.end()
+              if depth == 0:
+                end = pos
+                break
+              continue
+            # the string continues in the next chunk
+            pos = match.start()
+          else:
+            depth += 1 if char in (b"{", b"[") else -1
+            pos = match.end()
+            if depth == 0:
+              end = pos
+              break
+            continue
+        elif depth > 0:
+          # nothing but scalars until the end of the buffer
+          pos = len(buf)
+      pos -= self._grow()
+    start = self.byte_pos
+    self._pos = end
+    return start, end - (start - self._base)
+
+  def document_id(self, nbytes: int) -> str:
+    """Decodes the "document" member of the mention that was just skipped (i.e., the last `nbytes` bytes)"""
+    match = _DOCUMENT.search(self._buf, self._pos - nbytes, self._pos)
+    if match is None:
+      raise KeyError(f"Mention at byte {self.byte_pos - nbytes} has no document")
+    return json.decoder.scanstring(match.group(1).decode("utf-8"), 1)[0]
+
+  def value(self) -> typing.Tuple[typing.Any, int, int]:
+    """Decodes the next value. Returns the value along with its starting byte offset and length (in bytes)."""
+    start, nbytes = self.skip()
+    return json.loads(self._buf[self._pos - nbytes:self._pos]), start, nbytes
+
+
+class CompactMentionsIndex(BaseModel):
+  """
+  Byte-level index of a compact mentions JSON file (`{"documents": {...}, "mentions": [...]}`).
+
+  Records the location of each document and the locations of the mentions for each document,
+  so that documents (and their mentions) can later be loaded one at a time.
+  """
+  documents: dict[str, typing.Tuple[int, int]] = Field(default_factory=dict, description="doc id -> (byte offset, length) of each document (in file order)")
+  mentions: dict[str, list[typing.Tuple[int, int]]] = Field(default_factory=dict, description="doc id -> [(byte offset, length), ...] of each of the document's mentions")
+
+  @staticmethod
+  def build(fp: typing.BinaryIO, chunk_size: int = 1 << 20) -> CompactMentionsIndex:
+    """Scans `fp` (from its current position) and records the location of each document and mention"""
+    index = CompactMentionsIndex()
+    scanner = _JsonStreamScanner(fp, chunk_size=chunk_size)
+    scanner.expect(b"{")
+    while scanner.next_member(b"}"):
+      key, _, _ = scanner.value()
+      scanner.expect(b":")
+      if key == "documents":
+        scanner.expect(b"{")
+        while scanner.next_member(b"}"):
+          doc_id, _, _ = scanner.value()
+          scanner.expect(b":")
+          # documents are located without being decoded
+          index.documents[doc_id] = scanner.skip()
+      elif key == "mentions":
+        scanner.expect(b"[")
+        while scanner.next_member(b"]"):
+          # only the mention's document ID is decoded
+          start, nbytes = scanner.skip()
+          doc_id = scanner.document_id(nbytes)
+          index.mentions.setdefault(doc_id, []).append((start, nbytes))
+      else:
+        # skip unrecognized sections
+        scanner.skip()
+    missing = set(index.mentions.keys()) - set(index.documents.keys())
+    if len(missing) > 0:
+      raise KeyError(f"Mentions refer to documents not found in the compact JSON: {sorted(missing)}")
+    return index
+
+  @staticmethod
+  def load_json(fp: typing.BinaryIO, span: typing.Tuple[int, int]) -> typing.Any:
+    start, nbytes = span
+    fp.seek(start)
+    return json.loads(fp.read(nbytes))
+
+  def iter_json(self, fp: typing.BinaryIO) -> typing.Iterator[typing.Tuple[str, dict[str, typing.Any], list[dict[str, typing.Any]]]]:
+    """Yields (doc id, doc json, list of mention json) for each document (in file order)"""
+    for doc_id, span in self.documents.items():
+      doc_json = CompactMentionsIndex.load_json(fp, span)
+      mentions_json = [CompactMentionsIndex.load_json(fp, mspan) for mspan in self.mentions.get(doc_id, [])]
+      yield doc_id, doc_json, mentions_json
+
+
+class open_seekable_binary:
+  """
+  Context manager providing a seekable binary file for a path or file object.
+  Text streams are read through their underlying buffer and non-seekable streams are first spooled to a temporary file.
+  """
+
+  def __init__(self, source: typing.Union[str, os.PathLike, typing.IO]):
+    self.source = source
+    self._owned: typing.Optional[typing.BinaryIO] = None
+
+  def __enter__(self) -> typing.BinaryIO:
+    source = self.source
+    if isinstance(source, (str, os.PathLike)):
+      self._owned = open(source, "rb")
+      return self._owned
+    if isinstance(source, io.TextIOBase):
+      # the byte position of a partially-read text stream is opaque
+      if hasattr(source, "buffer") and source.seekable() and source.tell() == 0:
+        source.buffer.seek(0)
+        return source.buffer
+      self._owned = tempfile.TemporaryFile()
+      for chunk in iter(lambda: source.read(1 << 20), ""):
+        self._owned.write(chunk.encode("utf-8"))
+      self._owned.seek(0)
+      return self._owned
+    if source.seekable():
+      return source
+    self._owned = tempfile.TemporaryFile()
+    shutil.copyfileobj(source, self._owned)
+    self._owned.seek(0)
+    return self._owned
+
+  def __exit__(self, *exc) -> None:
+    if self._owned is not None:
+      self._owned.close()
@@ -1,7 +1,134 @@
-from pydantic import BaseModel, Field
+from __future__ import annotations
+from pydantic import BaseModel, PrivateAttr, model_serializer
+from lum.clu.processors.directed_graph import Edge
+from lum.clu.processors.document import Document
+from lum.clu.processors.utils import Vocabulary
+from array import array
+import typing
 
 __all__ = ["SynPath"]
 
 
 class SynPath(BaseModel):
-  pass
\ No newline at end of file
+  """
+  A syntactic path (sequence of `Edge`s) through a sentence's graph (ex. from an event's trigger to one of its arguments).
+
+  Edges are stored as parallel arrays of sources, destinations, and relation IDs.
+  Relation IDs come from the sentence's relation vocabulary (see `Sentence.relation_vocabulary`), which is shared by all of the sentence's paths.
+  Paths loaded from JSON keep their raw edges until they are first accessed.
+  """
+  _sources: typing.Optional[array] = PrivateAttr(default=None)
+  _destinations: typing.Optional[array] = PrivateAttr(default=None)
+  _relations: typing.Optional[array] = PrivateAttr(default=None)
+  _vocabulary: typing.Optional[Vocabulary] = PrivateAttr(default=None)
+  # pending (i.e., not yet decoded) edges and the sentence they belong to
+  _raw: typing.Optional[list[dict[str, typing.Any]]] = PrivateAttr(default=None)
+  _document: typing.Optional[Document] = PrivateAttr(default=None)
+  _sentence_index: int = PrivateAttr(default=-1)
+
+  @staticmethod
+  def from_json(edges: list[dict[str, typing.Any]], document: Document, sentence_index: int) -> SynPath:
+    """
+    Wraps JSON edges (`[{"source": ..., "destination": ..., "relation": ...}, ...]`) from the sentence `document.sentences[sentence_index]`.
+    Edges are decoded on first access.
+    """
+    path = SynPath()
+    path._raw = edges
+    path._document = document
+    path._sentence_index = sentence_index
+    return path
+
+  @staticmethod
+  def from_edges(edges: typing.Iterable[Edge], vocabulary: typing.Optional[Vocabulary] = None) -> SynPath:
+    """Builds a path from `Edge`s. Relations are added to `vocabulary` (ex. `Sentence.relation_vocabulary`) as needed."""
+    path = SynPath()
+    path._set_edges(((e.source, e.destination, e.relation) for e in edges), vocabulary or Vocabulary())
+    return path
+
+  def _set_edges(self, triples: typing.Iterable[typing.Tuple[int, int, str]], vocabulary: Vocabulary) -> None:
+    sources, destinations, relations = array("i"), array("i"), array("i")
+    for source, destination, relation in triples:
+      sources.append(source)
+      destinations.append(destination)
+      relations.append(vocabulary.index(relation))
+    self._sources, self._destinations, self._relations = sources, destinations, relations
+    self._vocabulary = vocabulary
+
+  def _decode(self) -> None:
+    raw = self._raw
+    if raw is None:
+      if self._sources is None:
+        # an empty path
+        self._set_edges((), Vocabulary())
+      return
+    vocabulary = self._document.sentences[self._sentence_index].relation_vocabulary
+    self._set_edges(((e["source"], e["destination"], e["relation"]) for e in raw), vocabulary)
+    self._raw = None
+    self._document = None
+
+  @property
+  def is_decoded(self) -> bool:
+    """Whether or not the edges of this path have been decoded"""
+    return self._raw is None
+
+  @property
+  def sources(self) -> array:
+    """The source of each edge"""
+    self._decode()
+    return self._sources
+
+  @property
+  def destinations(self) -> array:
+    """The destination of each edge"""
+    self._decode()
+    return self._destinations
+
+  @property
+  def relation_ids(self) -> array:
+    """The ID of each edge's relation (see `SynPath.vocabulary`)"""
+    self._decode()
+    return self._relations
+
+  @property
+  def vocabulary(self) -> Vocabulary:
+    """The (shared) vocabulary of relations"""
+    self._decode()
+    return self._vocabulary
+
+  @property
+  def relations(self) -> list[str]:
+    """The relation of each edge"""
+    self._decode()
+    vocabulary = self._vocabulary
+    return [vocabulary[i] for i in self._relations]
+
+  def triples(self) -> typing.Iterator[typing.Tuple[int, int, str]]:
+    """Yields (source, destination, relation) for each edge"""
+    self._decode()
+    return zip(self._sources, self._destinations, self.relations)
+
+  @property
+  def edges(self) -> list[Edge]:
+    """The `Edge`s that comprise this path"""
+    return [Edge(source=source, destination=destination, relation=relation) for source, destination, relation in self.triples()]
+
+  @model_serializer
+  def to_json(self) -> list[dict[str, typing.Any]]:
+    """The edges of this path as JSON"""
+    if self._raw is not None:
+      return self._raw
+    return [{"source": source, "destination": destination, "relation": relation} for source, destination, relation in self.triples()]
+
+  def __len__(self) -> int:
+    return len(self._raw) if self._raw is not None else len(self._sources or ())
+
+  def __eq__(self, other: typing.Any) -> bool:
+    if isinstance(other, SynPath):
+      return list(self.triples()) == list(other.triples())
+    return NotImplemented
+
+  def __repr__(self) -> str:
+    return f"SynPath({self.to_json()!r})"
+
+  def __str__(self) -> str:
+    return self.__repr__()
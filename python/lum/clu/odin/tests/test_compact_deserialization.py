@@ -1,6 +1,9 @@
 from lum.clu.odin.serialization import OdinJsonSerializer
-from .utils import test_cases
+from lum.clu.processors.head_finder import HeadFinder
+from lum.clu.odin.mention import TextBoundMention, RelationMention, EventMention
+from .utils import test_cases, synthetic_compact_json
 import pytest
+import sys
 import typing
 
 def test_load_compact_json():
@@ -10,4 +13,83 @@ def test_load_compact_json():
     expected = len(compact_json.get("mentions", []))
     mentions = OdinJsonSerializer.from_compact_mentions_json(compact_json)
     #print(f"Expected to load {expected} mentions from {tc.name}. Found {len(mentions)}\n")
-    assert len(mentions) == expected, f"Expected to load {expected} mentions from {tc.name}, but {len(mentions)} found"
\ No newline at end of file
+    assert len(mentions) == expected, f"Expected to load {expected} mentions from {tc.name}, but {len(mentions)} found"
+
+def test_load_compact_json_arguments():
+  """Test case for OdinJsonSerializer.from_compact_mentions_json() with nested arguments and triggers"""
+  tc = [tc for tc in test_cases if tc.name == "overlapping-mentions"][0]
+  mentions = OdinJsonSerializer.from_compact_mentions_json(tc.json_dict)
+  events = [m for m in mentions if isinstance(m, EventMention)]
+  assert len(events) == 2
+  transport, question = events
+  assert transport.trigger.words == ["heading"]
+  assert question.trigger.words == ["How", "many"]
+  assert set(transport.arguments.keys()) == {"shipment", "origin", "destination"}
+  # the nested RelationMention is loaded along with its own arguments
+  shipment = transport.arguments["shipment"][0]
+  assert isinstance(shipment, RelationMention)
+  assert shipment.arguments["unit"][0].words == ["TEUs"]
+  # mentions shared across events are only constructed once
+  assert question.arguments["need"][0] is shipment
+  # arguments (in order), then the trigger
+  assert list(transport.dependencies()) == [arg for args in transport.arguments.values() for arg in args] + [transport.trigger]
+
+def test_load_deeply_nested_compact_json():
+  """OdinJsonSerializer.from_compact_mentions_json() should not be limited by the recursion limit"""
+  depth = sys.getrecursionlimit() * 2
+  compact_json = synthetic_compact_json(depth, nested=True)
+  mentions = OdinJsonSerializer.from_compact_mentions_json(compact_json)
+  assert len(mentions) == depth
+  # the outermost mention comes first
+  m = mentions[0]
+  for _ in range(depth - 1):
+    m = m.arguments["arg"][0]
+  assert isinstance(m, TextBoundMention)
+
+@pytest.mark.parametrize("nested", [False, True])
+def test_load_compact_json_scaling(monkeypatch, nested: bool):
+  """OdinJsonSerializer.from_compact_mentions_json() should do a constant amount of work per mention (i.e., load in linear time)"""
+  def load_work(n: int) -> typing.Tuple[int, int]:
+    counts = {"constructed": 0, "scanned": 0}
+    construct_mention, dependencies = OdinJsonSerializer._construct_mention, OdinJsonSerializer._dependencies
+    def counting_construct(*args, **kwargs):
+      counts["constructed"] += 1
+      return construct_mention(*args, **kwargs)
+    def counting_dependencies(mjson):
+      counts["scanned"] += 1
+      return dependencies(mjson)
+    with monkeypatch.context() as patch:
+      patch.setattr(OdinJsonSerializer, "_construct_mention", staticmethod(counting_construct))
+      patch.setattr(OdinJsonSerializer, "_dependencies", staticmethod(counting_dependencies))
+      assert len(OdinJsonSerializer.from_compact_mentions_json(synthetic_compact_json(n, nested=nested))) == n
+    return counts["constructed"], counts["scanned"]
+  for n in (2_000, 16_000):
+    constructed, scanned = load_work(n)
+    # each mention is constructed once, and its dependencies are scanned at most twice (when scheduled, and once they're available)
+    assert constructed == n
+    assert scanned <= 2 * n, f"Loading {n} mentions scanned dependencies {scanned} times"
+
+def test_load_compact_json_trusted():
+  """OdinJsonSerializer.from_compact_mentions_json(trusted=True) should produce the same mentions"""
+  for tc in test_cases:
+    expected = OdinJsonSerializer.from_compact_mentions_json(tc.json_dict)
+    mentions = OdinJsonSerializer.from_compact_mentions_json(tc.json_dict, trusted=True)
+    assert [type(m) for m in mentions] == [type(m) for m in expected]
+    assert mentions == expected
+
+def test_load_compact_json_lazy():
+  """OdinJsonSerializer.from_compact_mentions_json(lazy=True) should only build the sentences that are accessed"""
+  for tc in test_cases:
+    expected = OdinJsonSerializer.from_compact_mentions_json(tc.json_dict)
+    mentions = OdinJsonSerializer.from_compact_mentions_json(tc.json_dict, lazy=True)
+    docs = {id(m.document): m.document for m in mentions}
+    assert all(doc.materialization_stats.materialized == 0 for doc in docs.values())
+    assert [m.sentence_obj for m in mentions] == [m.sentence_obj for m in expected]
+    materialized = sum(doc.materialization_stats.materialized for doc in docs.values())
+    assert materialized == len({(id(m.document), m.sentence_index) for m in mentions})
+
+def test_mention_semantic_heads():
+  """HeadFinder.mention_heads() should match Mention.semantic_head()"""
+  for tc in test_cases:
+    mentions = OdinJsonSerializer.from_compact_mentions_json(tc.json_dict)
+    assert HeadFinder().mention_heads(mentions) == [m.semantic_head() for m in mentions]
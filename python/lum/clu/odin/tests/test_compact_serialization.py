@@ -0,0 +1,56 @@
+from lum.clu.odin.serialization import OdinJsonSerializer
+from lum.clu.odin.mention import Mention, EventMention, CrossSentenceMention
+from .utils import test_cases, synthetic_compact_json
+import io
+import json
+import pytest
+import typing
+
+
+def summarize(m: Mention) -> typing.Any:
+  """A comparable summary of a mention (and everything it depends on)"""
+  summary = [type(m).__name__, m.labels, m.start, m.end, m.sentence_index, m.words, m.keep, m.found_by, m.document.text]
+  if isinstance(m, EventMention):
+    summary.append(summarize(m.trigger))
+  if isinstance(m, CrossSentenceMention):
+    summary += [summarize(m.anchor), summarize(m.neighbor)]
+  summary.append({role: [summarize(a) for a in args] for role, args in (m.arguments or {}).items()})
+  return summary
+
+def load_all() -> list[Mention]:
+  mentions: list[Mention] = []
+  for tc in test_cases:
+    mentions += OdinJsonSerializer.from_compact_mentions_json(tc.json_dict)
+  return mentions
+
+def test_to_compact_mentions_json():
+  """Test case for OdinJsonSerializer.to_compact_mentions_json()"""
+  mentions = load_all()
+  compact_json = OdinJsonSerializer.to_compact_mentions_json(mentions)
+  # each document is stored once
+  assert len(compact_json["documents"]) == len(test_cases)
+  reloaded = OdinJsonSerializer.from_compact_mentions_json(json.loads(json.dumps(compact_json)))
+  assert [summarize(m) for m in reloaded] == [summarize(m) for m in mentions]
+
+def test_write_compact_mentions_json():
+  """Test case for OdinJsonSerializer.write_compact_mentions_json()"""
+  mentions = load_all()
+  # only the events are written at the top level, so their args & triggers are written in full
+  events = [m for m in mentions if isinstance(m, EventMention)]
+  fp = io.StringIO()
+  OdinJsonSerializer.write_compact_mentions_json(events, fp)
+  compact_json = json.loads(fp.getvalue())
+  assert len(compact_json["mentions"]) == len(events)
+  reloaded = OdinJsonSerializer.from_compact_mentions_json(compact_json)
+  assert [summarize(m) for m in reloaded] == [summarize(m) for m in events]
+  # ... and the output can be streamed back in
+  fp.seek(0)
+  streamed = [m for _, mns in OdinJsonSerializer.iter_compact_mentions_json(fp) for m in mns]
+  assert [summarize(m) for m in streamed] == [summarize(m) for m in events]
+
+def test_compact_mentions_json_documents():
+  """Each document should be written once, regardless of the number of mentions"""
+  mentions = OdinJsonSerializer.from_compact_mentions_json(synthetic_compact_json(100))
+  fp = io.StringIO()
+  OdinJsonSerializer.write_compact_mentions_json(mentions, fp)
+  assert fp.getvalue().count('"sentences"') == 1
@@ -0,0 +1,73 @@
+from lum.clu.odin.mention import EventMention, dedupe
+from lum.clu.processors.interval import Interval
+from lum.clu.odin.serialization import OdinJsonSerializer
+from .utils import test_cases, synthetic_compact_json
+import copy
+import pytest
+import sys
+
+
+def overlapping_mentions_json():
+  return [tc for tc in test_cases if tc.name == "overlapping-mentions"][0].json_dict
+
+def test_structural_hash():
+  """Equivalent mentions should share a structural hash, regardless of found_by, keep, and document objects"""
+  mentions = OdinJsonSerializer.from_compact_mentions_json(overlapping_mentions_json())
+  reloaded = OdinJsonSerializer.from_compact_mentions_json(overlapping_mentions_json())
+  for m, other in zip(mentions, reloaded):
+    assert m.document is not other.document
+    assert m.structural_hash == other.structural_hash == hash(m)
+    assert m.is_equivalent(other)
+  m = mentions[0]
+  assert m.is_equivalent(m.model_copy(update={"found_by": "another-rule", "keep": False}))
+  assert not m.is_equivalent(m.model_copy(update={"labels": ["Other"] + m.labels}))
+  assert not m.is_equivalent(m.model_copy(update={"sentence_index": m.sentence_index + 1}))
+
+def test_dedupe():
+  """Test case for dedupe"""
+  mentions = OdinJsonSerializer.from_compact_mentions_json(overlapping_mentions_json())
+  reloaded = OdinJsonSerializer.from_compact_mentions_json(overlapping_mentions_json())
+  assert dedupe(mentions + reloaded[::-1] + mentions) == mentions
+  assert dedupe([]) == []
+
+def test_structural_hash_deeply_nested():
+  """Mention.structural_hash should not be limited by the recursion limit"""
+  compact_json = synthetic_compact_json(sys.getrecursionlimit() * 2, nested=True)
+  mentions = OdinJsonSerializer.from_compact_mentions_json(compact_json)
+  assert len(dedupe(mentions)) == len(mentions)
+  assert mentions[0].is_equivalent(OdinJsonSerializer.from_compact_mentions_json(synthetic_compact_json(sys.getrecursionlimit() * 2, nested=True))[0])
+
+def test_shared_triggers():
+  """Identical triggers should be shared by the events that use them"""
+  compact_json = overlapping_mentions_json()
+  event_json = [mjson for mjson in compact_json["mentions"] if mjson["type"] == "EventMention"][0]
+  duplicate = copy.deepcopy(event_json)
+  duplicate["id"] = "E:duplicate"
+  duplicate["foundBy"] = "another-rule"
+  duplicate["trigger"]["id"] = "T:duplicate"
+  compact_json["mentions"].append(duplicate)
+  mentions = OdinJsonSerializer.from_compact_mentions_json(compact_json)
+  original, loaded_duplicate = [m for m in mentions if isinstance(m, EventMention) and m.token_interval == mentions[-1].token_interval][:2]
+  assert loaded_duplicate.found_by == "another-rule"
+  assert original.trigger is loaded_duplicate.trigger
+  assert original.is_equivalent(loaded_duplicate)
+  assert len(dedupe(mentions)) == len(mentions) - 1
+
+def test_hashed_fields_are_frozen():
+  """Fields a mention's hash depends on should not be reassigned once it has been hashed (ex. as a key of Mention.paths)"""
+  mentions = OdinJsonSerializer.from_compact_mentions_json(overlapping_mentions_json())
+  m = [m for m in mentions if m.paths][0]
+  key = next(iter(next(iter(m.paths.values()))))
+  with pytest.raises(AttributeError):
+    key.token_interval = Interval(0, 1)
+  # the trigger table keys of the loader are frozen as well
+  trigger = [m for m in mentions if isinstance(m, EventMention)][0].trigger
+  with pytest.raises(AttributeError):
+    trigger.labels = ["Other"]
+  # fields that aren't hashed can still be reassigned
+  key.found_by = "another-rule"
+  assert key in next(iter(m.paths.values()))
+  with pytest.raises(AttributeError):
+    key.document = None
+  copied = key.copy(maybe_sentence_index=key.sentence_index + 1)
+  assert copied.sentence_index == key.sentence_index + 1
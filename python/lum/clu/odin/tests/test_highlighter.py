@@ -0,0 +1,50 @@
+from lum.clu.odin.highlighter import OdinHighlighter
+from lum.clu.odin.mention import EventMention
+from lum.clu.odin.serialization import OdinJsonSerializer
+from .utils import test_cases
+import io
+import subprocess
+import sys
+
+
+def load_mentions():
+  tc = [tc for tc in test_cases if tc.name == "overlapping-mentions"][0]
+  return OdinJsonSerializer.from_compact_mentions_json(tc.json_dict)
+
+def test_termcolor_is_lazy():
+  """Importing the highlighter should not import termcolor"""
+  code = "import sys, lum.clu.odin.highlighter; assert 'termcolor' not in sys.modules"
+  subprocess.run([sys.executable, "-c", code], check=True)
+
+def test_highlight_mention():
+  """Test case for OdinHighlighter.highlight_mention"""
+  mentions = load_mentions()
+  event = [m for m in mentions if isinstance(m, EventMention)][0]
+  ansi = OdinHighlighter.highlight_mention(event)
+  trigger_prefix, reset = OdinHighlighter._ansi_codes("TRIGGER")
+  mention_prefix, _ = OdinHighlighter._ansi_codes("MENTION")
+  # the trigger is layered on top of the mention
+  assert f"{mention_prefix}{trigger_prefix}heading{reset}" in ansi
+  html = OdinHighlighter.highlight_mention(event, fmt=OdinHighlighter.HTML)
+  assert '<span class="mention trigger">heading</span>' in html
+  # tokens outside of the mention aren't styled
+  words = event.sentence_obj.words
+  if event.start > 0:
+    assert html.startswith(words[0] + " ")
+
+def test_write_highlighted_mentions():
+  """OdinHighlighter.write should match highlighting each mention separately"""
+  mentions = load_mentions()
+  for fmt in [OdinHighlighter.ANSI, OdinHighlighter.HTML]:
+    out = io.StringIO()
+    assert OdinHighlighter.write(mentions, out, fmt=fmt) == len(mentions)
+    lines = out.getvalue().splitlines()
+    rendered = [line for line in lines if not fmt == OdinHighlighter.HTML or line.startswith("<p>")]
+    assert len(rendered) == len(mentions)
+    for line, m in zip(rendered, mentions):
+      assert OdinHighlighter.highlight_mention(m, fmt=fmt) in line
+  try:
+    OdinHighlighter.write(mentions, io.StringIO(), fmt="pdf")
+    assert False, "Expected a ValueError"
+  except ValueError:
+    pass
@@ -0,0 +1,14 @@
+from lum.clu.odin.iob import iob_mentions
+from lum.clu.processors.tests.utils import load_test_docs
+
+
+def test_iob_mentions():
+  """Test case for iob_mentions()"""
+  doc = next(iter(load_test_docs(["example-1-part-0.json"])))
+  mentions = iob_mentions(doc, field="chunks")
+  assert len(mentions) == sum(len(s.chunk_spans) for s in doc.sentences)
+  for m in mentions:
+    assert m.document is doc
+    assert m.words == doc.sentences[m.sentence_index].words[m.start:m.end]
+    assert doc.sentences[m.sentence_index].chunks[m.start] == f"B-{m.label}"
+  assert all(m.label in doc.nes for m in iob_mentions(doc))
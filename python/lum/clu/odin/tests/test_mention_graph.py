@@ -0,0 +1,47 @@
+from lum.clu.odin.mention import EventMention
+from lum.clu.odin.mention_graph import MentionGraph
+from lum.clu.odin.serialization import OdinJsonSerializer
+from .utils import test_cases, synthetic_compact_json
+import sys
+
+
+def descendants(m):
+  found = dict()
+  for _, components in m._components():
+    for c in components:
+      found[id(c)] = c
+      for d in descendants(c):
+        found[id(d)] = d
+  return list(found.values())
+
+def test_mention_graph():
+  """MentionGraph queries should match a recursive traversal of the mentions"""
+  tc = [tc for tc in test_cases if tc.name == "overlapping-mentions"][0]
+  mentions = OdinJsonSerializer.from_compact_mentions_json(tc.json_dict)
+  graph = MentionGraph(mentions)
+  assert graph.mentions[:len(mentions)] == mentions
+  for m in graph.mentions:
+    expected = sorted(graph.id_of(d) for d in descendants(m))
+    assert [graph.id_of(d) for d in graph.descendants(m)] == expected
+    for d in graph.descendants(m):
+      assert any(a is m for a in graph.ancestors(d))
+  transport = [m for m in mentions if isinstance(m, EventMention)][0]
+  assert graph.children(transport, "trigger") == [("trigger", transport.trigger)]
+  assert ("trigger", transport) in [(r, p) for r, p in graph.referencing(transport.trigger) if p is transport]
+  order = list(graph.topological_order())
+  assert sorted(order) == list(range(len(graph)))
+  position = {i: k for k, i in enumerate(order)}
+  for parent, child, _ in graph.graph.triples():
+    assert position[parent] < position[child]
+  assert all(len(graph.referencing(r)) == 0 for r in graph.roots)
+
+def test_mention_graph_deeply_nested():
+  """MentionGraph should not be limited by the recursion limit"""
+  depth = sys.getrecursionlimit() * 2
+  mentions = OdinJsonSerializer.from_compact_mentions_json(synthetic_compact_json(depth, nested=True))
+  graph = MentionGraph(mentions)
+  assert len(graph) == depth
+  outermost = graph.roots[0]
+  assert len(graph.roots) == 1
+  assert len(graph.descendants(outermost)) == depth - 1
+  assert graph.id_of(outermost) == graph.topological_order()[0]
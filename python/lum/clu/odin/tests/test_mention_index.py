@@ -0,0 +1,57 @@
+from lum.clu.odin.mention import TextBoundMention
+from lum.clu.odin.mention_index import MentionIndex
+from lum.clu.processors.document import Document
+from lum.clu.processors.interval import Interval
+import random
+import re
+
+
+def make_document(doc_id: str) -> Document:
+  sentence = {"words": ["a", "b", "c"], "startOffsets": [0, 2, 4], "endOffsets": [1, 3, 5], "graphs": {}}
+  return Document(id=doc_id, text="a b c", sentences=[dict(sentence) for _ in range(3)])
+
+def test_mention_index():
+  """MentionIndex lookups should match a linear scan"""
+  rng = random.Random(3)
+  docs = [make_document("1"), make_document("2")]
+  chains = [["Person", "Entity"], ["Location", "Entity"], ["City", "Location", "Entity"], ["Transport", "Event"], ["Entity"]]
+  mentions = [
+    TextBoundMention(labels=rng.choice(chains), token_interval=Interval(0, 1), sentence_index=rng.randrange(3), document=rng.choice(docs))
+    for _ in range(500)
+  ]
+  index = MentionIndex(mentions[:400])
+  index.extend(mentions[400:])
+  assert len(index) == len(mentions)
+  assert index.hyponyms("Entity") == ["City", "Location", "Person"]
+  assert index.hyponyms("Location") == ["City"]
+  assert index.matching_labels("^(Loc|Cit)") == ["Location", "City"]
+  for label in ["Entity", "Location", "Event", "Missing"]:
+    for doc in [None] + docs:
+      for si in [None, 0, 2]:
+        for primary in [False, True]:
+          expected = [
+            m for m in mentions
+            if (label in m.labels[:1] if primary else label in m.labels)
+            and (doc is None or m.document is doc)
+            and (si is None or m.sentence_index == si)
+          ]
+          assert index.find(label=label, document=doc, sentence_index=si, primary=primary) == expected
+  pattern = re.compile("^(Per|Cit)")
+  assert index.find(pattern=pattern) == [m for m in mentions if m.matches(pattern)]
+  assert index.find(pattern="^Loc", label="City", document=docs[0]) == [m for m in mentions if m.labels[0] == "City" and m.document is docs[0]]
+  assert index.find() == mentions
+  # patterns are re-resolved when new labels are added
+  assert index.find(pattern="^Cit", primary=True) == [m for m in mentions if m.labels[0] == "City"]
+  extra = TextBoundMention(labels=["Citation"], token_interval=Interval(0, 1), sentence_index=0, document=docs[0])
+  index.add(extra)
+  assert index.find(pattern="^Cit", primary=True)[-1] is extra
+
+def test_sentence_index_without_document():
+  """Without a document, sentence_index should match that sentence of every document"""
+  docs = [make_document("1"), make_document("2")]
+  first = [TextBoundMention(labels=["Entity"], token_interval=Interval(0, 1), sentence_index=0, document=doc) for doc in docs]
+  second = TextBoundMention(labels=["Entity"], token_interval=Interval(0, 1), sentence_index=1, document=docs[0])
+  index = MentionIndex([first[0], second, first[1]])
+  assert index.find(sentence_index=0) == first
+  assert index.find(sentence_index=0, document=docs[1]) == [first[1]]
+  assert index.find(label="Entity", sentence_index=1) == [second]
@@ -0,0 +1,40 @@
+from lum.clu.odin.mention import TextBoundMention
+from lum.clu.processors.document import Document
+from lum.clu.processors.interval import Interval
+
+
+def make_document(text: bool = True) -> Document:
+  sentences = [
+    {"words": ["Odin", "has", "many", "names"], "tags": ["NNP", "VBZ", "JJ", "NNS"], "startOffsets": [0, 5, 9, 14], "endOffsets": [4, 8, 13, 19], "graphs": {}},
+    {"words": ["Wotan", "is", "one"], "tags": ["NNP", "VBZ", "CD"], "startOffsets": [20, 26, 29], "endOffsets": [25, 28, 32], "graphs": {}}
+  ]
+  return Document(id="doc", text="Odin has many names Wotan is one" if text else None, sentences=sentences)
+
+def test_cached_mention_views():
+  """Mention views should be cached until the fields they depend on change"""
+  doc = make_document()
+  m = TextBoundMention(labels=["Name"], token_interval=Interval(2, 4), sentence_index=0, document=doc)
+  assert m.words == ["many", "names"]
+  assert m.words is m.words
+  assert m.sentence_obj is doc.sentences[0]
+  assert (m.start_offset, m.end_offset, m.text) == (9, 19, "many names")
+  m.token_interval = Interval(0, 1)
+  assert (m.words, m.tags, m.text) == (["Odin"], ["NNP"], "Odin")
+  m.sentence_index = 1
+  assert (m.words, m.start_offset, m.text) == (["Wotan"], 20, "Wotan")
+  # cached views don't affect equality
+  assert m == TextBoundMention(labels=["Name"], token_interval=Interval(0, 1), sentence_index=1, document=doc)
+  # without the document text, the raw tokens are joined
+  m.document = make_document(text=False)
+  m.token_interval = Interval(0, 2)
+  assert m.text == "Wotan is"
+
+def test_mention_copy():
+  """Mention.copy should accept falsy replacements (ex. sentence 0)"""
+  doc = make_document()
+  m = TextBoundMention(labels=["Name"], token_interval=Interval(0, 1), sentence_index=1, document=doc)
+  assert m.words == ["Wotan"]
+  copied = m.copy(maybe_sentence_index=0, maybe_keep=False)
+  assert (copied.sentence_index, copied.keep) == (0, False)
+  assert copied.words == ["Odin"]
+  assert m.words == ["Wotan"]
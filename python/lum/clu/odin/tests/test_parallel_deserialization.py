@@ -0,0 +1,33 @@
+from lum.clu.odin.serialization import OdinJsonSerializer
+from .utils import test_cases, synthetic_compact_json
+import json
+import pytest
+
+
+@pytest.fixture
+def compact_files(tmp_path):
+  """Writes each test case (and a few synthetic exports) to its own file"""
+  exports = [tc.json_dict for tc in test_cases] + [synthetic_compact_json(n) for n in (5, 20)]
+  paths = []
+  for i, compact_json in enumerate(exports):
+    path = tmp_path / f"mentions-{i}.json"
+    path.write_text(json.dumps(compact_json))
+    paths.append(path)
+  return paths
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_load_compact_mentions_files(compact_files, workers: int):
+  """Test case for OdinJsonSerializer.load_compact_mentions_files()"""
+  expected = [OdinJsonSerializer.from_compact_mentions_json(json.loads(p.read_text())) for p in compact_files]
+  results = list(OdinJsonSerializer.load_compact_mentions_files(compact_files, workers=workers))
+  assert [path for path, _ in results] == compact_files
+  for (_, mentions), expected_mentions in zip(results, expected):
+    assert mentions == expected_mentions
+    # the document is shared by all of a file's mentions
+    assert len({id(m.document) for m in mentions}) == len({m.document.id for m in mentions})
+
+def test_load_compact_mentions_files_unordered(compact_files):
+  """OdinJsonSerializer.load_compact_mentions_files(ordered=False) should yield every file once"""
+  results = dict(OdinJsonSerializer.load_compact_mentions_files(compact_files, workers=2, ordered=False, trusted=True))
+  assert sorted(results.keys()) == sorted(compact_files)
+  assert len(results[compact_files[-1]]) == 20
@@ -0,0 +1,83 @@
+from lum.clu.odin.serialization import OdinJsonSerializer
+from lum.clu.odin.synpath import SynPath
+from lum.clu.processors.directed_graph import Edge
+from lum.clu.processors.utils import Vocabulary
+from .utils import test_cases
+import json
+
+
+def load_overlapping():
+  tc = [tc for tc in test_cases if tc.name == "overlapping-mentions"][0]
+  return tc.json_dict, OdinJsonSerializer.from_compact_mentions_json(tc.json_dict)
+
+def with_paths(mentions):
+  seen = dict()
+  stack = list(mentions)
+  while len(stack) > 0:
+    m = stack.pop()
+    if id(m) in seen:
+      continue
+    seen[id(m)] = m
+    stack.extend(arg for args in (m.arguments or {}).values() for arg in args)
+  return [m for m in seen.values() if m.paths]
+
+def test_load_paths():
+  """Paths should be loaded from compact JSON (and decoded on first access)"""
+  _, mentions = load_overlapping()
+  ms = with_paths(mentions)
+  assert len(ms) > 0
+  m = [m for m in ms if "shipment" in m.paths][0]
+  paths = m.paths["shipment"]
+  assert all(not p.is_decoded for p in paths.values())
+  # path keys are mentions (the argument or one of the mentions it contains)
+  assert any(key is arg for key in paths.keys() for arg in m.arguments["shipment"])
+  path = list(paths.values())[0]
+  assert path.relations == ["nsubj", "nmod_of"]
+  assert list(path.sources) == [7, 2]
+  assert list(path.destinations) == [2, 5]
+  assert path.edges[0] == Edge(source=7, destination=2, relation="nsubj")
+  # relation IDs come from the sentence's vocabulary
+  assert path.vocabulary is m.sentence_obj.relation_vocabulary
+  assert [path.vocabulary[i] for i in path.relation_ids] == path.relations
+  # ... which is shared by the sentence's graphs
+  sentence = m.sentence_obj
+  for graph in sentence.graphs.values():
+    compact = graph.compact
+    assert compact.vocabulary is path.vocabulary
+    assert [compact.vocabulary[r] for r in compact.relations] == [e.relation for e in graph.edges]
+
+def test_write_paths():
+  """Paths should survive a round trip through compact JSON"""
+  _, mentions = load_overlapping()
+  reloaded = OdinJsonSerializer.from_compact_mentions_json(json.loads(json.dumps(OdinJsonSerializer.to_compact_mentions_json(mentions))))
+  expected = {(m.label, m.start, m.end): {role: sorted(json.dumps(p.to_json()) for p in ps.values()) for role, ps in m.paths.items()} for m in with_paths(mentions)}
+  found = {(m.label, m.start, m.end): {role: sorted(json.dumps(p.to_json()) for p in ps.values()) for role, ps in m.paths.items()} for m in with_paths(reloaded)}
+  assert found == expected
+
+def test_synpath_from_edges():
+  """Test case for SynPath.from_edges()"""
+  vocabulary = Vocabulary(["nsubj", "dobj"])
+  path = SynPath.from_edges([Edge(source=1, destination=0, relation="dobj"), Edge(source=1, destination=3, relation="amod")], vocabulary)
+  assert list(path.relation_ids) == [1, 2]
+  assert len(vocabulary) == 3
+  assert len(path) == 2
+  assert path == SynPath.from_edges(path.edges)
+  assert path.model_dump() == [{"source": 1, "destination": 0, "relation": "dobj"}, {"source": 1, "destination": 3, "relation": "amod"}]
+
+def test_dump_paths():
+  """Mentions with paths should survive a round trip through model_dump()"""
+  _, mentions = load_overlapping()
+  m = [m for m in with_paths(mentions) if "shipment" in m.paths][0]
+  dumped = m.model_dump()
+  json.dumps(dumped)
+  # paths are keyed by the position of their mention (see Mention._path_keys)
+  positions = {id(key): i for i, key in enumerate(type(m)._path_keys(m.arguments))}
+  expected = {role: {str(positions[id(key)]): path.to_json() for key, path in ps.items() if id(key) in positions} for role, ps in m.paths.items()}
+  assert dumped["paths"] == expected
+  assert len(dumped["paths"]["shipment"]) > 0
+  reloaded = type(m).model_validate(dumped)
+  assert reloaded.model_dump() == dumped
+  keys = type(m)._path_keys(reloaded.arguments)
+  for role, role_paths in expected.items():
+    assert {str(keys.index(key)): path for key, path in reloaded.paths[role].items()} == {key: SynPath.from_edges(Edge(**e) for e in edges) for key, edges in role_paths.items()}
+    assert all(any(key is k for k in keys) for key in reloaded.paths[role])
@@ -0,0 +1,43 @@
+from lum.clu.odin.mention import TextBoundMention
+from lum.clu.odin.span_index import MentionSpanIndex
+from lum.clu.processors.document import Document
+from lum.clu.processors.interval import Interval
+import random
+
+
+def make_document(num_sentences: int = 2, size: int = 30) -> Document:
+  words = [f"w{i}" for i in range(size)]
+  offsets = [3 * i for i in range(size)]
+  sentence = {"words": words, "startOffsets": offsets, "endOffsets": [o + 2 for o in offsets], "graphs": {}}
+  return Document(id="doc", text=None, sentences=[dict(sentence) for _ in range(num_sentences)])
+
+def test_mention_span_index():
+  """MentionSpanIndex queries should match a linear scan"""
+  rng = random.Random(7)
+  doc = make_document()
+  mentions = []
+  for i in range(300):
+    start = rng.randrange(30)
+    end = min(30, start + rng.randrange(1, 6))
+    mentions.append(TextBoundMention(labels=["X"], token_interval=Interval(start, end), sentence_index=i % 2, document=doc, found_by=str(i)))
+  index = MentionSpanIndex(mentions[:200])
+  # mentions can be added as they're found
+  for m in mentions[200:]:
+    index.add(m)
+  assert len(index) == len(mentions)
+  key = lambda m: (m.start, m.end, int(m.found_by))
+  for _ in range(100):
+    si = rng.randrange(2)
+    start = rng.randrange(30)
+    span = Interval(start, min(30, start + rng.randrange(0, 8)))
+    candidates = sorted((m for m in mentions if m.sentence_index == si), key=key)
+    assert index.overlapping(doc, si, span) == [m for m in candidates if m.token_interval.overlaps(span)]
+    assert index.contained_in(doc, si, span) == [m for m in candidates if span.contains(m.token_interval)]
+    assert index.enclosing(doc, si, (span.start, span.end)) == [m for m in candidates if m.token_interval.contains(span)]
+    nearest = index.nearest(doc, si, span, k=3)
+    expected = sorted(
+      [(span.start - m.end, m) for m in candidates if m.end <= span.start] + [(m.start - span.end, m) for m in candidates if m.start >= span.end],
+      key=lambda pair: pair[0]
+    )
+    assert [d for d, _ in nearest] == [d for d, _ in expected[:3]]
+  assert index.overlapping(make_document(), 0, (0, 30)) == []
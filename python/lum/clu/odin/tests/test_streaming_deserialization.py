@@ -0,0 +1,92 @@
+from lum.clu.odin.serialization import OdinJsonSerializer
+from lum.clu.odin import streaming
+from lum.clu.processors.document import Document
+from .utils import test_cases, synthetic_compact_json
+import io
+import json
+import pytest
+import typing
+
+
+def combined_compact_json() -> dict[str, typing.Any]:
+  """Combines all test cases (and a document w/ non-ASCII text) into a single compact JSON export"""
+  combined: dict[str, typing.Any] = {"documents": dict(), "mentions": []}
+  for tc in test_cases:
+    compact_json = tc.json_dict
+    combined["documents"].update(compact_json["documents"])
+    combined["mentions"] += compact_json["mentions"]
+  synthetic = synthetic_compact_json(10)
+  synthetic["documents"]["1"]["text"] = "Óðinn has many names"
+  combined["documents"].update(synthetic["documents"])
+  combined["mentions"] += synthetic["mentions"]
+  return combined
+
+class NonSeekableStream(io.RawIOBase):
+  def __init__(self, data: bytes):
+    self._stream = io.BytesIO(data)
+  def readable(self) -> bool:
+    return True
+  def seekable(self) -> bool:
+    return False
+  def readinto(self, b) -> int:
+    data = self._stream.read(len(b))
+    b[:len(data)] = data
+    return len(data)
+
+@pytest.mark.parametrize("chunk_size", [7, 1 << 20])
+def test_iter_compact_mentions_json(chunk_size: int):
+  """Test case for OdinJsonSerializer.iter_compact_mentions_json()"""
+  compact_json = combined_compact_json()
+  data = json.dumps(compact_json, ensure_ascii=False, indent=2).encode("utf-8")
+  results = list(OdinJsonSerializer.iter_compact_mentions_json(io.BytesIO(data), chunk_size=chunk_size))
+  assert [doc.id for doc, _ in results] == list(compact_json["documents"].keys())
+  for doc, mentions in results:
+    assert isinstance(doc, Document)
+    expected = len([m for m in compact_json["mentions"] if m["document"] == doc.id])
+    assert len(mentions) == expected
+    assert all(m.document is doc for m in mentions)
+  docs = {doc.id: doc for doc, _ in results}
+  assert docs["1"].text == "Óðinn has many names"
+
+def test_iter_compact_mentions_json_streams():
+  """OdinJsonSerializer.iter_compact_mentions_json() should support text and non-seekable streams"""
+  compact_json = combined_compact_json()
+  data = json.dumps(compact_json, ensure_ascii=False)
+  expected = len(compact_json["mentions"])
+  for stream in [io.StringIO(data), io.BufferedReader(NonSeekableStream(data.encode("utf-8")))]:
+    results = list(OdinJsonSerializer.iter_compact_mentions_json(stream))
+    assert sum(len(mentions) for _, mentions in results) == expected
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 20])
+def test_compact_mentions_index(chunk_size: int, monkeypatch):
+  """CompactMentionsIndex.build() should locate each document and mention without decoding them"""
+  compact_json = combined_compact_json()
+  # strings w/ escapes, brackets, and multi-byte characters
+  compact_json["documents"]["1"]["text"] = 'Óðinn "has" {many} [names] \\ \n'
+  data = json.dumps(compact_json, ensure_ascii=False, indent=1).encode("utf-8")
+  decoded: list[int] = []
+  loads = json.loads
+  monkeypatch.setattr(streaming.json, "loads", lambda s: decoded.append(len(s)) or loads(s))
+  index = streaming.CompactMentionsIndex.build(io.BytesIO(data), chunk_size=chunk_size)
+  # only keys, document IDs, and each mention's "document" were decoded
+  assert max(decoded) < min(len(json.dumps(m)) for m in compact_json["mentions"])
+  monkeypatch.undo()
+  fp = io.BytesIO(data)
+  assert {doc_id: streaming.CompactMentionsIndex.load_json(fp, span) for doc_id, span in index.documents.items()} == compact_json["documents"]
+  found = [streaming.CompactMentionsIndex.load_json(fp, span) for spans in index.mentions.values() for span in spans]
+  assert sorted(map(json.dumps, found)) == sorted(map(json.dumps, compact_json["mentions"]))
+  assert all(m["document"] == doc_id for doc_id, spans in index.mentions.items() for m in (streaming.CompactMentionsIndex.load_json(fp, span) for span in spans))
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 20])
+def test_scanner_skips_deeply_nested_values(chunk_size: int):
+  """_JsonStreamScanner.skip() should handle values nested beyond what's matched in one go"""
+  deep = {"a": "x"}
+  for i in range(50):
+    deep = {"b": [deep, ']}\\"', i]}
+  data = json.dumps([deep, "}", 1.5, None]).encode("utf-8")
+  scanner = streaming._JsonStreamScanner(io.BytesIO(data), chunk_size=chunk_size)
+  scanner.expect(b"[")
+  spans = []
+  while scanner.next_member(b"]"):
+    spans.append(scanner.skip())
+  assert [json.loads(data[start:start + nbytes]) for start, nbytes in spans] == [deep, "}", 1.5, None]
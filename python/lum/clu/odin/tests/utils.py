@@ -32,3 +32,45 @@ test_cases = [
         )
     )
 ]
+
+def synthetic_compact_json(num_mentions: int, nested: bool = False) -> dict[str, typing.Any]:
+    """
+    Generates compact mentions json for a single-sentence document.
+    Every other mention is a `RelationMention` whose argument is the previous mention.
+    If `nested` is True, each mention depends on the mention before it (i.e., a single chain).
+    """
+    doc_id = "1"
+    document = {
+      "text": "Odin has many names",
+      "sentences": [{
+        "words": ["Odin", "has", "many", "names"],
+        "startOffsets": [0, 5, 9, 14],
+        "endOffsets": [4, 8, 13, 19],
+        "graphs": {"universal-basic": {"edges": [{"source": 1, "destination": 0, "relation": "nsubj"}], "roots": [1]}}
+      }]
+    }
+    mentions = []
+    for i in range(num_mentions):
+      mjson = {
+        "type": "TextBoundMention",
+        "id": f"T:{i}",
+        "labels": ["Name", "Entity"],
+        "tokenInterval": {"start": 0, "end": 1},
+        "characterStartOffset": 0,
+        "characterEndOffset": 4,
+        "sentence": 0,
+        "document": doc_id,
+        "keep": True,
+        "foundBy": "synthetic"
+      }
+      if i > 0 and (nested or i % 2 == 1):
+        mjson.update({
+          "type": "RelationMention",
+          "id": f"R:{i}",
+          "arguments": {"arg": [{"id": mentions[-1]["id"]}]}
+        })
+      mentions.append(mjson)
+    if nested:
+      # force the loader to start from the outermost mention
+      mentions.reverse()
+    return {"documents": {doc_id: document}, "mentions": mentions}
@@ -0,0 +1,231 @@
+from __future__ import annotations
+from lum.clu.processors.compact_graph import CompactGraph
+from lum.clu.processors.directed_graph import DirectedGraph
+from lum.clu.processors.interning import EncodedColumn, Interner
+from lum.clu.processors.sentence import Sentence
+from lum.clu.processors.utils import Vocabulary, construct
+from array import array
+import struct
+import sys
+import typing
+
+__all__ = ["DocumentBinarySerializer"]
+
+
+class DocumentBinarySerializer:
+  """
+  Columnar binary format for a `lum.clu.processors.document.Document`.
+
+  Layout (little-endian; each section starts on an 8-byte boundary):
+
+  - header (see `DocumentBinarySerializer.HEADER`)
+  - string table: `int64` offsets (`num_strings + 1`) followed by the UTF-8 blob of all unique strings
+  - document text (UTF-8)
+  - sentences: `int32` rows of `SENTENCE_FIELDS`
+  - token columns (raw, words, tags, ...): one `int32` array of string IDs per column present in *any* sentence (-1 where missing)
+  - start offsets and end offsets: `int32` arrays
+  - graphs: `int32` rows of `GRAPH_FIELDS`
+  - edges: `int32` arrays of sources, destinations, and relation string IDs
+  - roots: `int32` array
+
+  Decoding copies each typed column out of the provided buffer (ex. an `mmap`) in bulk, so tokens are never parsed.
+  Each unique string is decoded once and shared by every token that uses it.
+  """
+
+  MAGIC: typing.ClassVar[bytes] = b"CLUD"
+  VERSION: typing.ClassVar[int] = 1
+  # magic, version, column mask, doc id (string ID or -1), text length in bytes (-1 if None), num. strings, string blob length in bytes, num. sentences, num. tokens, num. graphs, num. edges, num. roots
+  HEADER: typing.ClassVar[struct.Struct] = struct.Struct("<4sHHiqqqqqqqq")
+  # the token-level annotations (in order)
+  COLUMNS: typing.ClassVar[typing.Tuple[str, ...]] = ("raw", "words", "tags", "lemmas", "norms", "chunks", "entities")
+  # first token, num. tokens, column mask, first graph, num. graphs, text (string ID or -1)
+  SENTENCE_FIELDS: typing.ClassVar[int] = 6
+  # name (string ID), first edge, num. edges, first root, num. roots
+  GRAPH_FIELDS: typing.ClassVar[int] = 5
+  ALIGNMENT: typing.ClassVar[int] = 8
+
+  @staticmethod
+  def _pad(nbytes: int) -> int:
+    return -nbytes % DocumentBinarySerializer.ALIGNMENT
+
+  @staticmethod
+  def _array_bytes(arr: array) -> bytes:
+    if sys.byteorder != "little":
+      arr = array(arr.typecode, arr)
+      arr.byteswap()
+    return arr.tobytes()
+
+  @staticmethod
+  def to_bytes(doc: typing.Any) -> bytes:
+    """Encodes a `lum.clu.processors.document.Document`"""
+    strings: dict[str, int] = dict()
+    def sid(s: typing.Optional[str]) -> int:
+      if s is None:
+        return -1
+      i = strings.get(s, None)
+      if i is None:
+        i = len(strings)
+        strings[s] = i
+      return i
+    num_columns = len(DocumentBinarySerializer.COLUMNS)
+    sentence_rows = array("i")
+    columns = [array("i") for _ in range(num_columns)]
+    start_offsets = array("i")
+    end_offsets = array("i")
+    graph_rows = array("i")
+    sources, destinations, relations = array("i"), array("i"), array("i")
+    roots = array("i")
+    doc_mask = 0
+    num_tokens = 0
+    num_graphs = 0
+    for s in doc.sentences:
+      size = len(s.words)
+      mask = 0
+      for i, name in enumerate(DocumentBinarySerializer.COLUMNS):
+        values = getattr(s, name)
+        if values is None:
+          columns[i].extend([-1] * size)
+        else:
+          mask |= 1 << i
+          columns[i].extend(sid(v) for v in values)
+      doc_mask |= mask
+      start_offsets.extend(s.start_offsets)
+      end_offsets.extend(s.end_offsets)
+      sentence_rows.extend([num_tokens, size, mask, num_graphs, len(s.graphs), sid(s.text)])
+      for name, g in s.graphs.items():
+        graph_rows.extend([sid(name), len(sources), len(g.edges), len(roots), len(g.roots)])
+        for e in g.edges:
+          sources.append(e.source)
+          destinations.append(e.destination)
+          relations.append(sid(e.relation))
+        roots.extend(g.roots)
+      num_tokens += size
+      num_graphs += len(s.graphs)
+    doc_id = sid(doc.id)
+    text = doc.text.encode("utf-8") if doc.text is not None else None
+    encoded = [s.encode("utf-8") for s in strings.keys()]
+    string_offsets = array("q", [0])
+    for s in encoded:
+      string_offsets.append(string_offsets[-1] + len(s))
+    blob = b"".join(encoded)
+
+    parts: list[bytes] = []
+    def add(data: bytes) -> None:
+      parts.append(data)
+      parts.append(b"\0" * DocumentBinarySerializer._pad(len(data)))
+    add(DocumentBinarySerializer.HEADER.pack(
+      DocumentBinarySerializer.MAGIC,
+      DocumentBinarySerializer.VERSION,
+      doc_mask,
+      doc_id,
+      len(text) if text is not None else -1,
+      len(strings),
+      len(blob),
+      len(doc.sentences),
+      num_tokens,
+      num_graphs,
+      len(sources),
+      len(roots)
+    ))
+    add(DocumentBinarySerializer._array_bytes(string_offsets))
+    add(blob)
+    add(text or b"")
+    add(DocumentBinarySerializer._array_bytes(sentence_rows))
+    for i, col in enumerate(columns):
+      if doc_mask & (1 << i):
+        add(DocumentBinarySerializer._array_bytes(col))
+    for arr in (start_offsets, end_offsets, graph_rows, sources, destinations, relations, roots):
+      add(DocumentBinarySerializer._array_bytes(arr))
+    return b"".join(parts)
+
+  @staticmethod
+  def from_bytes(buffer: typing.Any) -> dict[str, typing.Any]:
+    """
+    Decodes the fields (`id`, `text`, and `sentences`) of a `lum.clu.processors.document.Document`
+    from any object supporting the buffer protocol (`bytes`, `mmap.mmap`, `memoryview`, etc.).
+
+    Sentences are constructed without validation (see `lum.clu.processors.utils.Trusted`):
+    the low-cardinality annotations (see `Interner.ENCODED_COLUMNS`) stay array-backed as `EncodedColumn`s over the string table,
+    and graphs keep their edges as arrays until they're accessed (see `DirectedGraph.from_compact`).
+    """
+    view = memoryview(buffer).cast("B")
+    header = DocumentBinarySerializer.HEADER
+    (magic, version, doc_mask, doc_id, text_len, num_strings, blob_len,
+      num_sentences, num_tokens, num_graphs, num_edges, num_roots) = header.unpack_from(view, 0)
+    if magic != DocumentBinarySerializer.MAGIC:
+      raise ValueError("Not a binary-encoded Document")
+    if version != DocumentBinarySerializer.VERSION:
+      raise ValueError(f"Unsupported version {version} (expected {DocumentBinarySerializer.VERSION})")
+    pos = header.size + DocumentBinarySerializer._pad(header.size)
+
+    def take(nbytes: int) -> memoryview:
+      nonlocal pos
+      chunk = view[pos:pos + nbytes]
+      pos += nbytes + DocumentBinarySerializer._pad(nbytes)
+      return chunk
+
+    def ints(n: int, typecode: str = "i") -> array:
+      # a single bulk copy (so nothing refers to the buffer once decoded)
+      arr = array(typecode)
+      arr.frombytes(take(n * arr.itemsize))
+      if sys.byteorder != "little":
+        arr.byteswap()
+      return arr
+
+    string_offsets = ints(num_strings + 1, "q")
+    blob = take(blob_len)
+    strings: list[str] = [str(blob[string_offsets[i]:string_offsets[i + 1]], "utf-8") for i in range(num_strings)]
+    # string IDs are codes into the string table
+    vocabulary = Vocabulary(strings)
+    text = str(take(text_len), "utf-8") if text_len >= 0 else None
+    sentence_rows = ints(num_sentences * DocumentBinarySerializer.SENTENCE_FIELDS)
+    columns: list[typing.Optional[array]] = [
+      ints(num_tokens) if doc_mask & (1 << i) else None
+      for i in range(len(DocumentBinarySerializer.COLUMNS))
+    ]
+    start_offsets = ints(num_tokens)
+    end_offsets = ints(num_tokens)
+    graph_rows = ints(num_graphs * DocumentBinarySerializer.GRAPH_FIELDS)
+    sources = ints(num_edges)
+    destinations = ints(num_edges)
+    relations = ints(num_edges)
+    roots = ints(num_roots)
+
+    sentences: list[Sentence] = []
+    for si in range(num_sentences):
+      row = si * DocumentBinarySerializer.SENTENCE_FIELDS
+      first, size, mask, first_graph, num_sentence_graphs, text_id = sentence_rows[row:row + DocumentBinarySerializer.SENTENCE_FIELDS]
+      end = first + size
+      fields: dict[str, typing.Any] = dict()
+      for ci, (name, col) in enumerate(zip(DocumentBinarySerializer.COLUMNS, columns)):
+        if col is None or not mask & (1 << ci):
+          fields[name] = None
+        elif name in Interner.ENCODED_COLUMNS:
+          fields[name] = EncodedColumn(col[first:end], vocabulary)
+        else:
+          fields[name] = list(map(strings.__getitem__, col[first:end]))
+      graphs: dict[str, DirectedGraph] = dict()
+      for gi in range(first_graph, first_graph + num_sentence_graphs):
+        grow = gi * DocumentBinarySerializer.GRAPH_FIELDS
+        name_id, first_edge, num_graph_edges, first_root, num_graph_roots = graph_rows[grow:grow + DocumentBinarySerializer.GRAPH_FIELDS]
+        edge_end = first_edge + num_graph_edges
+        graphs[strings[name_id]] = DirectedGraph.from_compact(CompactGraph(
+          sources[first_edge:edge_end],
+          destinations[first_edge:edge_end],
+          relations[first_edge:edge_end],
+          vocabulary,
+          roots=roots[first_root:first_root + num_graph_roots]
+        ))
+      sentences.append(construct(
+        Sentence,
+        text=strings[text_id] if text_id >= 0 else None,
+        start_offsets=start_offsets[first:end].tolist(),
+        end_offsets=end_offsets[first:end].tolist(),
+        graphs=graphs,
+        **fields
+      ))
+    return {
+      "id": strings[doc_id] if doc_id >= 0 else None,
+      "text": text,
+      "sentences": sentences
+    }
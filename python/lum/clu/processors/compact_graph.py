@@ -0,0 +1,188 @@
+from __future__ import annotations
+from lum.clu.processors.utils import Vocabulary
+from array import array
+import typing
+
+__all__ = ["CompactGraph"]
+
+
+class CompactGraph:
+  """
+  Array-backed directed graph.
+
+  Edges are stored as parallel `int32` arrays of sources, destinations, and relation IDs (see `CompactGraph.vocabulary`).
+  Adjacency in each direction is stored in CSR form (an offsets array and an array of edge indices) and is only built when first needed.
+  """
+
+  __slots__ = ("num_nodes", "sources", "destinations", "relations", "roots", "vocabulary", "_outgoing", "_incoming")
+
+  def __init__(
+    self,
+    sources: array,
+    destinations: array,
+    relations: array,
+    vocabulary: Vocabulary,
+    roots: typing.Iterable[int] = (),
+    num_nodes: typing.Optional[int] = None
+  ):
+    self.sources = sources
+    self.destinations = destinations
+    self.relations = relations
+    self.vocabulary = vocabulary
+    self.roots = array("i", roots)
+    if num_nodes is None:
+      num_nodes = 1 + max(max(sources, default=-1), max(destinations, default=-1), max(self.roots, default=-1))
+    self.num_nodes: int = num_nodes
+    # (offsets, edge indices)
+    self._outgoing: typing.Optional[typing.Tuple[array, array]] = None
+    self._incoming: typing.Optional[typing.Tuple[array, array]] = None
+
+  @staticmethod
+  def from_edges(
+    edges: typing.Iterable[typing.Any],
+    roots: typing.Iterable[int] = (),
+    num_nodes: typing.Optional[int] = None,
+    vocabulary: typing.Optional[Vocabulary] = None
+  ) -> CompactGraph:
+    """
+    Builds a graph from `Edge`s (or anything with `source`, `destination`, and `relation` attributes).
+    Relations are added to `vocabulary` (ex. `Sentence.relation_vocabulary`) as needed.
+    """
+    vocabulary = vocabulary if vocabulary is not None else Vocabulary()
+    index = vocabulary.index
+    sources, destinations, relations = array("i"), array("i"), array("i")
+    for e in edges:
+      sources.append(e.source)
+      destinations.append(e.destination)
+      relations.append(index(e.relation))
+    return CompactGraph(sources, destinations, relations, vocabulary, roots=roots, num_nodes=num_nodes)
+
+  @staticmethod
+  def from_json(
+    edges: typing.Iterable[dict[str, typing.Any]],
+    roots: typing.Iterable[int] = (),
+    num_nodes: typing.Optional[int] = None,
+    vocabulary: typing.Optional[Vocabulary] = None
+  ) -> CompactGraph:
+    """Builds a graph from JSON edges (`{"source": ..., "destination": ..., "relation": ...}`) without creating an `Edge` for each (see `CompactGraph.from_edges`)"""
+    vocabulary = vocabulary if vocabulary is not None else Vocabulary()
+    index = vocabulary.index
+    sources, destinations, relations = array("i"), array("i"), array("i")
+    for e in edges:
+      sources.append(e["source"])
+      destinations.append(e["destination"])
+      relations.append(index(e["relation"]))
+    return CompactGraph(sources, destinations, relations, vocabulary, roots=roots, num_nodes=num_nodes)
+
+  def with_vocabulary(self, vocabulary: Vocabulary) -> CompactGraph:
+    """This graph with relation IDs from `vocabulary` (relations are added to it as needed). Returns this graph if it already uses `vocabulary`."""
+    if vocabulary is self.vocabulary:
+      return self
+    index, relations = vocabulary.index, self.vocabulary
+    return CompactGraph(
+      self.sources,
+      self.destinations,
+      array("i", [index(relations[r]) for r in self.relations]),
+      vocabulary,
+      roots=self.roots,
+      num_nodes=self.num_nodes
+    )
+
+  @staticmethod
+  def _csr(keys: array, num_nodes: int) -> typing.Tuple[array, array]:
+    # counting sort of edge indices by key (stable, so edges keep their original order)
+    offsets = array("i", bytes(4 * (num_nodes + 1)))
+    for k in keys:
+      offsets[k + 1] += 1
+    for i in range(num_nodes):
+      offsets[i + 1] += offsets[i]
+    fill = offsets[:-1]
+    edges = array("i", bytes(4 * len(keys)))
+    for ei, k in enumerate(keys):
+      edges[fill[k]] = ei
+      fill[k] += 1
+    return offsets, edges
+
+  @property
+  def num_edges(self) -> int:
+    return len(self.sources)
+
+  def _outgoing_csr(self) -> typing.Tuple[array, array]:
+    if self._outgoing is None:
+      self._outgoing = CompactGraph._csr(self.sources, self.num_nodes)
+    return self._outgoing
+
+  def _incoming_csr(self) -> typing.Tuple[array, array]:
+    if self._incoming is None:
+      self._incoming = CompactGraph._csr(self.destinations, self.num_nodes)
+    return self._incoming
+
+  def _relation_filter(self, relation: typing.Union[None, str, typing.Iterable[str]]) -> typing.Optional[typing.Set[int]]:
+    if relation is None:
+      return None
+    names = [relation] if isinstance(relation, str) else relation
+    return {self.vocabulary.get(r) for r in names}
+
+  def _neighbors(
+    self,
+    csr: typing.Tuple[array, array],
+    ends: array,
+    i: int,
+    relation: typing.Union[None, str, typing.Iterable[str]]
+  ) -> list[typing.Tuple[int, str]]:
+    if not 0 <= i < self.num_nodes:
+      return []
+    offsets, edges = csr
+    relations, vocabulary = self.relations, self.vocabulary
+    allowed = self._relation_filter(relation)
+    return [
+      (ends[ei], vocabulary[relations[ei]])
+      for ei in edges[offsets[i]:offsets[i + 1]]
+      if allowed is None or relations[ei] in allowed
+    ]
+
+  def outgoing(self, i: int, relation: typing.Union[None, str, typing.Iterable[str]] = None) -> list[typing.Tuple[int, str]]:
+    """(destination, relation) for each edge leaving node `i` (optionally restricted to one or more relations)"""
+    return self._neighbors(self._outgoing_csr(), self.destinations, i, relation)
+
+  def incoming(self, i: int, relation: typing.Union[None, str, typing.Iterable[str]] = None) -> list[typing.Tuple[int, str]]:
+    """(source, relation) for each edge entering node `i` (optionally restricted to one or more relations)"""
+    return self._neighbors(self._incoming_csr(), self.sources, i, relation)
+
+  def outgoing_edges(self, i: int) -> array:
+    """Indices of the edges leaving node `i`"""
+    offsets, edges = self._outgoing_csr()
+    return edges[offsets[i]:offsets[i + 1]] if 0 <= i < self.num_nodes else array("i")
+
+  def incoming_edges(self, i: int) -> array:
+    """Indices of the edges entering node `i`"""
+    offsets, edges = self._incoming_csr()
+    return edges[offsets[i]:offsets[i + 1]] if 0 <= i < self.num_nodes else array("i")
+
+  @property
+  def out_degrees(self) -> array:
+    """The number of edges leaving each node"""
+    offsets, _ = self._outgoing_csr()
+    return array("i", (offsets[i + 1] - offsets[i] for i in range(self.num_nodes)))
+
+  @property
+  def in_degrees(self) -> array:
+    """The number of edges entering each node"""
+    offsets, _ = self._incoming_csr()
+    return array("i", (offsets[i + 1] - offsets[i] for i in range(self.num_nodes)))
+
+  def edges_with_relation(self, relation: typing.Union[str, typing.Iterable[str]]) -> list[int]:
+    """Indices of the edges labeled with `relation` (or one of several relations)"""
+    allowed = self._relation_filter(relation)
+    return [ei for ei, r in enumerate(self.relations) if r in allowed]
+
+  def triples(self) -> typing.Iterator[typing.Tuple[int, int, str]]:
+    """Yields (source, destination, relation) for each edge"""
+    vocabulary = self.vocabulary
+    return ((s, d, vocabulary[r]) for s, d, r in zip(self.sources, self.destinations, self.relations))
+
+  def __len__(self) -> int:
+    return self.num_nodes
+
+  def __repr__(self) -> str:
+    return f"CompactGraph(num_nodes={self.num_nodes}, num_edges={self.num_edges})"
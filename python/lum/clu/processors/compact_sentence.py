@@ -0,0 +1,187 @@
+from __future__ import annotations
+from lum.clu.processors.directed_graph import DirectedGraph
+from lum.clu.processors.head_finder import HeadFinder
+from lum.clu.processors.sentence import Sentence
+from lum.clu.processors.utils import Vocabulary, construct
+from array import array
+import typing
+
+__all__ = ["CompactSentence"]
+
+
+class CompactSentence:
+  """
+  A read-only, `__slots__`-based alternative to `lum.clu.processors.sentence.Sentence`.
+
+  Provides the same read interface (`text`, `raw`, `words`, `start_offsets`, `end_offsets`, `tags`, `lemmas`, `norms`, `chunks`, `entities`, `graphs`, `length`, and `dependencies`), but:
+
+  - character offsets are stored as `int32` arrays (rather than lists of `int` objects)
+  - `raw` shares the `words` list when the two are identical
+  - there is no per-instance `__dict__` or validation state
+
+  Token-level columns are plain lists (or `lum.clu.processors.interning.EncodedColumn`s), so slicing (ex. `Mention.words`) costs the same as with a `Sentence`.
+  Converts losslessly to and from a `Sentence` (see `CompactSentence.from_sentence` and `CompactSentence.to_sentence`).
+  Implements `lum.clu.processors.sentence.SentenceView`, so Documents can hold CompactSentences (see `Document.from_trusted_json(..., compact=True)`).
+  """
+
+  # the optional token-level annotations (in order)
+  ANNOTATIONS: typing.ClassVar[typing.Tuple[str, ...]] = ("tags", "lemmas", "norms", "chunks", "entities")
+
+  __slots__ = ("text", "words", "_raw", "start_offsets", "end_offsets", "tags", "lemmas", "norms", "chunks", "entities", "graphs", "_relation_vocabulary", "_equivalence_digest")
+
+  def __init__(
+    self,
+    words: typing.Sequence[str],
+    start_offsets: typing.Iterable[int],
+    end_offsets: typing.Iterable[int],
+    raw: typing.Optional[typing.Sequence[str]] = None,
+    text: typing.Optional[str] = None,
+    tags: typing.Optional[typing.Sequence[str]] = None,
+    lemmas: typing.Optional[typing.Sequence[str]] = None,
+    norms: typing.Optional[typing.Sequence[str]] = None,
+    chunks: typing.Optional[typing.Sequence[str]] = None,
+    entities: typing.Optional[typing.Sequence[str]] = None,
+    graphs: typing.Optional[dict[str, DirectedGraph]] = None
+  ):
+    self.text = text
+    self.words = words
+    # None if raw is the same as words
+    self._raw = raw if raw is not None and raw != words else None
+    self.start_offsets = array("i", start_offsets)
+    self.end_offsets = array("i", end_offsets)
+    if not len(words) == len(self.start_offsets) == len(self.end_offsets):
+      raise ValueError(f"Expected {len(words)} start and end offsets, but found {len(self.start_offsets)} and {len(self.end_offsets)}")
+    self.tags = tags
+    self.lemmas = lemmas
+    self.norms = norms
+    self.chunks = chunks
+    self.entities = entities
+    self.graphs: dict[str, DirectedGraph] = graphs if graphs is not None else dict()
+    # computed on first use
+    self._relation_vocabulary: typing.Optional[Vocabulary] = None
+    self._equivalence_digest: typing.Optional[bytes] = None
+
+  @staticmethod
+  def from_sentence(sentence: Sentence) -> CompactSentence:
+    """Builds a `CompactSentence` from a `Sentence` (token-level lists and graphs are shared, not copied)"""
+    return CompactSentence(
+      words=sentence.words,
+      start_offsets=sentence.start_offsets,
+      end_offsets=sentence.end_offsets,
+      raw=sentence.raw,
+      text=sentence.text,
+      tags=sentence.tags,
+      lemmas=sentence.lemmas,
+      norms=sentence.norms,
+      chunks=sentence.chunks,
+      entities=sentence.entities,
+      graphs=sentence.graphs
+    )
+
+  @staticmethod
+  def from_json(data: dict[str, typing.Any]) -> CompactSentence:
+    """
+    Builds a `CompactSentence` directly from trusted (ex. CLU-produced) JSON, without first constructing a `Sentence`.
+    Accepts either field names or aliases (ex. `startOffsets` or `start_offsets`).
+    """
+    return CompactSentence(
+      words=data["words"],
+      start_offsets=data["startOffsets"] if "startOffsets" in data else data["start_offsets"],
+      end_offsets=data["endOffsets"] if "endOffsets" in data else data["end_offsets"],
+      raw=data.get("raw", None),
+      text=data.get("text", None),
+      graphs={name: DirectedGraph.from_trusted_json(g) for name, g in data.get("graphs", dict()).items()},
+      **{name: data.get(name, None) for name in CompactSentence.ANNOTATIONS}
+    )
+
+  def to_sentence(self) -> Sentence:
+    """The equivalent `Sentence`"""
+    return construct(
+      Sentence,
+      text=self.text,
+      raw=list(self.raw),
+      words=list(self.words),
+      start_offsets=self.start_offsets.tolist(),
+      end_offsets=self.end_offsets.tolist(),
+      graphs=dict(self.graphs),
+      **{name: getattr(self, name) for name in CompactSentence.ANNOTATIONS}
+    )
+
+  def with_offset(self, offset: int) -> CompactSentence:
+    """A copy of this sentence with its character offsets shifted by `offset` (ex. when merging Documents). Everything else is shared."""
+    copied = CompactSentence.__new__(CompactSentence)
+    for name in CompactSentence.__slots__:
+      setattr(copied, name, getattr(self, name))
+    shift = offset.__add__
+    copied.start_offsets = array("i", map(shift, self.start_offsets))
+    copied.end_offsets = array("i", map(shift, self.end_offsets))
+    # the digest covers the offsets
+    copied._equivalence_digest = None
+    return copied
+
+  @property
+  def raw(self) -> typing.Sequence[str]:
+    return self._raw if self._raw is not None else self.words
+
+  @property
+  def length(self) -> int:
+    return len(self.words)
+
+  @property
+  def dependencies(self) -> typing.Optional[DirectedGraph]:
+    """The preferred syntactic dependency graph of this sentence (see `DirectedGraph.DEPENDENCY_GRAPHS`)"""
+    for name in DirectedGraph.DEPENDENCY_GRAPHS:
+      if name in self.graphs:
+        return self.graphs[name]
+    return None
+
+  @property
+  def relation_vocabulary(self) -> Vocabulary:
+    """The relations used by this sentence's graphs (see `Sentence.relation_vocabulary`)"""
+    if self._relation_vocabulary is None:
+      self._relation_vocabulary = Sentence._shared_relation_vocabulary(self.graphs.values())
+    return self._relation_vocabulary
+
+  @property
+  def equivalence_digest(self) -> bytes:
+    """The same content hash as the equivalent `Sentence` (see `Sentence.equivalence_digest`)"""
+    if self._equivalence_digest is None:
+      self._equivalence_digest = Sentence._content_digest(self)
+    return self._equivalence_digest
+
+  def semantic_head(
+    self,
+    span: typing.Optional[typing.Any] = None,
+    graph_name: typing.Optional[str] = None,
+    valid_tags: typing.Optional[typing.Iterable[str]] = HeadFinder.DEFAULT_VALID_TAGS
+  ) -> typing.Optional[int]:
+    """The index of the semantic head of `span` (see `Sentence.semantic_head`)"""
+    return Sentence.semantic_head(self, span, graph_name=graph_name, valid_tags=valid_tags)
+
+  def __len__(self) -> int:
+    return len(self.words)
+
+  def __eq__(self, other: typing.Any) -> bool:
+    if isinstance(other, Sentence):
+      return self.to_sentence() == other
+    if not isinstance(other, CompactSentence):
+      return NotImplemented
+    return (
+      self.text == other.text
+      and self.words == other.words
+      and self.raw == other.raw
+      and self.start_offsets == other.start_offsets
+      and self.end_offsets == other.end_offsets
+      and all(getattr(self, name) == getattr(other, name) for name in CompactSentence.ANNOTATIONS)
+      and self.graphs == other.graphs
+    )
+
+  def __getstate__(self) -> typing.Tuple[typing.Any, ...]:
+    return tuple(getattr(self, slot) for slot in CompactSentence.__slots__)
+
+  def __setstate__(self, state: typing.Tuple[typing.Any, ...]) -> None:
+    for slot, value in zip(CompactSentence.__slots__, state):
+      setattr(self, slot, value)
+
+  def __repr__(self) -> str:
+    return f"CompactSentence(words={list(self.words)!r})"
@@ -1,4 +1,9 @@
-from pydantic import BaseModel, Field
+from __future__ import annotations
+from pydantic import BaseModel, Field, PrivateAttr, TypeAdapter, model_serializer
+from lum.clu.processors.compact_graph import CompactGraph
+from lum.clu.processors.paths import DependencyUtils, PathStep
+from lum.clu.processors.utils import CachedPropertiesMixin, Trusted, Vocabulary, construct
+import functools
 import typing
 
 __all__ = ["DirectedGraph"]
@@ -12,14 +17,134 @@ class Edge(BaseModel):
     destination: int = Field(description="0-based index of token serving as relation's destination")
     relation: str = Field(description="label for relation")
 
-class DirectedGraph(BaseModel):
+_EDGES: TypeAdapter[list[Edge]] = TypeAdapter(list[Edge])
+
+class DirectedGraph(CachedPropertiesMixin, BaseModel):
     
     STANFORD_BASIC_DEPENDENCIES: typing.ClassVar[str] = "stanford-basic"
     STANFORD_COLLAPSED_DEPENDENCIES: typing.ClassVar[str] =  "stanford-collapsed"
+    UNIVERSAL_BASIC_DEPENDENCIES: typing.ClassVar[str] = "universal-basic"
+    UNIVERSAL_ENHANCED_DEPENDENCIES: typing.ClassVar[str] = "universal-enhanced"
+    # syntactic dependency graphs in order of preference
+    DEPENDENCY_GRAPHS: typing.ClassVar[typing.Tuple[str, ...]] = (UNIVERSAL_ENHANCED_DEPENDENCIES, STANFORD_COLLAPSED_DEPENDENCIES, UNIVERSAL_BASIC_DEPENDENCIES, STANFORD_BASIC_DEPENDENCIES)
 
     roots: list[int] = Field(description="Roots of the directed graph")
     edges: list[Edge] = Field(description="the directed edges that comprise the graph")
 
+    # edges of a trusted graph (see `DirectedGraph.from_trusted_json` and `DirectedGraph.from_compact`) that have not yet been converted to `Edge`s
+    _raw_edges: typing.Union[None, list[dict[str, typing.Any]], CompactGraph] = PrivateAttr(default=None)
+    # relation vocabulary of `compact` (shared by the graphs of a sentence; see `DirectedGraph.share_relation_vocabulary`)
+    _vocabulary: typing.Optional[Vocabulary] = PrivateAttr(default=None)
+
+    @staticmethod
+    def from_trusted_json(data: dict[str, typing.Any]) -> DirectedGraph:
+        """
+        Constructs a DirectedGraph from trusted (ex. CLU-produced) JSON without validating the graph (see `lum.clu.processors.utils.Trusted`).
+        The JSON edges are kept as they are: `edges` are only built on first access, and `compact` is built directly from the JSON.
+        """
+        graph = construct(DirectedGraph, roots=data["roots"], edges=None)
+        del graph.__dict__["edges"]
+        graph.__pydantic_private__["_raw_edges"] = data["edges"]
+        if Trusted.sample():
+            Trusted.check(graph, lambda: DirectedGraph.model_validate(data))
+        return graph
+
+    @staticmethod
+    def from_compact(compact: CompactGraph) -> DirectedGraph:
+        """
+        Wraps a `CompactGraph` without validation (see `lum.clu.processors.utils.Trusted`).
+        `compact` is used as the graph's `DirectedGraph.compact`, and `edges` are only built on first access.
+        """
+        graph = construct(DirectedGraph, roots=compact.roots.tolist(), edges=None)
+        del graph.__dict__["edges"]
+        graph.__pydantic_private__["_raw_edges"] = compact
+        graph.__pydantic_private__["_vocabulary"] = compact.vocabulary
+        return graph
+
+    @staticmethod
+    def share_relation_vocabulary(graphs: typing.Iterable[DirectedGraph], vocabulary: typing.Optional[Vocabulary] = None) -> Vocabulary:
+        """
+        Makes `graphs` (ex. those of a sentence) use the same relation vocabulary for their `DirectedGraph.compact`, so that relation IDs agree across them
+        (see `Sentence.relation_vocabulary`). By default, the vocabulary of the first graph that has one is shared.
+        Returns the shared vocabulary.
+        """
+        graphs = list(graphs)
+        if vocabulary is None:
+            vocabulary = next((g._vocabulary for g in graphs if g._vocabulary is not None), None) or Vocabulary()
+        for g in graphs:
+            if g._vocabulary is not vocabulary:
+                g.__pydantic_private__["_vocabulary"] = vocabulary
+                # rebuilt (with the shared vocabulary) on next use
+                g.__dict__.pop("compact", None)
+        return vocabulary
+
+    def _build_edges(self) -> None:
+        raw = self.__pydantic_private__["_raw_edges"] if self.__pydantic_private__ else None
+        if raw is not None:
+            if "edges" not in self.__dict__:
+                if isinstance(raw, CompactGraph):
+                    raw = [{"source": source, "destination": destination, "relation": relation} for source, destination, relation in raw.triples()]
+                # pydantic-core builds them in bulk, which is faster than constructing each `Edge` in Python
+                self.__dict__["edges"] = _EDGES.validate_python(raw)
+            self.__pydantic_private__["_raw_edges"] = None
+
+    def __getattr__(self, name: str) -> typing.Any:
+        if name == "edges" and "edges" not in self.__dict__:
+            self._build_edges()
+            return self.__dict__["edges"]
+        return super().__getattr__(name)
+
+    def __eq__(self, other: typing.Any) -> bool:
+        # the relation vocabulary is an implementation detail of `compact`
+        if isinstance(other, DirectedGraph):
+            return self.roots == other.roots and self.edges == other.edges
+        return NotImplemented
+
+    def __repr_args__(self):
+        self._build_edges()
+        return super().__repr_args__()
+
+    @model_serializer(mode="wrap")
+    def _serialize(self, handler: typing.Callable[[DirectedGraph], dict[str, typing.Any]]) -> dict[str, typing.Any]:
+        self._build_edges()
+        return handler(self)
+
+    @functools.cached_property
+    def compact(self) -> CompactGraph:
+        """
+        Array-backed copy of this graph with cached adjacency (built on first use).
+        Relation IDs come from the graph's relation vocabulary (see `DirectedGraph.share_relation_vocabulary`).
+        NOTE: it is not rebuilt if `edges` are later modified.
+        """
+        vocabulary = self._vocabulary
+        if vocabulary is None:
+            vocabulary = Vocabulary()
+            self.__pydantic_private__["_vocabulary"] = vocabulary
+        if "edges" not in self.__dict__:
+            raw = self._raw_edges
+            return raw.with_vocabulary(vocabulary) if isinstance(raw, CompactGraph) else CompactGraph.from_json(raw, roots=self.roots, vocabulary=vocabulary)
+        return CompactGraph.from_edges(self.edges, roots=self.roots, vocabulary=vocabulary)
+
+    def outgoing(self, i: int, relation: typing.Union[None, str, typing.Iterable[str]] = None) -> list[typing.Tuple[int, str]]:
+        """(destination, relation) for each edge leaving token `i` (see `CompactGraph.outgoing`)"""
+        return self.compact.outgoing(i, relation)
+
+    def incoming(self, i: int, relation: typing.Union[None, str, typing.Iterable[str]] = None) -> list[typing.Tuple[int, str]]:
+        """(source, relation) for each edge entering token `i` (see `CompactGraph.incoming`)"""
+        return self.compact.incoming(i, relation)
+
+    def shortest_path(self, start: typing.Union[int, typing.Iterable[int]], end: typing.Union[int, typing.Iterable[int]], directed: bool = False) -> typing.Optional[list[PathStep]]:
+        """A shortest path between the provided start and end token(s) (see `DependencyUtils.shortest_path`)"""
+        return DependencyUtils.shortest_path(self.compact, start, end, directed=directed)
+
+    def shortest_paths(self, start: typing.Union[int, typing.Iterable[int]], end: typing.Union[int, typing.Iterable[int]], directed: bool = False, max_paths: typing.Optional[int] = None) -> list[list[PathStep]]:
+        """Every shortest path between the provided start and end token(s) (see `DependencyUtils.shortest_paths`)"""
+        return DependencyUtils.shortest_paths(self.compact, start, end, directed=directed, max_paths=max_paths)
+
+    def batch_shortest_paths(self, pairs: typing.Iterable[typing.Tuple[typing.Union[int, typing.Iterable[int]], typing.Union[int, typing.Iterable[int]]]], directed: bool = False) -> list[typing.Optional[list[PathStep]]]:
+        """A shortest path for each (start, end) pair (see `DependencyUtils.batch_shortest_paths`)"""
+        return DependencyUtils.batch_shortest_paths(self.compact, pairs, directed=directed)
+
     """
     Storage class for directed graphs.
 
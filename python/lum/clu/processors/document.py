@@ -1,11 +1,19 @@
 from __future__ import annotations
-from pydantic import BaseModel, Field, ConfigDict
-from lum.clu.processors.sentence import Sentence
-from lum.clu.processors.utils import Labels
+from pydantic import BaseModel, Field, ConfigDict, field_serializer
+from lum.clu.processors.sentence import Sentence, SentenceView
+from lum.clu.processors.compact_sentence import CompactSentence
+from lum.clu.processors.binary import DocumentBinarySerializer
+from lum.clu.processors.interning import Interner
+from lum.clu.processors.offsets import TokenOffsetIndex
+from lum.clu.processors.utils import CachedPropertiesMixin, ContentHasher, Labels, Trusted, construct
+import collections.abc
+import functools
+import mmap
+import os
 import typing
 
 
-class Document(BaseModel):
+class Document(CachedPropertiesMixin, BaseModel):
 
     """
     Storage class for annotated text. Based on [`org.clulab.processors.Document`](https://github.com/clulab/processors/blob/master/main/src/main/scala/org/clulab/processors/Document.scala)
@@ -20,36 +28,124 @@ class Document(BaseModel):
     sentences: list[Sentence] = Field(description="The sentences comprising the `Document`.")
 
     @staticmethod
-    def merge_documents(docs: list[Document]) -> Document:
-      """Merges two or more Documents into a single Document."""
-      text = ""
-      sentences = []
-      offset = 0
-      for doc in docs:
-          for old in doc.sentences:
-              s = Sentence(
-                  text = old.text,
-                  raw = old.raw,
-                  words = old.words,
-                  startOffsets = [i + offset for i in old.start_offsets],
-                  endOffsets = [i + offset for i in old.end_offsets],
-                  tags= old.tags,
-                  lemmas = old.lemmas,
-                  norms = old.norms,
-                  chunks = old.chunks,
-                  entities = old.entities,
-                  graphs = old.graphs
-              )
-              sentences.append(s)
-          if doc.text:
-              text += doc.text
-              offset += len(doc.text)
-
-      return Document(
-          id = docs[0].id,
-          text=text if len(text) > 0 else None,
+    def from_trusted_json(data: dict[str, typing.Any], interner: typing.Optional[Interner] = None, compact: bool = False) -> Document:
+      """
+      Constructs a Document from trusted (ex. CLU-produced) JSON without validation (see `lum.clu.processors.utils.Trusted`).
+      If an `interner` is provided, low-cardinality annotations are interned (see `lum.clu.processors.interning.Interner`).
+      If `compact` is True, the sentences are `lum.clu.processors.compact_sentence.CompactSentence`s rather than `Sentence`s
+      (both implement `lum.clu.processors.sentence.SentenceView`). They're converted to `Sentence`s when the Document is serialized.
+      """
+      if compact:
+          sentences: list[SentenceView] = [CompactSentence.from_json(s) for s in data["sentences"]]
+          if interner is not None:
+              for s in sentences:
+                  interner.intern_sentence(s)
+      else:
+          sentences = [Sentence.from_trusted_json(s, interner=interner) for s in data["sentences"]]
+      doc = construct(
+          Document,
+          id=data.get("id", None),
+          text=data.get("text", None),
           sentences=sentences
       )
+      if Trusted.sample():
+          Trusted.check(doc, lambda: Document.model_validate(data))
+      return doc
+
+    @field_serializer("sentences", mode="wrap")
+    def _serialize_sentences(self, sentences: typing.Sequence[SentenceView], handler):
+      # lazy sentences are materialized and compact sentences are serialized like the equivalent `Sentence`
+      return handler([s.to_sentence() if isinstance(s, CompactSentence) else s for s in sentences])
+
+    @staticmethod
+    def merge_documents(docs: list[Document]) -> Document:
+      """Merges two or more Documents into a single Document (see `DocumentBuilder`)."""
+      builder = DocumentBuilder(id=docs[0].id)
+      for doc in docs:
+          builder.append_document(doc)
+      return builder.build()
+
+    @functools.cached_property
+    def equivalence_digest(self) -> bytes:
+      """
+      Content hash of the text and sentences of this Document (see `Sentence.equivalence_digest`), computed once and cached.
+      The `id` is not included, so Documents with the same content are equivalent.
+      NOTE: the cached value is not updated if the Document is later modified.
+      """
+      hasher = ContentHasher("clu.Document")
+      hasher.update_str(self.text)
+      hasher.update_ints([len(self.sentences)])
+      for s in self.sentences:
+          hasher.update_bytes(s.equivalence_digest)
+      return hasher.digest()
+
+    @property
+    def equivalence_hash(self) -> int:
+      """`Document.equivalence_digest` as a signed 32-bit integer (used to key documents in compact mentions JSON)"""
+      return ContentHasher.to_int32(self.equivalence_digest)
+
+    @functools.cached_property
+    def offset_index(self) -> TokenOffsetIndex:
+      """
+      Index of the character offsets of every token (built on first use).
+      NOTE: the index is not rebuilt if `sentences` are later modified.
+      """
+      return TokenOffsetIndex(self.sentences)
+
+    def token_at(self, char_offset: int) -> typing.Optional[typing.Tuple[int, int]]:
+      """The `(sentence index, token index)` of the token containing the character at `char_offset` (or None)"""
+      return self.offset_index.token_at(char_offset)
+
+    def tokens_in_span(self, start: int, end: int) -> list[typing.Tuple[int, int]]:
+      """The `(sentence index, token index)` of each token overlapping the characters in [start, end)"""
+      return self.offset_index.tokens_in_span(start, end)
+
+    def tokens_at(self, char_offsets: typing.Iterable[int]) -> list[typing.Optional[typing.Tuple[int, int]]]:
+      """Batch version of `Document.token_at`"""
+      return self.offset_index.tokens_at(char_offsets)
+
+    def tokens_in_spans(self, spans: typing.Iterable[typing.Tuple[int, int]]) -> list[list[typing.Tuple[int, int]]]:
+      """Batch version of `Document.tokens_in_span`"""
+      return self.offset_index.tokens_in_spans(spans)
+
+    @property
+    def nes(self) -> dict[str, list[str]]:
+      """NE label -> a list of the corresponding text spans across all sentences (see `Sentence.nes`)"""
+      nes: dict[str, list[str]] = dict()
+      for s in self.sentences:
+          for label, texts in s.nes.items():
+              nes.setdefault(label, []).extend(texts)
+      return nes
+
+    def to_bytes(self) -> bytes:
+      """Encodes this Document using a compact columnar binary format (see `lum.clu.processors.binary.DocumentBinarySerializer`)"""
+      return DocumentBinarySerializer.to_bytes(self)
+
+    @staticmethod
+    def from_bytes(buffer: typing.Any) -> Document:
+      """
+      Decodes a Document produced by `Document.to_bytes` from any buffer (`bytes`, `mmap.mmap`, `memoryview`, etc.).
+      Like `Document.from_trusted_json`, the Document is constructed without validation.
+      """
+      doc = construct(Document, **DocumentBinarySerializer.from_bytes(buffer))
+      if Trusted.sample():
+          Trusted.check(doc, lambda: Document.model_validate(doc.model_dump()))
+      return doc
+
+    def to_file(self, path: typing.Union[str, os.PathLike]) -> None:
+      """Writes this Document to `path` using the binary format of `Document.to_bytes`"""
+      with open(path, "wb") as outfile:
+        outfile.write(self.to_bytes())
+
+    @staticmethod
+    def from_file(path: typing.Union[str, os.PathLike]) -> Document:
+      """
+      Memory-maps and decodes a Document written by `Document.to_file`.
+      Columns are copied out of the mapping as they're decoded (see `DocumentBinarySerializer.from_bytes`), so the file is closed before this returns.
+      """
+      with open(path, "rb") as infile:
+        with mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+          return Document.from_bytes(buffer)
 
     # size : int
     #     The number of `sentences`.
@@ -129,4 +225,151 @@ class Document(BaseModel):
     #             for s in self.sentences:
     #                 entities += s.nes[e]
     #             nes_dict[e] = entities
-    #         return nes_dict
\ No newline at end of file
+    #         return nes_dict
+
+
+class MaterializationStats(BaseModel):
+    """How many of a `LazyDocument`'s sentences have been built"""
+    materialized: int = Field(description="The number of `Sentence` objects built so far.")
+    total: int = Field(description="The number of sentences in the `Document`.")
+
+
+class LazySentences(collections.abc.Sequence):
+    """
+    A sequence of sentences that keeps the raw (JSON) payload of each sentence
+    and builds the corresponding `Sentence` the first time it is accessed.
+    """
+
+    def __init__(self, payloads: list[dict[str, typing.Any]], trusted: bool = False, interner: typing.Optional[Interner] = None):
+      self._payloads: list[typing.Optional[dict[str, typing.Any]]] = list(payloads)
+      self._sentences: list[typing.Optional[Sentence]] = [None] * len(self._payloads)
+      self.trusted = trusted
+      # applied to each sentence as it's built
+      self.interner = interner
+      self.num_materialized: int = 0
+
+    def _materialize(self, i: int) -> Sentence:
+      sentence = self._sentences[i]
+      if sentence is None:
+        payload = self._payloads[i]
+        sentence = Sentence.from_trusted_json(payload) if self.trusted else Sentence.model_validate(payload)
+        if self.interner is not None:
+          self.interner.intern_sentence(sentence)
+        self._sentences[i] = sentence
+        # the payload is no longer needed
+        self._payloads[i] = None
+        self.num_materialized += 1
+      return sentence
+
+    @typing.overload
+    def __getitem__(self, i: int) -> Sentence: ...
+    @typing.overload
+    def __getitem__(self, i: slice) -> list[Sentence]: ...
+    def __getitem__(self, i):
+      if isinstance(i, slice):
+        return [self._materialize(j) for j in range(*i.indices(len(self)))]
+      if i < 0:
+        i += len(self)
+      if not 0 <= i < len(self):
+        raise IndexError("sentence index out of range")
+      return self._materialize(i)
+
+    def __len__(self) -> int:
+      return len(self._sentences)
+
+    def __eq__(self, other: typing.Any) -> bool:
+      if isinstance(other, collections.abc.Sequence):
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+      return NotImplemented
+
+    def __repr__(self) -> str:
+      return f"LazySentences(materialized={self.num_materialized}, total={len(self)})"
+
+
+class LazyDocument(Document):
+    """
+    A `Document` whose sentences (and their graphs) are only built when first accessed
+    (ex. through `document.sentences[i]` or `lum.clu.odin.mention.Mention.sentence_obj`).
+    Serializing or iterating over all sentences materializes every sentence.
+    """
+
+    @staticmethod
+    def from_json(data: dict[str, typing.Any], trusted: bool = False, interner: typing.Optional[Interner] = None) -> LazyDocument:
+      """
+      Wraps the JSON of a `Document` without building any of its sentences.
+      If `trusted` is True, sentences are built without validation (see `Sentence.from_trusted_json`).
+      If an `interner` is provided, each sentence is interned as it's built (see `lum.clu.processors.interning.Interner`).
+      """
+      return construct(
+          LazyDocument,
+          id=data.get("id", None),
+          text=data.get("text", None),
+          sentences=LazySentences(data["sentences"], trusted=trusted, interner=interner)
+      )
+
+    @property
+    def materialization_stats(self) -> MaterializationStats:
+      """How many of this Document's sentences have been built"""
+      sentences = self.sentences
+      materialized = sentences.num_materialized if isinstance(sentences, LazySentences) else len(sentences)
+      return MaterializationStats(materialized=materialized, total=len(sentences))
+
+    def __eq__(self, other: typing.Any) -> bool:
+      # equal to any Document with the same content
+      if isinstance(other, Document):
+        return self.id == other.id and self.text == other.text and self.sentences == other.sentences
+      return NotImplemented
+
+
+class DocumentBuilder:
+    """
+    Incrementally assembles a `Document` from parts (text + sentences), such as the output of chunked annotation.
+
+    The text of each part is joined once (see `DocumentBuilder.build`) and the token offsets of each part's sentences are shifted as they're appended.
+    Every appended sentence is shallow-copied (not revalidated) with new offsets, so the parts are never aliased by (or modified through) the built Document.
+    Other annotations (ex. `words` and `graphs`) are shared with the parts.
+    `CompactSentence`s (see `Document.from_trusted_json(..., compact=True)`) stay compact (see `CompactSentence.with_offset`).
+    """
+
+    def __init__(self, id: typing.Optional[str] = None):
+      self.id = id
+      self._texts: list[str] = []
+      self._sentences: list[SentenceView] = []
+      # length of the text so far
+      self._offset: int = 0
+
+    def _shifted(self, s: SentenceView) -> SentenceView:
+      if isinstance(s, CompactSentence):
+        return s.with_offset(self._offset)
+      shift = self._offset.__add__
+      # these sentences have already been validated
+      return s.model_copy(update={
+          "start_offsets": list(map(shift, s.start_offsets)),
+          "end_offsets": list(map(shift, s.end_offsets))
+      })
+
+    def append(self, text: typing.Optional[str], sentences: typing.Iterable[SentenceView]) -> DocumentBuilder:
+      """Appends a part. The character offsets of `sentences` are assumed to be relative to the start of `text`."""
+      self._sentences.extend(map(self._shifted, sentences))
+      if text:
+          self._texts.append(text)
+          self._offset += len(text)
+      return self
+
+    def append_document(self, doc: Document) -> DocumentBuilder:
+      """Appends the text and sentences of `doc`"""
+      return self.append(doc.text, doc.sentences)
+
+    def __len__(self) -> int:
+      """The number of sentences appended so far"""
+      return len(self._sentences)
+
+    def build(self) -> Document:
+      """The merged Document"""
+      text = "".join(self._texts)
+      return construct(
+          Document,
+          id=self.id,
+          text=text if len(text) > 0 else None,
+          sentences=list(self._sentences)
+      )
@@ -0,0 +1,144 @@
+from __future__ import annotations
+from lum.clu.processors.directed_graph import DirectedGraph
+from lum.clu.processors.utils import Labels
+from array import array
+import zlib
+import typing
+
+__all__ = ["DependencyFeaturizer", "HashedFeatures"]
+
+
+TokenForm = typing.Literal["words", "lemmas", "tags", "index"]
+
+_MASK = (1 << 64) - 1
+# odd multipliers for combining the hashes of an edge's parts
+_SOURCE, _RELATION, _DESTINATION = 0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9
+# stands in for the relation of unlabeled dependencies
+_UNLABELED = zlib.crc32(b"\0unlabeled")
+
+
+class HashedFeatures:
+  """
+  A batch of sparse count vectors (one row per document) in CSR layout:
+  the features of row `i` are `indices[indptr[i]:indptr[i + 1]]` (sorted) and their counts are `counts[indptr[i]:indptr[i + 1]]`.
+  (ex. `scipy.sparse.csr_matrix((counts, indices, indptr), shape=(len(batch), n_features))`)
+  """
+
+  __slots__ = ("n_features", "indptr", "indices", "counts")
+
+  def __init__(self, n_features: int):
+    self.n_features = n_features
+    self.indptr: array = array("q", [0])
+    self.indices: array = array("q")
+    self.counts: array = array("q")
+
+  def _append(self, row: dict[int, int]) -> None:
+    for i in sorted(row):
+      self.indices.append(i)
+      self.counts.append(row[i])
+    self.indptr.append(len(self.indices))
+
+  def __len__(self) -> int:
+    return len(self.indptr) - 1
+
+  def row(self, i: int) -> dict[int, int]:
+    """feature -> count for row `i`"""
+    start, end = self.indptr[i], self.indptr[i + 1]
+    return dict(zip(self.indices[start:end], self.counts[start:end]))
+
+  def rows(self) -> typing.Iterator[dict[int, int]]:
+    for i in range(len(self)):
+      yield self.row(i)
+
+
+class DependencyFeaturizer:
+  """
+  Bag-of-dependencies features using the hashing trick.
+
+  Each dependency `source -[relation]-> destination` is represented by the token form (`words`, `lemmas`, `tags`, or `index`)
+  of its source and destination (and, for labeled features, its relation).
+  Each distinct token and relation is hashed once (`zlib.crc32`, so features are stable across processes);
+  edges are read from the graph's arrays (see `DirectedGraph.compact`) and hashed by combining those integers, so no per-edge strings or `Edge`s are built.
+  """
+
+  def __init__(
+    self,
+    form: TokenForm = "words",
+    n_features: int = 1 << 20,
+    labeled: bool = True,
+    unlabeled: bool = True,
+    graphs: typing.Sequence[str] = DirectedGraph.DEPENDENCY_GRAPHS
+  ):
+    if form not in ("words", "lemmas", "tags", "index"):
+      raise ValueError("form must be 'words', 'tags', 'lemmas', or 'index'")
+    self.form = form
+    self.n_features = n_features
+    self.labeled = labeled
+    self.unlabeled = unlabeled
+    # the first of these graphs found in a sentence is used
+    self.graphs = tuple(graphs)
+    self._hashes: dict[str, int] = dict()
+
+  def _hash(self, s: str) -> int:
+    h = self._hashes.get(s, None)
+    if h is None:
+      h = zlib.crc32(s.encode("utf-8"))
+      self._hashes[s] = h
+    return h
+
+  def _token_hashes(self, sentence: typing.Any) -> list[int]:
+    size = len(sentence.words)
+    if self.form == "index":
+      return [zlib.crc32(i.to_bytes(4, "little")) for i in range(size)]
+    tokens = getattr(sentence, self.form, None) or [Labels.UNKNOWN] * size
+    if self.form == "words":
+      tokens = [t.lower() for t in tokens]
+    hashes = self._hashes
+    return [hashes[t] if t in hashes else self._hash(t) for t in tokens]
+
+  def _graph(self, sentence: typing.Any) -> typing.Optional[DirectedGraph]:
+    for name in self.graphs:
+      g = sentence.graphs.get(name, None)
+      if g is not None:
+        return g
+    return None
+
+  def featurize(self, doc: typing.Any) -> dict[int, int]:
+    """feature -> count for one `Document`"""
+    counts: dict[int, int] = dict()
+    n = self.n_features
+    labeled, unlabeled = self.labeled, self.unlabeled
+    for sentence in doc.sentences:
+      g = self._graph(sentence)
+      if g is None:
+        continue
+      tokens = self._token_hashes(sentence)
+      # the graph's arrays (see `DirectedGraph.compact`), so no `Edge`s are built
+      compact = g.compact
+      relations = compact.relations
+      # one hash per relation ID
+      vocabulary = compact.vocabulary
+      relation_hashes = {r: self._hash(vocabulary[r].upper()) * _RELATION for r in set(relations)} if labeled else dict()
+      for source, destination, r in zip(compact.sources, compact.destinations, relations):
+        base = (tokens[source] * _SOURCE) ^ (tokens[destination] * _DESTINATION)
+        if labeled:
+          f = ((base ^ relation_hashes[r]) & _MASK) % n
+          counts[f] = counts.get(f, 0) + 1
+        if unlabeled:
+          f = ((base ^ (_UNLABELED * _RELATION)) & _MASK) % n
+          counts[f] = counts.get(f, 0) + 1
+    return counts
+
+  def transform(self, docs: typing.Iterable[typing.Any], batch_size: int = 1000) -> typing.Iterator[HashedFeatures]:
+    """
+    Streams over `docs`, yielding one `HashedFeatures` per `batch_size` documents.
+    Only the current batch is held in memory.
+    """
+    batch = HashedFeatures(self.n_features)
+    for doc in docs:
+      batch._append(self.featurize(doc))
+      if len(batch) >= batch_size:
+        yield batch
+        batch = HashedFeatures(self.n_features)
+    if len(batch) > 0:
+      yield batch
@@ -0,0 +1,133 @@
+from __future__ import annotations
+from lum.clu.processors.compact_graph import CompactGraph
+from lum.clu.processors.directed_graph import DirectedGraph
+from collections import deque
+import re
+import typing
+
+__all__ = ["HeadFinder"]
+
+
+Span = typing.Union[typing.Any, typing.Tuple[int, int]]
+
+
+class HeadFinder:
+  """
+  Finds the semantic head of a token span: the token (among those whose tag matches one of `valid_tags`)
+  closest to the top of the span's dependency subgraph. Ties are broken by degree and then by position (rightmost).
+
+  Each distinct tag is matched against `valid_tags` once.
+  Depths are relative to the span, so each distinct span needs its own traversal (a BFS over the tokens of the span).
+  Resolving all spans of a sentence together (see `HeadFinder.semantic_heads`) shares everything else:
+  the sentence's adjacency, token degrees, and valid tags are computed once, and repeated spans are only resolved once.
+  """
+
+  DEFAULT_VALID_TAGS: typing.ClassVar[typing.Tuple[str, ...]] = (r"^N", "VBG")
+
+  def __init__(
+    self,
+    valid_tags: typing.Optional[typing.Iterable[str]] = DEFAULT_VALID_TAGS,
+    graph_names: typing.Sequence[str] = DirectedGraph.DEPENDENCY_GRAPHS
+  ):
+    # None means any tag is valid
+    self.valid_tags: typing.Optional[list[re.Pattern]] = [re.compile(p) for p in valid_tags] if valid_tags is not None else None
+    self.graph_names = tuple(graph_names)
+    self._tag_cache: dict[str, bool] = dict()
+
+  def _is_valid_tag(self, tag: str) -> bool:
+    valid = self._tag_cache.get(tag, None)
+    if valid is None:
+      valid = any(p.match(tag) for p in self.valid_tags)
+      self._tag_cache[tag] = valid
+    return valid
+
+  def _graph(self, sentence: typing.Any, graph_name: typing.Optional[str]) -> typing.Optional[DirectedGraph]:
+    if graph_name is not None:
+      return sentence.graphs.get(graph_name, None)
+    for name in self.graph_names:
+      if name in sentence.graphs:
+        return sentence.graphs[name]
+    return None
+
+  @staticmethod
+  def _bounds(span: Span) -> typing.Tuple[int, int]:
+    return (span.start, span.end) if hasattr(span, "start") else span
+
+  @staticmethod
+  def _degrees(graph: CompactGraph) -> list[int]:
+    """The number of edges entering or leaving each token"""
+    return [out_degree + in_degree for out_degree, in_degree in zip(graph.out_degrees, graph.in_degrees)]
+
+  @staticmethod
+  def _head(graph: CompactGraph, degrees: list[int], valid: list[bool], start: int, end: int) -> typing.Optional[int]:
+    candidates = [i for i in range(start, end) if valid[i]]
+    if len(candidates) == 0:
+      return None
+    out_offsets, out_edges = graph._outgoing_csr()
+    in_offsets, in_edges = graph._incoming_csr()
+    sources, destinations = graph.sources, graph.destinations
+    n = graph.num_nodes
+    # the top of the span's subgraph: tokens w/o a parent in the span
+    depth: dict[int, int] = dict()
+    queue: typing.Deque[int] = deque()
+    for i in range(start, end):
+      if i >= n or not any(start <= sources[ei] < end and sources[ei] != i for ei in in_edges[in_offsets[i]:in_offsets[i + 1]]):
+        depth[i] = 0
+        queue.append(i)
+    # depth of every other token in the span (BFS restricted to the span)
+    while queue:
+      node = queue.popleft()
+      if node >= n:
+        continue
+      for ei in out_edges[out_offsets[node]:out_offsets[node + 1]]:
+        child = destinations[ei]
+        if start <= child < end and child not in depth:
+          depth[child] = depth[node] + 1
+          queue.append(child)
+    unreachable = end - start
+    return min(candidates, key=lambda i: (depth.get(i, unreachable), -(degrees[i] if i < n else 0), -i))
+
+  def _valid(self, sentence: typing.Any) -> list[bool]:
+    tags = sentence.tags
+    if self.valid_tags is None or tags is None:
+      return [True] * len(sentence.words)
+    cache = self._tag_cache
+    return [cache[t] if t in cache else self._is_valid_tag(t) for t in tags]
+
+  def semantic_heads(self, sentence: typing.Any, spans: typing.Iterable[Span], graph_name: typing.Optional[str] = None) -> list[typing.Optional[int]]:
+    """
+    The index of the semantic head of each span (an `Interval` or a `(start, end)` pair) of `sentence` (or None if no token in the span has a valid tag).
+    If `graph_name` is not provided, the first of `HeadFinder.graph_names` found in the sentence is used.
+    """
+    spans = [HeadFinder._bounds(span) for span in spans]
+    graph = self._graph(sentence, graph_name)
+    if graph is None:
+      return [None] * len(spans)
+    compact = graph.compact
+    degrees = HeadFinder._degrees(compact)
+    valid = self._valid(sentence)
+    # (start, end) -> head
+    heads: dict[typing.Tuple[int, int], typing.Optional[int]] = dict()
+    for start, end in spans:
+      if (start, end) not in heads:
+        heads[(start, end)] = HeadFinder._head(compact, degrees, valid, start, end)
+    return [heads[span] for span in spans]
+
+  def semantic_head(self, sentence: typing.Any, span: typing.Optional[Span] = None, graph_name: typing.Optional[str] = None) -> typing.Optional[int]:
+    """The index of the semantic head of `span` (default: the whole sentence)"""
+    return self.semantic_heads(sentence, [span if span is not None else (0, len(sentence.words))], graph_name=graph_name)[0]
+
+  def mention_heads(self, mentions: typing.Iterable[typing.Any], graph_name: typing.Optional[str] = None) -> list[typing.Optional[int]]:
+    """The semantic head of each mention. Mentions are grouped by sentence, so each sentence is processed once."""
+    mentions = list(mentions)
+    # (document, sentence index) -> positions of the mentions in that sentence
+    groups: dict[typing.Tuple[int, int], list[int]] = dict()
+    for i, m in enumerate(mentions):
+      groups.setdefault((id(m.document), m.sentence_index), []).append(i)
+    heads: list[typing.Optional[int]] = [None] * len(mentions)
+    for positions in groups.values():
+      first = mentions[positions[0]]
+      sentence = first.document.sentences[first.sentence_index]
+      for i, head in zip(positions, self.semantic_heads(sentence, [mentions[i].token_interval for i in positions], graph_name=graph_name)):
+        heads[i] = head
+    return heads
@@ -0,0 +1,177 @@
+from __future__ import annotations
+from pydantic import BaseModel, Field
+from lum.clu.processors.compact_graph import CompactGraph
+from lum.clu.processors.utils import Vocabulary
+from array import array
+import collections.abc
+import sys
+import typing
+
+__all__ = ["EncodedColumn", "Interner", "InterningStats"]
+
+
+class EncodedColumn(collections.abc.Sequence):
+  """
+  A token-level annotation (ex. `Sentence.tags`) stored as an array of integer codes into a (shared) `Vocabulary`.
+  Behaves like the list of strings it replaces.
+  """
+
+  __slots__ = ("codes", "vocabulary")
+
+  def __init__(self, codes: array, vocabulary: Vocabulary):
+    self.codes = codes
+    self.vocabulary = vocabulary
+
+  @staticmethod
+  def encode(values: typing.Iterable[str], vocabulary: Vocabulary) -> EncodedColumn:
+    index = vocabulary.index
+    codes = [index(v) for v in values]
+    # 2 bytes per token unless the vocabulary has outgrown them
+    typecode = "H" if len(vocabulary) <= 0xFFFF else "I"
+    return EncodedColumn(array(typecode, codes), vocabulary)
+
+  def __getitem__(self, i):
+    strings = self.vocabulary._strings
+    if isinstance(i, slice):
+      return [strings[c] for c in self.codes[i]]
+    return strings[self.codes[i]]
+
+  def __iter__(self) -> typing.Iterator[str]:
+    return map(self.vocabulary._strings.__getitem__, self.codes)
+
+  def __len__(self) -> int:
+    return len(self.codes)
+
+  def __eq__(self, other: typing.Any) -> bool:
+    if isinstance(other, EncodedColumn) and other.vocabulary is self.vocabulary:
+      return self.codes == other.codes
+    if isinstance(other, collections.abc.Sequence) and not isinstance(other, str):
+      return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+    return NotImplemented
+
+  def decode(self) -> list[str]:
+    """The (shared) strings of this column as a list"""
+    return list(self)
+
+  def __repr__(self) -> str:
+    return repr(self.decode())
+
+
+class InterningStats(BaseModel):
+  """Memory use of an interned column"""
+  column: str = Field(description="The name of the column (ex. `tags`)")
+  vocabulary_size: int = Field(description="The number of distinct strings")
+  values: int = Field(description="The number of values (tokens, edges, or labels) interned")
+  bytes_saved: int = Field(description="Estimated bytes saved by interning (vs. one pointer and one string object per value)")
+
+
+class Interner:
+  """
+  Corpus-wide vocabularies for low-cardinality strings.
+
+  - `tags`, `chunks`, `entities`, and `norms` of each `Sentence` are stored as `EncodedColumn`s
+  - graph relations (`Edge.relation`) and mention `labels` are replaced with the vocabulary's shared copy of each string
+
+  Share one `Interner` across everything that is loaded (ex. `OdinJsonSerializer.from_compact_mentions_json(..., interner=interner)`).
+  """
+
+  ENCODED_COLUMNS: typing.ClassVar[typing.Tuple[str, ...]] = ("tags", "norms", "chunks", "entities")
+  RELATIONS: typing.ClassVar[str] = "relations"
+  LABELS: typing.ClassVar[str] = "labels"
+
+  def __init__(self):
+    self.vocabularies: dict[str, Vocabulary] = {
+      name: Vocabulary() for name in Interner.ENCODED_COLUMNS + (Interner.RELATIONS, Interner.LABELS)
+    }
+    # column -> number of values, total size (in bytes) of the strings that were replaced
+    self._values: dict[str, int] = {name: 0 for name in self.vocabularies}
+    self._replaced_bytes: dict[str, int] = {name: 0 for name in self.vocabularies}
+
+  def _record(self, column: str, values: typing.Sequence[str]) -> None:
+    self._values[column] += len(values)
+    # strings decoded from JSON are distinct objects
+    self._replaced_bytes[column] += sum(map(sys.getsizeof, values))
+
+  def intern_sentence(self, sentence: typing.Any) -> typing.Any:
+    """Encodes the low-cardinality columns of `sentence` (a `Sentence` or `CompactSentence`) and interns the relations of its graphs in place"""
+    # a Sentence's fields are replaced directly (bypassing validation), and a CompactSentence's slots are simply reassigned
+    fields = getattr(sentence, "__dict__", None)
+    for column in Interner.ENCODED_COLUMNS:
+      values = fields[column] if fields is not None else getattr(sentence, column)
+      if values is None or (isinstance(values, EncodedColumn) and values.vocabulary is self.vocabularies[column]):
+        continue
+      if not isinstance(values, EncodedColumn):
+        self._record(column, values)
+      encoded = EncodedColumn.encode(values, self.vocabularies[column])
+      if fields is not None:
+        fields[column] = encoded
+      else:
+        setattr(sentence, column, encoded)
+    for g in sentence.graphs.values():
+      self.intern_graph(g)
+    return sentence
+
+  def intern_graph(self, graph: typing.Any) -> typing.Any:
+    """
+    Replaces the relation of each edge with the vocabulary's shared copy.
+    Edges that haven't been built yet (see `DirectedGraph.from_trusted_json` and `DirectedGraph.from_compact`) are interned without building them.
+    """
+    intern = self.vocabularies[Interner.RELATIONS].intern
+    if "edges" not in graph.__dict__:
+      raw = graph._raw_edges
+      if isinstance(raw, CompactGraph):
+        # each relation is stored once in the graph's vocabulary
+        strings = raw.vocabulary._strings
+        used = sorted(set(raw.relations))
+        self._record(Interner.RELATIONS, [strings[r] for r in used])
+        for r in used:
+          strings[r] = intern(strings[r])
+      else:
+        self._record(Interner.RELATIONS, [e["relation"] for e in raw])
+        for e in raw:
+          e["relation"] = intern(e["relation"])
+      return graph
+    relations = [e.relation for e in graph.edges]
+    self._record(Interner.RELATIONS, relations)
+    for e, relation in zip(graph.edges, relations):
+      e.__dict__["relation"] = intern(relation)
+    return graph
+
+  def intern_document(self, doc: typing.Any) -> typing.Any:
+    """Interns every sentence of `doc` in place (lazily for `LazyDocument`s)"""
+    sentences = doc.sentences
+    if hasattr(sentences, "interner"):
+      # sentences that haven't been built yet are interned as they're built
+      sentences.interner = self
+      for s in sentences._sentences:
+        if s is not None:
+          self.intern_sentence(s)
+      return doc
+    for s in sentences:
+      self.intern_sentence(s)
+    return doc
+
+  def intern_mention(self, mention: typing.Any) -> typing.Any:
+    """Replaces the labels of `mention` with the vocabulary's shared copies"""
+    intern = self.vocabularies[Interner.LABELS].intern
+    labels = mention.labels
+    self._record(Interner.LABELS, labels)
+    mention.__dict__["labels"] = [intern(label) for label in labels]
+    return mention
+
+  def stats(self) -> list[InterningStats]:
+    """Vocabulary sizes and (estimated) bytes saved for each column"""
+    stats = []
+    pointer = 8
+    for column, vocabulary in self.vocabularies.items():
+      values = self._values[column]
+      vocabulary_bytes = sum(map(sys.getsizeof, vocabulary)) + pointer * len(vocabulary)
+      if column in Interner.ENCODED_COLUMNS:
+        # pointer + string object -> 2 (or 4) byte code
+        itemsize = 2 if len(vocabulary) <= 0xFFFF else 4
+        saved = pointer * values + self._replaced_bytes[column] - itemsize * values - vocabulary_bytes
+      else:
+        # only the string objects are shared
+        saved = self._replaced_bytes[column] - vocabulary_bytes
+      stats.append(InterningStats(column=column, vocabulary_size=len(vocabulary), values=values, bytes_saved=saved))
+    return stats
@@ -1,22 +1,33 @@
 from __future__ import annotations
-from pydantic import BaseModel, Field
+from pydantic import GetCoreSchemaHandler
+from pydantic_core import core_schema
+from array import array
+from bisect import bisect_left
 import typing
 
-__all__ = ["Interval"]
+__all__ = ["Interval", "IntervalArray"]
 
-class Interval(BaseModel):
-    """Defines a token or character span"""
-    start: int = Field(description="The token or character index where the interval begins.")
-    end: int = Field(description="1 + the index of the last token/character in the span.")
+class Interval:
+    """
+    Defines a token or character span.
+
+    Intervals are immutable and hashable. They validate and serialize like a pydantic model with `start` and `end` fields
+    (ex. as a field of `lum.clu.odin.mention.Mention`), but constructing one performs no validation.
+    """
+
+    __slots__ = ("start", "end")
+
+    start: int
+    end: int
 
     """
     Methods
     -------
     contains(that)
-        Test whether `that` (int or Interval) overlaps with span of this Interval.
+        Test whether this Interval contains `that` (int or Interval).
 
     overlaps(that)
-        Test whether this Interval contains another.  Equivalent Intervals will overlap.
+        Test whether `that` (int or Interval) overlaps with span of this Interval.  Equivalent Intervals will overlap.
     """
 
     # def __init__(self, start, end):
@@ -25,23 +36,57 @@ class Interval(BaseModel):
     #     self.start = start
     #     self.end = end
 
-    # def to_JSON_dict(self):
-    #     return {"start":self.start, "end":self.end}
+    def __init__(self, start: int, end: int):
+        object.__setattr__(self, "start", start)
+        object.__setattr__(self, "end", end)
+
+    def __setattr__(self, name: str, value: typing.Any) -> None:
+        raise AttributeError(f"Interval is immutable (cannot set '{name}')")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"Interval is immutable (cannot delete '{name}')")
+
+    def __reduce__(self):
+        return (Interval, (self.start, self.end))
+
+    def __eq__(self, other: typing.Any) -> bool:
+        if not isinstance(other, Interval):
+            return NotImplemented
+        return self.start == other.start and self.end == other.end
+
+    def __hash__(self) -> int:
+        return hash((self.start, self.end))
+
+    def __repr__(self) -> str:
+        return f"Interval(start={self.start}, end={self.end})"
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source: typing.Any, handler: GetCoreSchemaHandler) -> core_schema.CoreSchema:
+        # validated from {"start": ..., "end": ...} (or an existing Interval) and serialized as {"start": ..., "end": ...}
+        fields_schema = core_schema.typed_dict_schema({
+            "start": core_schema.typed_dict_field(core_schema.int_schema(), metadata={"pydantic_js_updates": {"description": "The token or character index where the interval begins."}}),
+            "end": core_schema.typed_dict_field(core_schema.int_schema(), metadata={"pydantic_js_updates": {"description": "1 + the index of the last token/character in the span."}})
+        })
+        from_fields = core_schema.no_info_after_validator_function(lambda d: Interval(d["start"], d["end"]), fields_schema)
+        return core_schema.json_or_python_schema(
+            json_schema=from_fields,
+            python_schema=core_schema.union_schema([core_schema.is_instance_schema(Interval), from_fields]),
+            serialization=core_schema.plain_serializer_function_ser_schema(lambda i: {"start": i.start, "end": i.end})
+        )
 
     @property
     def size(self) -> int:
       """The size of an Interval"""
       return self.end - self.start
 
-    @property
     def __len__(self) -> int:
       """The size of an Interval"""
       return self.size
 
     def contains(self, other: typing.Union[int, Interval]) -> bool:
-        """Test whether `other` (int or Interval) overlaps with span of this Interval."""
+        """Test whether this Interval contains `other` (int or Interval)."""
         if isinstance(other, int):
-          return self.start <= other <= self.end 
+          return self.start <= other <= self.end
         # self.__class__
         elif isinstance(other, Interval):
            return self.start <= other.start and self.end >= other.end
@@ -51,10 +96,101 @@ class Interval(BaseModel):
        return self.contains(other)
 
     def overlaps(self, other: typing.Union[int, Interval]) -> bool:
-      """Test whether this Interval contains another.  Equivalent Intervals will overlap."""
+      """Test whether `other` (int or Interval) overlaps with span of this Interval.  Equivalent Intervals will overlap."""
       if isinstance(other, int):
           return self.start <= other < self.end
       # self.__class__
       elif isinstance(other, Interval):
           return ((other.start <= self.start < other.end) or (self.start <= other.start < self.end))
-      return False
\ No newline at end of file
+      return False
+
+
+class IntervalArray:
+    """
+    Column-oriented collection of Intervals (parallel `int32` arrays of starts and ends).
+
+    `contains`, `overlaps`, and `size` apply to every Interval at once,
+    and all overlapping pairs are found with a sweep over the sorted starts (rather than by comparing every pair).
+    Semantics match `Interval.contains` and `Interval.overlaps`.
+    """
+
+    __slots__ = ("starts", "ends", "_order")
+
+    def __init__(self, starts: typing.Iterable[int], ends: typing.Iterable[int]):
+        self.starts = array("i", starts)
+        self.ends = array("i", ends)
+        if len(self.starts) != len(self.ends):
+            raise ValueError(f"Found {len(self.starts)} starts, but {len(self.ends)} ends")
+        # (sorted starts, indices in start order)
+        self._order: typing.Optional[typing.Tuple[array, array]] = None
+
+    @staticmethod
+    def from_intervals(intervals: typing.Iterable[Interval]) -> IntervalArray:
+        intervals = list(intervals)
+        return IntervalArray((i.start for i in intervals), (i.end for i in intervals))
+
+    @staticmethod
+    def from_mentions(mentions: typing.Iterable[typing.Any]) -> IntervalArray:
+        """The `token_interval` of each `lum.clu.odin.mention.Mention`"""
+        return IntervalArray.from_intervals(m.token_interval for m in mentions)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, i: int) -> Interval:
+        return Interval(self.starts[i], self.ends[i])
+
+    def __iter__(self) -> typing.Iterator[Interval]:
+        return map(Interval, self.starts, self.ends)
+
+    def __repr__(self) -> str:
+        return f"IntervalArray({list(zip(self.starts, self.ends))!r})"
+
+    @property
+    def size(self) -> array:
+        """The size of each Interval"""
+        return array("i", map(int.__sub__, self.ends, self.starts))
+
+    def contains(self, other: typing.Union[int, Interval]) -> list[bool]:
+        """Whether each Interval contains `other` (int or Interval)"""
+        if isinstance(other, int):
+            return [start <= other <= end for start, end in zip(self.starts, self.ends)]
+        return [start <= other.start and end >= other.end for start, end in zip(self.starts, self.ends)]
+
+    def overlaps(self, other: typing.Union[int, Interval]) -> list[bool]:
+        """Whether `other` (int or Interval) overlaps with each Interval"""
+        if isinstance(other, int):
+            return [start <= other < end for start, end in zip(self.starts, self.ends)]
+        ostart, oend = other.start, other.end
+        return [(ostart <= start < oend) or (start <= ostart < end) for start, end in zip(self.starts, self.ends)]
+
+    def _sorted(self) -> typing.Tuple[array, array]:
+        if self._order is None:
+            order = sorted(range(len(self.starts)), key=self.starts.__getitem__)
+            self._order = (array("i", (self.starts[i] for i in order)), array("i", order))
+        return self._order
+
+    def _starting_within(self, other: IntervalArray) -> typing.Iterator[typing.Tuple[int, int]]:
+        """(i, j) for each Interval j of `other` that starts within Interval i"""
+        sorted_starts, order = other._sorted()
+        for i, (start, end) in enumerate(zip(self.starts, self.ends)):
+            for k in range(bisect_left(sorted_starts, start), bisect_left(sorted_starts, end)):
+                yield i, order[k]
+
+    def overlapping_pairs(self, other: typing.Optional[IntervalArray] = None) -> list[typing.Tuple[int, int]]:
+        """
+        Every (i, j) (in sorted order) such that Interval i of this array overlaps Interval j of `other` (default: this array).
+        Two Intervals overlap when either one starts within the other, so the cost is proportional to the number of pairs found.
+        """
+        other = other if other is not None else self
+        pairs = set(self._starting_within(other))
+        pairs.update((i, j) for j, i in other._starting_within(self))
+        return sorted(pairs)
+
+    def overlap_matrix(self, other: typing.Optional[IntervalArray] = None) -> list[bytearray]:
+        """Pairwise overlaps as a dense matrix: row i, column j is 1 if Interval i overlaps Interval j of `other` (default: this array)"""
+        other = other if other is not None else self
+        matrix = [bytearray(len(other)) for _ in range(len(self))]
+        for i, j in self.overlapping_pairs(other):
+            matrix[i][j] = 1
+        return matrix
@@ -0,0 +1,99 @@
+from __future__ import annotations
+from lum.clu.processors.utils import Labels, Vocabulary
+from array import array
+import typing
+
+__all__ = ["IOBDecoder", "IOBSpans"]
+
+
+class IOBSpans:
+  """
+  Labeled token spans decoded from IOB tags, stored as parallel arrays of starts, ends (exclusive), and label IDs (see `IOBSpans.vocabulary`).
+  """
+
+  __slots__ = ("starts", "ends", "labels", "vocabulary")
+
+  def __init__(self, vocabulary: Vocabulary):
+    self.starts: array = array("i")
+    self.ends: array = array("i")
+    self.labels: array = array("i")
+    self.vocabulary = vocabulary
+
+  def __len__(self) -> int:
+    return len(self.starts)
+
+  def __iter__(self) -> typing.Iterator[typing.Tuple[int, int, str]]:
+    """Yields (start, end, label) for each span"""
+    vocabulary = self.vocabulary
+    return ((start, end, vocabulary[label]) for start, end, label in zip(self.starts, self.ends, self.labels))
+
+  def by_label(self) -> dict[str, list[typing.Tuple[int, int]]]:
+    """label -> [(start, end), ...]"""
+    spans: dict[str, list[typing.Tuple[int, int]]] = dict()
+    for start, end, label in self:
+      spans.setdefault(label, []).append((start, end))
+    return spans
+
+  def __repr__(self) -> str:
+    return f"IOBSpans({list(self)!r})"
+
+
+class IOBDecoder:
+  """
+  Converts IOB tags (ex. `B-PER I-PER O`) to `IOBSpans`.
+
+  Each distinct tag is parsed once (and cached), so decoding costs a dictionary lookup per token.
+  `B-X` always starts a new span, while `I-X` (or a bare `X`) continues a span of `X` (or starts one).
+  """
+
+  # tag kinds
+  OUTSIDE: typing.ClassVar[int] = 0
+  BEGIN: typing.ClassVar[int] = 1
+  INSIDE: typing.ClassVar[int] = 2
+
+  def __init__(self, vocabulary: typing.Optional[Vocabulary] = None):
+    self.vocabulary = vocabulary if vocabulary is not None else Vocabulary()
+    # tag -> (kind, label ID)
+    self._tags: dict[str, typing.Tuple[int, int]] = dict()
+
+  def _parse(self, tag: typing.Optional[str]) -> typing.Tuple[int, int]:
+    parsed = self._tags.get(tag, None)
+    if parsed is None:
+      if tag is None or tag == Labels.O or tag == "":
+        parsed = (IOBDecoder.OUTSIDE, -1)
+      elif tag.startswith("B-"):
+        parsed = (IOBDecoder.BEGIN, self.vocabulary.index(tag[2:]))
+      elif tag.startswith("I-"):
+        parsed = (IOBDecoder.INSIDE, self.vocabulary.index(tag[2:]))
+      else:
+        parsed = (IOBDecoder.INSIDE, self.vocabulary.index(tag))
+      self._tags[tag] = parsed
+    return parsed
+
+  def decode(self, tags: typing.Optional[typing.Sequence[str]]) -> IOBSpans:
+    spans = IOBSpans(self.vocabulary)
+    if not tags:
+      return spans
+    cache, parse = self._tags, self._parse
+    starts, ends, labels = spans.starts, spans.ends, spans.labels
+    outside, begin = IOBDecoder.OUTSIDE, IOBDecoder.BEGIN
+    current, start = -1, 0
+    for i, tag in enumerate(tags):
+      kind, label = cache[tag] if tag in cache else parse(tag)
+      if kind != outside and kind != begin and label == current:
+        continue
+      # the current span (if any) ends here
+      if current != -1:
+        starts.append(start)
+        ends.append(i)
+        labels.append(current)
+      current, start = (label, i) if kind != outside else (-1, 0)
+    if current != -1:
+      starts.append(start)
+      ends.append(len(tags))
+      labels.append(current)
+    return spans
+
+
+# shared by all sentences, so label IDs are consistent across documents
+DEFAULT_DECODER = IOBDecoder()
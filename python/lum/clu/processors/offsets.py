@@ -0,0 +1,85 @@
+from __future__ import annotations
+from array import array
+from bisect import bisect_left, bisect_right
+import typing
+
+__all__ = ["TokenOffsetIndex"]
+
+
+class TokenOffsetIndex:
+  """
+  Maps character offsets to `(sentence index, token index)` pairs using binary search over flattened offset arrays.
+  Assumes that tokens do not overlap and appear in order of their character offsets (as is the case for CLU-produced documents).
+  """
+
+  def __init__(self, sentences: typing.Iterable[typing.Any]):
+    self.starts: array = array("q")
+    self.ends: array = array("q")
+    # the (global) index of the first token in each sentence
+    self.sentence_starts: array = array("q")
+    for s in sentences:
+      self.sentence_starts.append(len(self.starts))
+      self.starts.extend(s.start_offsets)
+      self.ends.extend(s.end_offsets)
+
+  def __len__(self) -> int:
+    """The number of tokens in the document"""
+    return len(self.starts)
+
+  def locate(self, i: int) -> typing.Tuple[int, int]:
+    """Converts the (global) index of a token to `(sentence index, token index)`"""
+    s = bisect_right(self.sentence_starts, i) - 1
+    return s, i - self.sentence_starts[s]
+
+  def _token_at(self, offset: int) -> int:
+    i = bisect_right(self.starts, offset) - 1
+    return i if i >= 0 and offset < self.ends[i] else -1
+
+  def _tokens_in_span(self, start: int, end: int) -> range:
+    # tokens that end after `start` and begin before `end`
+    return range(bisect_right(self.ends, start), bisect_left(self.starts, end))
+
+  def token_at(self, offset: int) -> typing.Optional[typing.Tuple[int, int]]:
+    """The `(sentence index, token index)` of the token containing the character at `offset` (or None, ex. for whitespace)"""
+    i = self._token_at(offset)
+    return self.locate(i) if i >= 0 else None
+
+  def tokens_in_span(self, start: int, end: int) -> list[typing.Tuple[int, int]]:
+    """The `(sentence index, token index)` of each token overlapping the characters in [start, end)"""
+    return [self.locate(i) for i in self._tokens_in_span(start, end)]
+
+  def tokens_at(self, offsets: typing.Iterable[int]) -> list[typing.Optional[typing.Tuple[int, int]]]:
+    """Batch version of `TokenOffsetIndex.token_at`"""
+    starts, ends, sentence_starts = self.starts, self.ends, self.sentence_starts
+    results: list[typing.Optional[typing.Tuple[int, int]]] = []
+    append = results.append
+    for offset in offsets:
+      i = bisect_right(starts, offset) - 1
+      if i >= 0 and offset < ends[i]:
+        s = bisect_right(sentence_starts, i) - 1
+        append((s, i - sentence_starts[s]))
+      else:
+        append(None)
+    return results
+
+  def tokens_in_spans(self, spans: typing.Iterable[typing.Tuple[int, int]]) -> list[list[typing.Tuple[int, int]]]:
+    """Batch version of `TokenOffsetIndex.tokens_in_span`"""
+    starts, ends, sentence_starts = self.starts, self.ends, self.sentence_starts
+    results: list[list[typing.Tuple[int, int]]] = []
+    append = results.append
+    for start, end in spans:
+      first, last = bisect_right(ends, start), bisect_left(starts, end)
+      if first >= last:
+        append([])
+        continue
+      # tokens are consecutive, so we only need to search for the first sentence
+      s = bisect_right(sentence_starts, first) - 1
+      next_sentence = sentence_starts[s + 1] if s + 1 < len(sentence_starts) else len(starts)
+      tokens: list[typing.Tuple[int, int]] = []
+      for i in range(first, last):
+        while i >= next_sentence:
+          s += 1
+          next_sentence = sentence_starts[s + 1] if s + 1 < len(sentence_starts) else len(starts)
+        tokens.append((s, i - sentence_starts[s]))
+      append(tokens)
+    return results
@@ -0,0 +1,183 @@
+from __future__ import annotations
+from lum.clu.processors.compact_graph import CompactGraph
+from collections import deque
+import typing
+
+__all__ = ["DependencyUtils", "PathStep"]
+
+
+Nodes = typing.Union[int, typing.Iterable[int]]
+
+
+class PathStep(typing.NamedTuple):
+  """An edge of a path, along with the direction in which it was traversed"""
+  source: int
+  destination: int
+  relation: str
+  # ">" (from source to destination) or "<" (from destination to source)
+  direction: str
+
+
+class DependencyUtils:
+  """
+  Breadth-first shortest paths over a `CompactGraph` (see `DirectedGraph.compact`).
+
+  Paths are lists of `PathStep`s. If `directed` is False, edges may also be traversed from destination to source.
+  `start` and `end` may be a single token or a collection of tokens (the shortest path between any start and any end is returned).
+  """
+
+  OUTGOING: typing.ClassVar[str] = ">"
+  INCOMING: typing.ClassVar[str] = "<"
+
+  @staticmethod
+  def _nodes(nodes: Nodes) -> typing.FrozenSet[int]:
+    return frozenset([nodes]) if isinstance(nodes, int) else frozenset(nodes)
+
+  @staticmethod
+  def _bfs(
+    graph: CompactGraph,
+    starts: typing.FrozenSet[int],
+    targets: typing.Optional[typing.FrozenSet[int]],
+    directed: bool
+  ) -> typing.Tuple[list[int], typing.Optional[int]]:
+    """
+    Returns the edge used to reach each node (`2 * edge index` when followed, `2 * edge index + 1` when reversed; -1 for starts and -2 for unreached nodes)
+    and the first target reached (if `targets` is provided, the search stops there).
+    """
+    n = graph.num_nodes
+    via = [-2] * n
+    queue: typing.Deque[int] = deque()
+    for s in starts:
+      if 0 <= s < n:
+        via[s] = -1
+        queue.append(s)
+        if targets is not None and s in targets:
+          return via, s
+    out_offsets, out_edges = graph._outgoing_csr()
+    if not directed:
+      in_offsets, in_edges = graph._incoming_csr()
+    sources, destinations = graph.sources, graph.destinations
+    popleft, append = queue.popleft, queue.append
+    while queue:
+      node = popleft()
+      for ei in out_edges[out_offsets[node]:out_offsets[node + 1]]:
+        nxt = destinations[ei]
+        if via[nxt] == -2:
+          via[nxt] = 2 * ei
+          if targets is not None and nxt in targets:
+            return via, nxt
+          append(nxt)
+      if not directed:
+        for ei in in_edges[in_offsets[node]:in_offsets[node + 1]]:
+          nxt = sources[ei]
+          if via[nxt] == -2:
+            via[nxt] = 2 * ei + 1
+            if targets is not None and nxt in targets:
+              return via, nxt
+            append(nxt)
+    return via, None
+
+  @staticmethod
+  def _step(graph: CompactGraph, code: int) -> typing.Tuple[PathStep, int]:
+    """The step for an entry of `via` and the node it was taken from"""
+    ei, reversed_edge = code >> 1, code & 1
+    source, destination = graph.sources[ei], graph.destinations[ei]
+    relation = graph.vocabulary[graph.relations[ei]]
+    if reversed_edge:
+      return PathStep(source, destination, relation, DependencyUtils.INCOMING), destination
+    return PathStep(source, destination, relation, DependencyUtils.OUTGOING), source
+
+  @staticmethod
+  def _path_to(graph: CompactGraph, via: list[int], node: int) -> list[PathStep]:
+    path: list[PathStep] = []
+    code = via[node]
+    while code >= 0:
+      step, node = DependencyUtils._step(graph, code)
+      path.append(step)
+      code = via[node]
+    path.reverse()
+    return path
+
+  @staticmethod
+  def shortest_path(graph: CompactGraph, start: Nodes, end: Nodes, directed: bool = False) -> typing.Optional[list[PathStep]]:
+    """A shortest path from `start` to `end` (or None if there is no such path)"""
+    targets = DependencyUtils._nodes(end)
+    via, found = DependencyUtils._bfs(graph, DependencyUtils._nodes(start), targets, directed)
+    return DependencyUtils._path_to(graph, via, found) if found is not None else None
+
+  @staticmethod
+  def shortest_paths(
+    graph: CompactGraph,
+    start: Nodes,
+    end: Nodes,
+    directed: bool = False,
+    max_paths: typing.Optional[int] = None
+  ) -> list[list[PathStep]]:
+    """Every shortest path from `start` to `end` (at most `max_paths`, if provided)"""
+    n = graph.num_nodes
+    starts = [s for s in DependencyUtils._nodes(start) if 0 <= s < n]
+    targets = DependencyUtils._nodes(end)
+    dist = [-1] * n
+    # node -> [(step, previous node), ...]
+    preds: list[list[typing.Tuple[PathStep, int]]] = [[] for _ in range(n)]
+    frontier = []
+    for s in starts:
+      dist[s] = 0
+      frontier.append(s)
+    reached = [s for s in starts if s in targets]
+    depth = 0
+    while frontier and not reached:
+      depth += 1
+      next_frontier: list[int] = []
+      for node in frontier:
+        codes = [2 * ei for ei in graph.outgoing_edges(node)]
+        if not directed:
+          codes += [2 * ei + 1 for ei in graph.incoming_edges(node)]
+        for code in codes:
+          step, _ = DependencyUtils._step(graph, code)
+          nxt = step.destination if code & 1 == 0 else step.source
+          if dist[nxt] == -1:
+            dist[nxt] = depth
+            next_frontier.append(nxt)
+          if dist[nxt] == depth:
+            preds[nxt].append((step, node))
+      frontier = next_frontier
+      reached = [node for node in frontier if node in targets]
+    # enumerate paths backwards from each target
+    paths: list[list[PathStep]] = []
+    stack: list[typing.Tuple[int, list[PathStep]]] = [(node, []) for node in reversed(reached)]
+    while stack and (max_paths is None or len(paths) < max_paths):
+      node, suffix = stack.pop()
+      if dist[node] == 0:
+        paths.append(list(reversed(suffix)))
+        continue
+      for step, prev in reversed(preds[node]):
+        stack.append((prev, suffix + [step]))
+    return paths
+
+  @staticmethod
+  def batch_shortest_paths(
+    graph: CompactGraph,
+    pairs: typing.Iterable[typing.Tuple[Nodes, Nodes]],
+    directed: bool = False
+  ) -> list[typing.Optional[list[PathStep]]]:
+    """
+    A shortest path (or None) for each (start, end) pair.
+    Each distinct `start` is searched once and its search is shared by all of its pairs.
+    """
+    searches: dict[typing.FrozenSet[int], list[int]] = dict()
+    results: list[typing.Optional[list[PathStep]]] = []
+    for start, end in pairs:
+      starts = DependencyUtils._nodes(start)
+      via = searches.get(starts, None)
+      if via is None:
+        via, _ = DependencyUtils._bfs(graph, starts, None, directed)
+        searches[starts] = via
+      best: typing.Optional[list[PathStep]] = None
+      for target in DependencyUtils._nodes(end):
+        if 0 <= target < len(via) and via[target] != -2:
+          path = DependencyUtils._path_to(graph, via, target)
+          if best is None or len(path) < len(best):
+            best = path
+      results.append(best)
+    return results
@@ -1,12 +1,54 @@
 from __future__ import annotations
-from pydantic import BaseModel, ConfigDict, Field, model_validator
+from pydantic import BaseModel, ConfigDict, Field, field_serializer, model_validator
 from lum.clu.processors.directed_graph import DirectedGraph
-from lum.clu.processors.utils import Labels
+from lum.clu.processors.head_finder import HeadFinder
+from lum.clu.processors.interning import EncodedColumn, Interner
+from lum.clu.processors.iob import DEFAULT_DECODER, IOBSpans
+from lum.clu.processors.utils import CachedPropertiesMixin, ContentHasher, Labels, Trusted, Vocabulary, construct
+import functools
 import typing
 
-__all__ = ["Sentence"]
+__all__ = ["Sentence", "SentenceView"]
 
-class Sentence(BaseModel):
+_DEFAULT_HEAD_FINDER = HeadFinder()
+
+
+class SentenceView(typing.Protocol):
+    """
+    The read interface shared by `Sentence` and `lum.clu.processors.compact_sentence.CompactSentence`
+    (ex. the sentences of a `Document` loaded with `Document.from_trusted_json(..., compact=True)`).
+    """
+
+    text: typing.Optional[str]
+    words: typing.Sequence[str]
+    start_offsets: typing.Sequence[int]
+    end_offsets: typing.Sequence[int]
+    tags: typing.Optional[typing.Sequence[str]]
+    lemmas: typing.Optional[typing.Sequence[str]]
+    norms: typing.Optional[typing.Sequence[str]]
+    chunks: typing.Optional[typing.Sequence[str]]
+    entities: typing.Optional[typing.Sequence[str]]
+    graphs: dict[str, DirectedGraph]
+
+    @property
+    def raw(self) -> typing.Sequence[str]: ...
+
+    @property
+    def length(self) -> int: ...
+
+    @property
+    def dependencies(self) -> typing.Optional[DirectedGraph]: ...
+
+    @property
+    def relation_vocabulary(self) -> Vocabulary: ...
+
+    @property
+    def equivalence_digest(self) -> bytes: ...
+
+    def semantic_head(self, span: typing.Optional[typing.Any] = None, graph_name: typing.Optional[str] = None, valid_tags: typing.Optional[typing.Iterable[str]] = HeadFinder.DEFAULT_VALID_TAGS) -> typing.Optional[int]: ...
+
+
+class Sentence(CachedPropertiesMixin, BaseModel):
 
     UNKNOWN: typing.ClassVar[str] = Labels.UNKNOWN
     # the O in IOB notation
@@ -50,6 +92,118 @@ class Sentence(BaseModel):
             if raw is None:
                 data["raw"] = words
         return data
+
+    @functools.cached_property
+    def relation_vocabulary(self) -> Vocabulary:
+        """
+        The relations used by this Sentence's graphs.
+        Shared by the graphs themselves (see `DirectedGraph.compact`) and by the syntactic paths of the sentence's mentions (see `lum.clu.odin.synpath.SynPath`),
+        so a relation has the same ID in each of them.
+        """
+        return Sentence._shared_relation_vocabulary(self.graphs.values())
+
+    @staticmethod
+    def _shared_relation_vocabulary(graphs: typing.Iterable[DirectedGraph]) -> Vocabulary:
+        graphs = list(graphs)
+        vocabulary = DirectedGraph.share_relation_vocabulary(graphs)
+        for g in graphs:
+            # adds the graph's relations to the vocabulary
+            g.compact
+        return vocabulary
+
+    @functools.cached_property
+    def equivalence_digest(self) -> bytes:
+        """
+        Content hash of the tokens, offsets, annotations, and graphs of this Sentence (computed once and cached).
+        NOTE: the cached value is not updated if the Sentence is later modified.
+        """
+        return Sentence._content_digest(self)
+
+    @staticmethod
+    def _content_digest(sentence: SentenceView) -> bytes:
+        """The `Sentence.equivalence_digest` of any `SentenceView`"""
+        hasher = ContentHasher("clu.Sentence")
+        hasher.update_strs(sentence.raw).update_strs(sentence.words)
+        hasher.update_ints(sentence.start_offsets).update_ints(sentence.end_offsets)
+        for annotations in (sentence.tags, sentence.lemmas, sentence.norms, sentence.chunks, sentence.entities):
+            hasher.update_strs(annotations)
+        hasher.update_ints([len(sentence.graphs)])
+        for name in sorted(sentence.graphs):
+            g = sentence.graphs[name]
+            hasher.update_str(name)
+            hasher.update_ints(g.roots)
+            # the graph's arrays (see `DirectedGraph.compact`), so lazy edges aren't built
+            compact = g.compact
+            strings = compact.vocabulary._strings
+            hasher.update_ints(compact.sources).update_ints(compact.destinations).update_strs([strings[r] for r in compact.relations])
+        return hasher.digest()
+
+    @property
+    def equivalence_hash(self) -> int:
+        """`Sentence.equivalence_digest` as a signed 32-bit integer"""
+        return ContentHasher.to_int32(self.equivalence_digest)
+
+    @functools.cached_property
+    def entity_spans(self) -> IOBSpans:
+        """Named entity spans decoded from the IOB-style `entities` (decoded on first use)"""
+        return DEFAULT_DECODER.decode(self.entities)
+
+    @functools.cached_property
+    def chunk_spans(self) -> IOBSpans:
+        """Phrase spans decoded from the IOB-style `chunks` (decoded on first use)"""
+        return DEFAULT_DECODER.decode(self.chunks)
+
+    def _span_texts(self, spans: IOBSpans) -> dict[str, list[str]]:
+        words = self.words
+        texts: dict[str, list[str]] = dict()
+        for start, end, label in spans:
+            texts.setdefault(label, []).append(" ".join(words[start:end]))
+        return texts
+
+    @property
+    def nes(self) -> dict[str, list[str]]:
+        """NE label -> a list of the corresponding text spans (ex. `{"PERSON": [phrase 1, ..., phrase n]}`)"""
+        return self._span_texts(self.entity_spans)
+
+    @property
+    def phrases(self) -> dict[str, list[str]]:
+        """Chunk label -> a list of the corresponding text spans (ex. `{"NP": [phrase 1, ..., phrase n]}`)"""
+        return self._span_texts(self.chunk_spans)
+
+    @staticmethod
+    def from_trusted_json(data: dict[str, typing.Any], interner: typing.Optional[Interner] = None) -> Sentence:
+        """
+        Constructs a Sentence from trusted (ex. CLU-produced) JSON without validation (see `lum.clu.processors.utils.Trusted`).
+        Accepts either field names or aliases (ex. `startOffsets` or `start_offsets`). If `raw` is not present, `words` is used in its place.
+        The lists in `data` are used as-is (i.e., not copied).
+        If an `interner` is provided, low-cardinality annotations are interned (see `lum.clu.processors.interning.Interner`).
+        """
+        words = data["words"]
+        raw = data.get("raw", None)
+        sentence = construct(
+            Sentence,
+            text=data.get("text", None),
+            raw=raw if raw is not None else words,
+            words=words,
+            start_offsets=data["startOffsets"] if "startOffsets" in data else data["start_offsets"],
+            end_offsets=data["endOffsets"] if "endOffsets" in data else data["end_offsets"],
+            tags=data.get("tags", None),
+            lemmas=data.get("lemmas", None),
+            norms=data.get("norms", None),
+            chunks=data.get("chunks", None),
+            entities=data.get("entities", None),
+            graphs={name: DirectedGraph.from_trusted_json(g) for name, g in data["graphs"].items()}
+        )
+        if Trusted.sample():
+            Trusted.check(sentence, lambda: Sentence.model_validate(data))
+        if interner is not None:
+            interner.intern_sentence(sentence)
+        return sentence
+
+    @field_serializer("tags", "norms", "chunks", "entities", mode="wrap")
+    def _serialize_annotations(self, values: typing.Optional[typing.Sequence[str]], handler):
+        # interned columns are serialized as plain lists
+        return handler(values.decode() if isinstance(values, EncodedColumn) else values)
     
     # length : int
     #     The number of tokens in the `Sentence`
@@ -88,6 +242,24 @@ class Sentence(BaseModel):
     def length(self) -> int:
       return len(self.raw)
 
+    @property
+    def dependencies(self) -> typing.Optional[DirectedGraph]:
+      """The preferred syntactic dependency graph of this `Sentence` (see `DirectedGraph.DEPENDENCY_GRAPHS`)"""
+      for name in DirectedGraph.DEPENDENCY_GRAPHS:
+        if name in self.graphs:
+          return self.graphs[name]
+      return None
+
+    def semantic_head(
+      self,
+      span: typing.Optional[typing.Any] = None,
+      graph_name: typing.Optional[str] = None,
+      valid_tags: typing.Optional[typing.Iterable[str]] = HeadFinder.DEFAULT_VALID_TAGS
+    ) -> typing.Optional[int]:
+      """The index of the semantic head of `span` (an `Interval` or `(start, end)`; default: the whole sentence). See `HeadFinder`."""
+      finder = _DEFAULT_HEAD_FINDER if valid_tags == HeadFinder.DEFAULT_VALID_TAGS else HeadFinder(valid_tags)
+      return finder.semantic_head(self, span, graph_name=graph_name)
+
 
         # self.basic_dependencies = self.graphs.get(DirectedGraph.STANFORD_BASIC_DEPENDENCIES, None)
         # self.collapsed_dependencies = self.graphs.get(DirectedGraph.STANFORD_COLLAPSED_DEPENDENCIES, None)
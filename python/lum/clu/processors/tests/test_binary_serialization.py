@@ -0,0 +1,46 @@
+from lum.clu.processors.document import Document as CluDocument
+from lum.clu.processors.interning import EncodedColumn
+from lum.clu.processors.tests.utils import load_test_docs, check_doc_token_alignment
+import pytest
+import typing
+
+
+def test_document_bytes_round_trip():
+  """Test case for Document.to_bytes() and Document.from_bytes()"""
+  docs: list[CluDocument] = list(load_test_docs([f"example-2-part-{i}.json" for i in range(43)]))
+  doc = CluDocument.merge_documents(docs)
+  data = doc.to_bytes()
+  assert len(data) < len(doc.model_dump_json())
+  loaded = CluDocument.from_bytes(data)
+  assert loaded == doc
+  check_doc_token_alignment(loaded)
+  # also works with buffer views
+  assert CluDocument.from_bytes(memoryview(data)) == doc
+
+def test_document_file_round_trip(tmp_path):
+  """Test case for Document.to_file() and Document.from_file()"""
+  for doc in load_test_docs(["example-1-part-0.json", "example-1-part-1.json"]):
+    # documents w/o text or IDs
+    for d in [doc, doc.model_copy(update={"text": None, "id": "doc-1"})]:
+      path = tmp_path / "doc.bin"
+      d.to_file(path)
+      assert CluDocument.from_file(path) == d
+
+def test_document_from_bytes_invalid():
+  """Document.from_bytes() should reject data in an unknown format"""
+  with pytest.raises(ValueError):
+    CluDocument.from_bytes(b"{}" * 64)
+
+def test_document_from_bytes_is_array_backed():
+  """Document.from_bytes() should keep annotations and graphs array-backed"""
+  doc = list(load_test_docs(["example-1-part-0.json"]))[0]
+  loaded = CluDocument.from_bytes(doc.to_bytes())
+  s = loaded.sentences[0]
+  assert isinstance(s.tags, EncodedColumn)
+  assert s.tags == doc.sentences[0].tags
+  for name, g in s.graphs.items():
+    # edges are only built when they're accessed
+    assert "edges" not in g.__dict__
+    assert list(g.compact.triples()) == list(doc.sentences[0].graphs[name].compact.triples())
+    assert g.edges == doc.sentences[0].graphs[name].edges
+  assert loaded.model_dump() == doc.model_dump()
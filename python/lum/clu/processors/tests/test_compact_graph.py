@@ -0,0 +1,32 @@
+from lum.clu.processors.compact_graph import CompactGraph
+from lum.clu.processors.tests.utils import load_test_docs
+
+
+def test_compact_graph():
+  """Test case for CompactGraph (and DirectedGraph.outgoing()/incoming())"""
+  for doc in load_test_docs([f"example-2-part-{i}.json" for i in range(5)]):
+    for s in doc.sentences:
+      for g in s.graphs.values():
+        compact = CompactGraph.from_edges(g.edges, roots=g.roots, num_nodes=len(s.words))
+        assert list(compact.triples()) == [(e.source, e.destination, e.relation) for e in g.edges]
+        for i in range(len(s.words)):
+          outgoing = [(e.destination, e.relation) for e in g.edges if e.source == i]
+          incoming = [(e.source, e.relation) for e in g.edges if e.destination == i]
+          assert compact.outgoing(i) == g.outgoing(i) == outgoing
+          assert compact.incoming(i) == g.incoming(i) == incoming
+          assert compact.out_degrees[i] == len(outgoing)
+          assert compact.in_degrees[i] == len(incoming)
+          for rel in {r for _, r in outgoing}:
+            assert compact.outgoing(i, relation=rel) == [o for o in outgoing if o[1] == rel]
+        assert g.outgoing(len(s.words) + 10) == []
+
+def test_compact_graph_relations():
+  """CompactGraph should support filtering by relation"""
+  edges = [(0, 1, "nsubj"), (0, 2, "dobj"), (2, 3, "amod"), (0, 3, "nsubj")]
+  compact = CompactGraph.from_edges([type("E", (), {"source": s, "destination": d, "relation": r})() for s, d, r in edges])
+  assert compact.num_nodes == 4
+  assert compact.edges_with_relation("nsubj") == [0, 3]
+  assert compact.edges_with_relation(["amod", "dobj"]) == [1, 2]
+  assert compact.outgoing(0, relation=["dobj", "nsubj"]) == [(1, "nsubj"), (2, "dobj"), (3, "nsubj")]
+  assert compact.incoming(3, relation="unknown") == []
+  assert list(compact.outgoing_edges(0)) == [0, 1, 3]
@@ -0,0 +1,68 @@
+from lum.clu.odin.mention import TextBoundMention
+from lum.clu.odin.serialization import OdinJsonSerializer
+from lum.clu.processors.compact_sentence import CompactSentence
+from lum.clu.processors.document import Document
+from lum.clu.processors.head_finder import HeadFinder
+from lum.clu.processors.interning import EncodedColumn, Interner
+from lum.clu.processors.interval import Interval
+from lum.clu.processors.sentence import Sentence
+from .test_trusted_construction import load_json
+from .utils import load_test_docs
+from array import array
+import pickle
+
+
+def test_compact_sentence_round_trip():
+  """Test case for CompactSentence.from_sentence and CompactSentence.to_sentence"""
+  for doc in load_test_docs(["example-1-part-0.json", "example-2-part-0.json"]):
+    for s in doc.sentences:
+      cs = CompactSentence.from_sentence(s)
+      assert isinstance(cs.start_offsets, array)
+      assert cs.length == s.length == len(cs)
+      assert cs.raw == s.raw
+      assert cs.start_offsets.tolist() == s.start_offsets
+      assert cs.tags[1:3] == s.tags[1:3]
+      restored = cs.to_sentence()
+      assert restored == s
+      assert restored.model_dump_json() == s.model_dump_json()
+      assert cs == s
+      assert pickle.loads(pickle.dumps(cs)) == cs
+
+def test_compact_sentence_from_json():
+  """CompactSentence.from_json should match Sentence(**data)"""
+  data = {
+    "words": ["Ships", "sail", "."],
+    "startOffsets": [0, 6, 10],
+    "endOffsets": [5, 10, 11],
+    "tags": ["NNS", "VBP", "."],
+    "graphs": {
+      "universal-basic": {"edges": [{"source": 1, "destination": 0, "relation": "nsubj"}], "roots": [1]}
+    }
+  }
+  expected = Sentence(**data)
+  cs = CompactSentence.from_json(data)
+  assert cs == expected
+  assert cs.to_sentence() == expected
+  # raw is shared with words
+  assert cs.raw is cs.words
+  assert cs.dependencies == expected.dependencies
+  assert HeadFinder().semantic_head(cs) == HeadFinder().semantic_head(expected) == 0
+
+def test_document_with_compact_sentences():
+  """Document.from_trusted_json(..., compact=True) should behave like a Document of Sentences"""
+  data = load_json("example-1-part-0.json")
+  expected = Document(**data)
+  doc = Document.from_trusted_json(data, compact=True)
+  assert all(isinstance(s, CompactSentence) for s in doc.sentences)
+  assert doc == expected
+  assert doc.model_dump() == expected.model_dump()
+  assert doc.equivalence_digest == expected.equivalence_digest
+  assert list(doc.sentences[0].relation_vocabulary) == list(expected.sentences[0].relation_vocabulary)
+  # mentions can be built over compact sentences
+  m, m_expected = (TextBoundMention(labels=["X"], token_interval=Interval(0, 2), sentence_index=0, document=d) for d in (doc, expected))
+  assert (m.words, m.tags, m.text, m.semantic_head()) == (m_expected.words, m_expected.tags, m_expected.text, m_expected.semantic_head())
+  # ... and written as compact mentions JSON
+  assert OdinJsonSerializer.to_compact_mentions_json([m]) == OdinJsonSerializer.to_compact_mentions_json([m_expected])
+  interned = Document.from_trusted_json(data, interner=Interner(), compact=True)
+  assert isinstance(interned.sentences[0].tags, EncodedColumn)
+  assert interned == expected
@@ -0,0 +1,44 @@
+from lum.clu.processors.document import Document as CluDocument
+from lum.clu.processors.tests.utils import load_test_docs
+import os
+import subprocess
+import sys
+
+
+def test_equivalence_hash():
+  """Test case for Document.equivalence_hash and Sentence.equivalence_hash"""
+  docs = list(load_test_docs([f"example-2-part-{i}.json" for i in range(3)]))
+  doc = docs[0]
+  copy = CluDocument.model_validate_json(doc.model_dump_json())
+  assert copy.equivalence_digest == doc.equivalence_digest
+  assert copy.equivalence_hash == doc.equivalence_hash
+  assert -(1 << 31) <= doc.equivalence_hash < (1 << 31)
+  # the id is not part of the content
+  assert copy.model_copy(update={"id": "other"}).equivalence_digest == doc.equivalence_digest
+  assert len({d.equivalence_digest for d in docs}) == len(docs)
+  s = doc.sentences[0]
+  changed = s.model_copy(update={"words": s.words[:-1] + [s.words[-1] + "x"]})
+  assert changed.equivalence_digest != s.equivalence_digest
+  # None and [] differ
+  assert s.model_copy(update={"tags": None}).equivalence_digest != s.model_copy(update={"tags": []}).equivalence_digest
+  # token boundaries matter
+  a = s.model_copy(update={"words": ["ab", "c"]})
+  b = s.model_copy(update={"words": ["a", "bc"]})
+  assert a.equivalence_digest != b.equivalence_digest
+
+def test_equivalence_hash_lazy_edges():
+  """Hashing trusted and binary-decoded Documents should not build their graphs' edges"""
+  doc = next(iter(load_test_docs(["example-2-part-1.json"])))
+  for loaded in [CluDocument.from_trusted_json(doc.model_dump(by_alias=True, exclude_none=True)), CluDocument.from_bytes(doc.to_bytes())]:
+    assert loaded.equivalence_digest == doc.equivalence_digest
+    assert all("edges" not in g.__dict__ for s in loaded.sentences for g in s.graphs.values())
+
+def test_equivalence_hash_stable():
+  """Document.equivalence_hash should be stable across processes"""
+  doc = next(iter(load_test_docs(["example-1-part-0.json"])))
+  code = "\n".join([
+    "from lum.clu.processors.tests.utils import load_test_docs",
+    "print(next(iter(load_test_docs(['example-1-part-0.json']))).equivalence_hash)"
+  ])
+  out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, env={**os.environ, "PYTHONHASHSEED": "123"})
+  assert int(out.stdout.strip()) == doc.equivalence_hash
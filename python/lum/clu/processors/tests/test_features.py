@@ -0,0 +1,39 @@
+from lum.clu.processors.document import Document as CluDocument
+from lum.clu.processors.features import DependencyFeaturizer
+from lum.clu.processors.tests.utils import load_test_docs
+import collections
+
+
+def test_dependency_featurizer():
+  """Test case for DependencyFeaturizer"""
+  docs = list(load_test_docs([f"example-2-part-{i}.json" for i in range(5)]))
+  featurizer = DependencyFeaturizer(form="lemmas", n_features=1 << 24)
+  batches = list(featurizer.transform(iter(docs), batch_size=2))
+  assert [len(b) for b in batches] == [2, 2, 1]
+  rows = [row for b in batches for row in b.rows()]
+  for doc, row in zip(docs, rows):
+    assert row == featurizer.featurize(doc)
+    # labeled + unlabeled
+    edges = [e for s in doc.sentences for e in s.graphs["universal-enhanced"].edges]
+    assert sum(row.values()) == 2 * len(edges)
+    # with enough room, distinct dependencies rarely collide
+    labeled = collections.Counter((s.lemmas[e.source], e.relation.upper(), s.lemmas[e.destination]) for s in doc.sentences for e in s.graphs["universal-enhanced"].edges)
+    unlabeled = collections.Counter((s.lemmas[e.source], s.lemmas[e.destination]) for s in doc.sentences for e in s.graphs["universal-enhanced"].edges)
+    assert len(row) == len(labeled) + len(unlabeled)
+
+def test_dependency_featurizer_stable():
+  """Features should not depend on the featurizer instance (or on the process)"""
+  doc = next(iter(load_test_docs(["example-1-part-0.json"])))
+  a = DependencyFeaturizer(form="words", labeled=True, unlabeled=False).featurize(doc)
+  b = DependencyFeaturizer(form="words", labeled=True, unlabeled=False).featurize(doc)
+  assert a == b
+  assert all(0 <= f < 1 << 20 for f in a)
+  assert DependencyFeaturizer(form="index", unlabeled=False).featurize(doc) != a
+
+def test_dependency_featurizer_lazy_edges():
+  """Featurizing trusted and binary-decoded Documents should not build their graphs' edges"""
+  doc = next(iter(load_test_docs(["example-2-part-1.json"])))
+  expected = DependencyFeaturizer(form="lemmas").featurize(doc)
+  for loaded in [CluDocument.from_trusted_json(doc.model_dump(by_alias=True, exclude_none=True)), CluDocument.from_bytes(doc.to_bytes())]:
+    assert DependencyFeaturizer(form="lemmas").featurize(loaded) == expected
+    assert all("edges" not in g.__dict__ for s in loaded.sentences for g in s.graphs.values())
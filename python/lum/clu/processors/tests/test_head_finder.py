@@ -0,0 +1,31 @@
+from lum.clu.processors.head_finder import HeadFinder
+from lum.clu.processors.interval import Interval
+from lum.clu.processors.tests.utils import load_test_docs
+
+
+def test_semantic_head():
+  """Test case for Sentence.semantic_head()"""
+  doc = next(iter(load_test_docs(["example-1-part-0.json"])))
+  s = doc.sentences[0]
+  head = s.semantic_head()
+  assert head is not None
+  assert s.tags[head].startswith("N") or s.tags[head] == "VBG"
+  # a single token is its own head (if its tag is valid)
+  for i, tag in enumerate(s.tags):
+    expected = i if tag.startswith("N") or tag == "VBG" else None
+    assert s.semantic_head(Interval(start=i, end=i + 1)) == expected
+    assert s.semantic_head((i, i + 1), valid_tags=None) == i
+
+def test_semantic_heads_batch():
+  """HeadFinder.semantic_heads() should match HeadFinder.semantic_head()"""
+  finder = HeadFinder()
+  for doc in load_test_docs([f"example-2-part-{i}.json" for i in range(3)]):
+    for s in doc.sentences:
+      n = len(s.words)
+      spans = [(start, end) for start in range(n) for end in range(start + 1, min(n, start + 6) + 1)]
+      heads = finder.semantic_heads(s, spans)
+      assert heads == [finder.semantic_head(s, span) for span in spans]
+      # repeated spans are only resolved once
+      assert finder.semantic_heads(s, spans + spans[::-1]) == heads + heads[::-1]
+      for (start, end), head in zip(spans, heads):
+        assert head is None or start <= head < end
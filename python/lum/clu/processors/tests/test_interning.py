@@ -0,0 +1,64 @@
+from lum.clu.processors.document import Document as CluDocument, LazyDocument
+from lum.clu.processors.interning import EncodedColumn, Interner
+from lum.clu.odin.serialization import OdinJsonSerializer
+from lum.clu.odin.tests.utils import test_cases
+from pathlib import Path
+import json
+import typing
+
+
+def load_json(filename: str) -> dict[str, typing.Any]:
+  with open(Path(__file__).resolve().parent / "data" / filename, "r") as infile:
+    return json.load(infile)
+
+def test_interned_documents():
+  """Test case for Interner.intern_document"""
+  interner = Interner()
+  filenames = ["example-1-part-0.json", "example-1-part-1.json"]
+  expected = [CluDocument(**load_json(f)) for f in filenames]
+  docs = [interner.intern_document(CluDocument(**load_json(f))) for f in filenames]
+  for doc, orig in zip(docs, expected):
+    assert doc == orig
+    assert doc.model_dump_json() == orig.model_dump_json()
+  s1, s2 = docs[0].sentences[0], docs[1].sentences[0]
+  assert isinstance(s1.tags, EncodedColumn)
+  # the vocabulary is shared across documents
+  assert s1.tags.vocabulary is s2.tags.vocabulary
+  assert list(s1.tags) == expected[0].sentences[0].tags
+  assert s1.tags[1:3] == expected[0].sentences[0].tags[1:3]
+  # interning is idempotent
+  interner.intern_document(docs[0])
+  assert docs[0] == expected[0]
+  stats = {s.column: s for s in interner.stats()}
+  assert stats["tags"].bytes_saved > 0
+  assert stats["tags"].values == sum(len(s.words) for d in expected for s in d.sentences)
+
+def test_interned_trusted_construction():
+  """Interning should be applied when constructing from trusted and lazy JSON"""
+  data = load_json("example-1-part-0.json")
+  expected = CluDocument(**data)
+  interner = Interner()
+  doc = CluDocument.from_trusted_json(load_json("example-1-part-0.json"), interner=interner)
+  # interning doesn't build the (lazy) edges of trusted graphs
+  for g in doc.sentences[0].graphs.values():
+    assert "edges" not in g.__dict__
+  assert doc == expected
+  relations = interner.vocabularies["relations"]
+  assert all(e.relation is relations.intern(e.relation) for g in doc.sentences[0].graphs.values() for e in g.edges)
+  assert isinstance(doc.sentences[0].tags, EncodedColumn)
+  lazy = LazyDocument.from_json(load_json("example-1-part-0.json"), trusted=True, interner=interner)
+  assert lazy.sentences[0].tags.vocabulary is interner.vocabularies["tags"]
+  assert lazy == expected
+
+def test_interned_mentions():
+  """Test case for OdinJsonSerializer.from_compact_mentions_json with an Interner"""
+  for tc in test_cases:
+    expected = OdinJsonSerializer.from_compact_mentions_json(tc.json_dict)
+    for trusted in [False, True]:
+      interner = Interner()
+      mentions = OdinJsonSerializer.from_compact_mentions_json(tc.json_dict, trusted=trusted, interner=interner)
+      assert mentions == expected
+      labels = dict()
+      for m in mentions:
+        for label in m.labels:
+          assert labels.setdefault(label, label) is label
@@ -0,0 +1,46 @@
+from lum.clu.processors.interval import Interval, IntervalArray
+from pydantic import TypeAdapter
+import pickle
+import random
+
+
+def test_interval():
+  """Test case for Interval"""
+  i = Interval(start=1, end=3)
+  assert i == Interval(1, 3)
+  assert len({i, Interval(1, 3), Interval(1, 4)}) == 2
+  assert len(i) == i.size == 2
+  assert i.contains(Interval(2, 3)) and not i.contains(Interval(0, 2))
+  assert i.overlaps(Interval(2, 5)) and not i.overlaps(Interval(3, 5))
+  assert pickle.loads(pickle.dumps(i)) == i
+  try:
+    i.start = 0
+    assert False, "Interval should be immutable"
+  except AttributeError:
+    pass
+  # validated and serialized like a model with start and end fields
+  adapter = TypeAdapter(Interval)
+  assert adapter.validate_python({"start": 1, "end": 3}) == i
+  assert adapter.validate_python(i) is i
+  assert adapter.dump_python(i) == {"start": 1, "end": 3}
+
+def test_interval_array():
+  """IntervalArray should agree with Interval.contains and Interval.overlaps"""
+  rng = random.Random(42)
+  intervals = []
+  for _ in range(200):
+    start = rng.randrange(100)
+    intervals.append(Interval(start, start + rng.randrange(6)))
+  others = intervals[:50]
+  arr = IntervalArray.from_intervals(intervals)
+  assert list(arr) == intervals
+  assert list(arr.size) == [i.size for i in intervals]
+  for o in others + [7, 50]:
+    assert arr.contains(o) == [i.contains(o) for i in intervals]
+    assert arr.overlaps(o) == [i.overlaps(o) for i in intervals]
+  expected = [(a, b) for a, i in enumerate(intervals) for b, j in enumerate(intervals) if i.overlaps(j)]
+  assert arr.overlapping_pairs() == expected
+  other_arr = IntervalArray.from_intervals(others)
+  assert arr.overlapping_pairs(other_arr) == [(a, b) for a, i in enumerate(intervals) for b, j in enumerate(others) if i.overlaps(j)]
+  matrix = arr.overlap_matrix(other_arr)
+  assert [[bool(x) for x in row] for row in matrix] == [[i.overlaps(j) for j in others] for i in intervals]
@@ -0,0 +1,25 @@
+from lum.clu.processors.iob import IOBDecoder
+from lum.clu.processors.tests.utils import load_test_docs
+
+
+def test_iob_decoder():
+  """Test case for IOBDecoder.decode()"""
+  decoder = IOBDecoder()
+  tags = ["B-PER", "I-PER", "O", "B-LOC", "B-LOC", "I-LOC", "ORG", "ORG", "O", "I-MISC"]
+  assert list(decoder.decode(tags)) == [(0, 2, "PER"), (3, 4, "LOC"), (4, 6, "LOC"), (6, 8, "ORG"), (9, 10, "MISC")]
+  spans = decoder.decode(["B-NP", "I-NP", "B-VP", "B-NP"])
+  assert spans.by_label() == {"NP": [(0, 2), (3, 4)], "VP": [(2, 3)]}
+  # label IDs are shared
+  assert [spans.vocabulary[i] for i in spans.labels] == ["NP", "VP", "NP"]
+  assert len(decoder.decode(None)) == 0
+  assert len(decoder.decode(["O", "O"])) == 0
+
+def test_sentence_nes_and_phrases():
+  """Test case for Sentence.nes and Sentence.phrases"""
+  doc = next(iter(load_test_docs(["example-1-part-0.json"])))
+  for s in doc.sentences:
+    assert s.entity_spans is s.entity_spans
+    for label, texts in s.phrases.items():
+      assert all(len(t) > 0 for t in texts)
+    assert sum(len(texts) for texts in s.phrases.values()) == sum(1 for c in s.chunks if c.startswith("B-"))
+  assert sum(len(texts) for texts in doc.nes.values()) == sum(len(s.entity_spans) for s in doc.sentences)
@@ -0,0 +1,36 @@
+from lum.clu.processors.document import Document as CluDocument, LazyDocument
+from pathlib import Path
+import json
+import pickle
+import typing
+
+
+def load_json(filename: str) -> dict[str, typing.Any]:
+  with open(Path(__file__).resolve().parent / "data" / filename, "r") as infile:
+    return json.load(infile)
+
+def test_lazy_document():
+  """Test case for LazyDocument"""
+  data = load_json("example-1-part-0.json")
+  expected = CluDocument(**data)
+  for trusted in [False, True]:
+    doc = LazyDocument.from_json(load_json("example-1-part-0.json"), trusted=trusted)
+    total = len(expected.sentences)
+    assert len(doc.sentences) == total
+    assert doc.materialization_stats.materialized == 0
+    assert doc.sentences[-1] == expected.sentences[-1]
+    # sentences are only built once
+    assert doc.sentences[-1] is doc.sentences[total - 1]
+    assert doc.materialization_stats.model_dump() == {"materialized": 1, "total": total}
+    assert doc == expected
+    assert doc.materialization_stats.materialized == total
+
+def test_lazy_document_serialization():
+  """LazyDocument should serialize (and pickle) like a Document"""
+  data = load_json("example-1-part-0.json")
+  expected = CluDocument(**data)
+  doc = LazyDocument.from_json(load_json("example-1-part-0.json"))
+  assert doc.model_dump_json() == expected.model_dump_json()
+  doc = LazyDocument.from_json(load_json("example-1-part-0.json"))
+  restored = pickle.loads(pickle.dumps(doc))
+  assert restored == expected
@@ -1,5 +1,8 @@
-from lum.clu.processors.document import Document as CluDocument
+from lum.clu.processors.compact_sentence import CompactSentence
+from lum.clu.processors.document import Document as CluDocument, DocumentBuilder
 from lum.clu.processors.tests.utils import load_test_docs, check_doc_token_alignment
+from pathlib import Path
+import json
 import pytest
 import typing
 
@@ -8,6 +11,27 @@ def test_merge_documents_1():
   docs: list[CluDocument] = list(load_test_docs(["example-1-part-0.json", "example-1-part-1.json", "example-1-part-2.json"]))
   doc = CluDocument.merge_documents(docs)
   check_doc_token_alignment(doc)
+  assert doc.text == "I like turtles\n\nHow about you?\nI'm not sure"
+  assert [s.words for s in doc.sentences] == [["I", "like", "turtles"], ["How", "about", "you", "?"], ["I", "am", "not", "sure"]]
+  # offsets of later parts are shifted by the length of the text before them (16, then 16 + 15)
+  assert [s.start_offsets for s in doc.sentences] == [[0, 2, 7], [16, 20, 26, 29], [31, 32, 35, 39]]
+  assert [s.end_offsets for s in doc.sentences] == [[1, 6, 14], [19, 25, 29, 30], [32, 34, 38, 43]]
+
+
+def test_merge_compact_documents():
+  """Document.merge_documents() should merge Documents of CompactSentences (see Document.from_trusted_json(..., compact=True))"""
+  data_dir = Path(__file__).resolve().parent / "data"
+  docs = [CluDocument.from_trusted_json(json.loads((data_dir / f"example-1-part-{i}.json").read_text()), compact=True) for i in range(3)]
+  doc = CluDocument.merge_documents(docs)
+  check_doc_token_alignment(doc)
+  assert all(isinstance(s, CompactSentence) for s in doc.sentences)
+  assert doc.text == "I like turtles\n\nHow about you?\nI'm not sure"
+  assert [list(s.start_offsets) for s in doc.sentences] == [[0, 2, 7], [16, 20, 26, 29], [31, 32, 35, 39]]
+  assert [list(s.end_offsets) for s in doc.sentences] == [[1, 6, 14], [19, 25, 29, 30], [32, 34, 38, 43]]
+  # parts are not modified
+  assert list(docs[1].sentences[0].start_offsets) == [0, 4, 10, 13]
+  # the same content as merging regular Documents
+  assert doc.equivalence_digest == CluDocument.merge_documents(list(load_test_docs([f"example-1-part-{i}.json" for i in range(3)]))).equivalence_digest
 
 
 def test_merge_documents_2():
@@ -15,3 +39,27 @@ def test_merge_documents_2():
   docs: list[CluDocument] = list(load_test_docs([f"example-2-part-{i}.json" for i in range(43)]))
   doc = CluDocument.merge_documents(docs)
   check_doc_token_alignment(doc)
+
+
+def test_document_builder():
+  """Test case for DocumentBuilder"""
+  docs: list[CluDocument] = list(load_test_docs([f"example-2-part-{i}.json" for i in range(43)]))
+  builder = DocumentBuilder(id="merged")
+  for doc in docs:
+    builder.append(doc.text, doc.sentences)
+  assert len(builder) == sum(len(doc.sentences) for doc in docs)
+  doc = builder.build()
+  check_doc_token_alignment(doc)
+  assert doc.id == "merged"
+  assert doc.text == "".join(d.text for d in docs)
+  # the 2nd part starts at character 29, and the last one at character 2707
+  second, last = doc.sentences[1], doc.sentences[-1]
+  assert second.words[:3] == ["WWTP", "N", "Reduction"]
+  assert (second.start_offsets[:3], second.end_offsets[:3]) == ([29, 34, 36], [33, 35, 45])
+  assert last.words[:3] == ["G", ":\\", "Yamabe"]
+  assert (last.start_offsets[:3], last.end_offsets[:3]) == ([2707, 2708, 2710], [2708, 2710, 2716])
+  # parts are never aliased by the built document (even those whose offsets aren't shifted)
+  assert all(merged is not s for merged, s in zip(doc.sentences, docs[0].sentences))
+  doc.sentences[0].start_offsets[0] = -1
+  assert docs[0].sentences[0].start_offsets[0] == 0
+  assert docs[1].sentences[0].start_offsets[0] < len(docs[1].text)
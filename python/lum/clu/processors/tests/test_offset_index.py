@@ -0,0 +1,34 @@
+from lum.clu.processors.document import Document as CluDocument
+from lum.clu.processors.tests.utils import load_test_docs
+import random
+
+
+def brute_force(doc: CluDocument, start: int, end: int) -> list[tuple[int, int]]:
+  return [
+    (si, ti)
+    for si, s in enumerate(doc.sentences)
+    for ti, (ts, te) in enumerate(zip(s.start_offsets, s.end_offsets))
+    if ts < end and te > start
+  ]
+
+def test_token_at():
+  """Test case for Document.token_at() and Document.tokens_at()"""
+  doc = CluDocument.merge_documents(list(load_test_docs([f"example-2-part-{i}.json" for i in range(43)])))
+  offsets = list(range(len(doc.text) + 1))
+  expected = [next(iter(brute_force(doc, i, i + 1)), None) for i in offsets]
+  assert [doc.token_at(i) for i in offsets] == expected
+  assert doc.tokens_at(offsets) == expected
+  assert doc.token_at(-1) is None
+  s = doc.sentences[3]
+  assert doc.token_at(s.start_offsets[2]) == (3, 2)
+
+def test_tokens_in_span():
+  """Test case for Document.tokens_in_span() and Document.tokens_in_spans()"""
+  doc = CluDocument.merge_documents(list(load_test_docs([f"example-2-part-{i}.json" for i in range(43)])))
+  rand = random.Random(42)
+  spans = [(start, start + rand.randint(0, 300)) for start in (rand.randint(0, len(doc.text)) for _ in range(200))]
+  expected = [brute_force(doc, start, end) for start, end in spans]
+  assert [doc.tokens_in_span(start, end) for start, end in spans] == expected
+  assert doc.tokens_in_spans(spans) == expected
+  # spans crossing sentence boundaries
+  assert any(len({si for si, _ in tokens}) > 1 for tokens in expected)
@@ -0,0 +1,71 @@
+from lum.clu.processors.paths import PathStep
+from lum.clu.processors.tests.utils import load_test_docs
+import itertools
+
+
+def distances(edges, n: int, start: int, directed: bool) -> list[int]:
+  """Simple (quadratic) breadth-first search"""
+  dist = [-1] * n
+  dist[start] = 0
+  frontier = [start]
+  while frontier:
+    nxt = []
+    for node in frontier:
+      for e in edges:
+        for a, b in ([(e.source, e.destination)] if directed else [(e.source, e.destination), (e.destination, e.source)]):
+          if a == node and dist[b] == -1:
+            dist[b] = dist[node] + 1
+            nxt.append(b)
+    frontier = nxt
+  return dist
+
+def check_path(path: list[PathStep], start: int, end: int) -> None:
+  node = start
+  for step in path:
+    if step.direction == ">":
+      assert step.source == node
+      node = step.destination
+    else:
+      assert step.destination == node
+      node = step.source
+  assert node == end
+
+def test_shortest_path():
+  """Test case for DirectedGraph.shortest_path() and DirectedGraph.batch_shortest_paths()"""
+  for doc in load_test_docs([f"example-2-part-{i}.json" for i in range(3)]):
+    for s in doc.sentences:
+      n = len(s.words)
+      for g in s.graphs.values():
+        for directed in [True, False]:
+          pairs = list(itertools.product(range(n), range(n)))
+          batch = g.batch_shortest_paths(pairs, directed=directed)
+          for (start, end), batched in zip(pairs, batch):
+            expected = distances(g.edges, n, start, directed)[end]
+            path = g.shortest_path(start, end, directed=directed)
+            if expected == -1:
+              assert path is None and batched is None
+            else:
+              assert len(path) == len(batched) == expected
+              check_path(path, start, end)
+              check_path(batched, start, end)
+
+def test_shortest_paths():
+  """Test case for DirectedGraph.shortest_paths()"""
+  doc = next(iter(load_test_docs(["example-1-part-0.json"])))
+  s = doc.sentences[0]
+  g = list(s.graphs.values())[0]
+  n = len(s.words)
+  for start, end in itertools.product(range(n), range(n)):
+    paths = g.shortest_paths(start, end)
+    shortest = g.shortest_path(start, end)
+    if shortest is None:
+      assert paths == []
+      continue
+    assert shortest in paths
+    assert len({tuple(p) for p in paths}) == len(paths)
+    for p in paths:
+      assert len(p) == len(shortest)
+      check_path(p, start, end)
+  # multiple starts & ends
+  path = g.shortest_path([0, 1], range(n - 2, n))
+  assert path is not None and len(path) == min(len(g.shortest_path(a, b)) for a in [0, 1] for b in range(n - 2, n))
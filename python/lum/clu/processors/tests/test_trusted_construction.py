@@ -0,0 +1,57 @@
+from lum.clu.processors.document import Document as CluDocument
+from lum.clu.processors.directed_graph import DirectedGraph
+from lum.clu.processors.sentence import Sentence
+from lum.clu.processors.utils import Trusted
+from pathlib import Path
+import json
+import pytest
+import typing
+
+
+def load_json(filename: str) -> dict[str, typing.Any]:
+  with open(Path(__file__).resolve().parent / "data" / filename, "r") as infile:
+    return json.load(infile)
+
+@pytest.fixture
+def validate_all():
+  rate = Trusted.validation_rate
+  Trusted.validation_rate = 1.0
+  yield
+  Trusted.validation_rate = rate
+
+def test_document_from_trusted_json(validate_all):
+  """Document.from_trusted_json() should produce the same Document as validation"""
+  for filename in ["example-1-part-0.json", "example-1-part-1.json", "example-1-part-2.json"]:
+    data = load_json(filename)
+    assert CluDocument.from_trusted_json(data) == CluDocument(**data)
+    # field names work as well as aliases
+    dumped = CluDocument(**data).model_dump()
+    assert CluDocument.from_trusted_json(dumped) == CluDocument(**data)
+
+def test_sentence_from_trusted_json_raw():
+  """Sentence.from_trusted_json() should use `words` when `raw` is missing"""
+  data = load_json("example-1-part-0.json")["sentences"][0]
+  data.pop("raw", None)
+  s = Sentence.from_trusted_json(data)
+  assert s.raw == s.words == data["words"]
+
+def test_trusted_validation_sample(validate_all):
+  """Sampled validation should catch data that doesn't match the model"""
+  data = load_json("example-1-part-0.json")
+  data["sentences"][0]["start_offsets"] = [str(i) for i in data["sentences"][0]["start_offsets"]]
+  with pytest.raises(ValueError):
+    CluDocument.from_trusted_json(data)
+
+def test_trusted_graph_edges_are_lazy():
+  """DirectedGraph.from_trusted_json() should keep the JSON edges until they're needed"""
+  data = load_json("example-1-part-0.json")["sentences"][0]["graphs"]
+  for graph_json in data.values():
+    validated = DirectedGraph.model_validate(graph_json)
+    graph = DirectedGraph.from_trusted_json(graph_json)
+    # queries are answered from the JSON ...
+    assert list(graph.compact.triples()) == list(validated.compact.triples())
+    assert "edges" not in graph.__dict__
+    # ... and `Edge`s are only built when they're accessed
+    assert graph.model_dump() == validated.model_dump()
+    assert graph.edges == validated.edges
+    assert graph == validated
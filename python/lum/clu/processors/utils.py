@@ -1,8 +1,205 @@
+from pydantic import BaseModel
+from pydantic_core import PydanticUndefined
+from array import array
+import copy
+import hashlib
+import os
+import random
+import sys
+import typing
 
-__all__ = ["Labels"]
+__all__ = ["CachedPropertiesMixin", "ContentHasher", "Labels", "Trusted", "Vocabulary", "construct"]
 
 class Labels:
 
     UNKNOWN = "UNKNOWN"
     # the O in IOB notation
-    O = "O"
\ No newline at end of file
+    O = "O"
+
+
+class Vocabulary:
+    """
+    A growable, bidirectional mapping between strings (ex. dependency relations) and compact integer IDs.
+    """
+
+    __slots__ = ("_ids", "_strings")
+
+    def __init__(self, strings: typing.Iterable[str] = ()):
+        self._ids: dict[str, int] = dict()
+        self._strings: list[str] = []
+        for s in strings:
+            self.index(s)
+
+    def index(self, s: str) -> int:
+        """Returns the ID of `s`, adding it to the vocabulary if needed"""
+        i = self._ids.get(s, None)
+        if i is None:
+            i = len(self._strings)
+            self._ids[s] = i
+            self._strings.append(s)
+        return i
+
+    def intern(self, s: str) -> str:
+        """Returns the vocabulary's (shared) copy of `s`, adding it to the vocabulary if needed"""
+        return self._strings[self.index(s)]
+
+    def get(self, s: str, default: int = -1) -> int:
+        """Returns the ID of `s` (or `default` if `s` is not in the vocabulary)"""
+        return self._ids.get(s, default)
+
+    def __getitem__(self, i: int) -> str:
+        return self._strings[i]
+
+    def __contains__(self, s: typing.Any) -> bool:
+        return s in self._ids
+
+    def __iter__(self) -> typing.Iterator[str]:
+        return iter(self._strings)
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def __repr__(self) -> str:
+        return f"Vocabulary({self._strings!r})"
+
+
+class CachedPropertiesMixin:
+    """
+    For models with `functools.cached_property` values (stored alongside the fields in `__dict__`):
+    `model_copy(update=...)` discards any cached values, as they may no longer be valid.
+    """
+
+    def model_copy(self, *, update: typing.Optional[typing.Mapping[str, typing.Any]] = None, deep: bool = False):
+        copied = super().model_copy(update=update, deep=deep)
+        if update:
+            copied._clear_cached_properties()
+        return copied
+
+    def _clear_cached_properties(self) -> None:
+        fields = type(self).model_fields
+        for name in [name for name in self.__dict__ if name not in fields]:
+            del self.__dict__[name]
+
+
+class ContentHasher:
+    """
+    Streams arrays of strings and integers into a 128-bit BLAKE2b digest without building an intermediate representation (ex. JSON).
+    Every value is length-prefixed (and missing values are marked), so distinct contents can't produce the same byte stream.
+    Digests are stable across processes and platforms.
+    """
+
+    __slots__ = ("_hasher",)
+
+    def __init__(self, name: str):
+        self._hasher = hashlib.blake2b(digest_size=16, person=name.encode("utf-8")[:16])
+
+    @staticmethod
+    def _int_bytes(values: typing.Iterable[int]) -> bytes:
+        arr = array("q", values)
+        if sys.byteorder != "little":
+            arr.byteswap()
+        return arr.tobytes()
+
+    def update_ints(self, values: typing.Optional[typing.Iterable[int]]) -> "ContentHasher":
+        if values is None:
+            self._hasher.update(b"\0")
+        else:
+            data = ContentHasher._int_bytes(values)
+            self._hasher.update(b"\1" + ContentHasher._int_bytes([len(data)]))
+            self._hasher.update(data)
+        return self
+
+    def update_strs(self, values: typing.Optional[typing.Sequence[str]]) -> "ContentHasher":
+        if values is None:
+            self._hasher.update(b"\0")
+        else:
+            # the length (in characters) of each string delimits the (joined) UTF-8 data
+            self.update_ints(map(len, values))
+            self.update_str("".join(values))
+        return self
+
+    def update_str(self, value: typing.Optional[str]) -> "ContentHasher":
+        if value is None:
+            self._hasher.update(b"\0")
+        else:
+            data = value.encode("utf-8")
+            self._hasher.update(b"\1" + ContentHasher._int_bytes([len(data)]))
+            self._hasher.update(data)
+        return self
+
+    def update_bytes(self, value: bytes) -> "ContentHasher":
+        self._hasher.update(b"\1" + ContentHasher._int_bytes([len(value)]))
+        self._hasher.update(value)
+        return self
+
+    def digest(self) -> bytes:
+        return self._hasher.digest()
+
+    @staticmethod
+    def to_int32(digest: bytes) -> int:
+        """A signed 32-bit key derived from `digest`; not compatible with Scala's `documentEquivalenceHash`"""
+        return int.from_bytes(digest[:4], byteorder="big", signed=True)
+
+
+M = typing.TypeVar("M", bound=BaseModel)
+
+# cls -> ((field name, default, default factory), ...)
+_FIELD_SPECS: dict[type, typing.Tuple[typing.Tuple[str, typing.Any, typing.Optional[typing.Callable[[], typing.Any]]], ...]] = dict()
+
+def _field_specs(cls: typing.Type[BaseModel]) -> typing.Tuple[typing.Tuple[str, typing.Any, typing.Optional[typing.Callable[[], typing.Any]]], ...]:
+    specs = _FIELD_SPECS.get(cls, None)
+    if specs is None:
+        specs = tuple((name, info.default, info.default_factory) for name, info in cls.model_fields.items())
+        _FIELD_SPECS[cls] = specs
+    return specs
+
+def construct(cls: typing.Type[M], **values: typing.Any) -> M:
+    """
+    A leaner `BaseModel.model_construct` for trusted data: no validation or alias handling.
+    Missing fields are set to their defaults.
+    """
+    fields: dict[str, typing.Any] = dict()
+    # fields are serialized in the order they're stored
+    for name, default, factory in _field_specs(cls):
+        if name in values:
+            fields[name] = values[name]
+        elif factory is not None:
+            fields[name] = factory()
+        elif default is PydanticUndefined:
+            raise TypeError(f"{cls.__name__} is missing a value for required field '{name}'")
+        else:
+            # avoid sharing mutable defaults (ex. `{}`) across instances
+            fields[name] = copy.copy(default)
+    m = cls.__new__(cls)
+    object.__setattr__(m, "__dict__", fields)
+    object.__setattr__(m, "__pydantic_fields_set__", set(values))
+    object.__setattr__(m, "__pydantic_extra__", None)
+    private = cls.__private_attributes__
+    object.__setattr__(m, "__pydantic_private__", {k: v.get_default() for k, v in private.items()} if private else None)
+    return m
+
+
+class Trusted:
+    """
+    Settings for trusted (i.e., validation-free) construction of CLU data structures
+    (see `Document.from_trusted_json`, `Sentence.from_trusted_json`, `DirectedGraph.from_trusted_json`, and `Mention.from_trusted`).
+
+    For debugging, set `Trusted.validation_rate` (or the `CLU_TRUSTED_VALIDATION_RATE` environment variable)
+    to a value in (0, 1] to fully validate that fraction of trusted objects.
+    """
+
+    validation_rate: typing.ClassVar[float] = float(os.environ.get("CLU_TRUSTED_VALIDATION_RATE", 0.0))
+
+    @staticmethod
+    def sample() -> bool:
+        """Whether or not to validate the next trusted object"""
+        rate = Trusted.validation_rate
+        return rate > 0 and (rate >= 1 or random.random() < rate)
+
+    @staticmethod
+    def check(trusted: M, validated: typing.Callable[[], M]) -> M:
+        """Raises a `ValueError` if `trusted` differs from the result of full validation"""
+        expected = validated()
+        if trusted != expected:
+            raise ValueError(f"Trusted {type(trusted).__name__} differs from its validated equivalent:\n{trusted!r}\n!=\n{expected!r}")
+        return trusted